@@ -0,0 +1,196 @@
+"""Background scan jobs with progress reporting and cancellation."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dspm_engine.api.snapshots import ScanSnapshot
+from dspm_engine.core.logging_utils import get_logger
+from dspm_engine.core.scanner import ProgressCallback, ScanCancelled
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+# Runs a scan for the given providers, reporting progress, and returns its snapshot.
+ScanRunner = Callable[[List[str], ProgressCallback], ScanSnapshot]
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the job queue has no room for another scan."""
+
+
+@dataclass
+class ProviderProgress:
+    """Progress of one provider within a scan job."""
+
+    stage: str = "pending"
+    discovered: int = 0
+    classified: int = 0
+
+
+@dataclass
+class ScanJob:
+    """State of an asynchronous scan request."""
+
+    id: str
+    providers: List[str]
+    status: str = QUEUED
+    progress: Dict[str, ProviderProgress] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    snapshot_id: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+
+
+class JobManager:
+    """Run scan jobs on a bounded background executor.
+
+    At most ``max_concurrent`` jobs run at once and up to ``max_queue`` more may wait;
+    further submissions raise :class:`JobQueueFull`. Finished jobs are retained for
+    polling until ``retain`` newer jobs have completed.
+    """
+
+    def __init__(
+        self,
+        runner: ScanRunner,
+        max_concurrent: int = 2,
+        max_queue: int = 16,
+        retain: int = 100,
+    ) -> None:
+        """Create a manager that executes scans through ``runner``."""
+
+        if max_concurrent < 1 or max_queue < 0:
+            raise ValueError("max_concurrent must be positive and max_queue non-negative")
+        self.runner = runner
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.retain = retain
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="dspm-job"
+        )
+
+    def submit(self, providers: List[str]) -> ScanJob:
+        """Queue a scan and return its job immediately."""
+
+        job = ScanJob(
+            id=uuid.uuid4().hex[:16],
+            providers=list(providers),
+            progress={provider: ProviderProgress() for provider in providers},
+        )
+        with self._lock:
+            active = sum(1 for item in self._jobs.values() if item.status not in FINISHED_STATES)
+            if active >= self.max_concurrent + self.max_queue:
+                raise JobQueueFull(f"{active} scan jobs already queued or running")
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job)
+        logger.info("Queued scan job %s for providers %s", job.id, job.providers)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        """Return a job by id."""
+
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ScanJob]:
+        """Return retained jobs, oldest first."""
+
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[ScanJob]:
+        """Cancel a queued job, or ask a running job to stop at its next checkpoint."""
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job.cancel_requested = True
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                self._finish(job, CANCELLED)
+        logger.info("Cancellation requested for scan job %s", job_id)
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the executor."""
+
+        for job in self.jobs():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=True)
+
+    def _progress(self, job: ScanJob) -> ProgressCallback:
+        """Build a progress callback that records stages and honours cancellation."""
+
+        def report(provider: str, stage: str, count: int) -> None:
+            with self._lock:
+                if job.cancel_requested:
+                    raise ScanCancelled(job.id)
+                entry = job.progress.setdefault(provider, ProviderProgress())
+                entry.stage = stage
+                if stage == "discovered":
+                    entry.discovered = count
+                elif stage == "classified":
+                    entry.classified = count
+
+        return report
+
+    def _run(self, job: ScanJob) -> None:
+        """Execute a job on the background executor."""
+
+        with self._lock:
+            if job.cancel_requested:
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            snapshot = self.runner(job.providers, self._progress(job))
+        except ScanCancelled:
+            with self._lock:
+                self._finish(job, CANCELLED)
+            logger.info("Scan job %s cancelled", job.id)
+            return
+        except Exception as exc:
+            logger.exception("Scan job %s failed", job.id)
+            with self._lock:
+                job.error = f"{type(exc).__name__}: {exc}"
+                self._finish(job, FAILED)
+            return
+        with self._lock:
+            job.snapshot_id = snapshot.id
+            for provider, error in snapshot.result.errors.items():
+                if provider not in job.progress:
+                    # Assets with unreadable posture; the scan itself succeeded.
+                    continue
+                job.progress[provider].stage = "failed"
+                job.error = job.error or f"{provider}: {error}"
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: ScanJob, status: str) -> None:
+        """Mark a job finished and evict the oldest finished jobs; caller holds the lock."""
+
+        job.status = status
+        job.finished_at = time.time()
+        self._futures.pop(job.id, None)
+        finished: List[Tuple[str, ScanJob]] = [
+            (job_id, item) for job_id, item in self._jobs.items() if item.status in FINISHED_STATES
+        ]
+        for job_id, _ in finished[: max(0, len(finished) - self.retain)]:
+            del self._jobs[job_id]
@@ -0,0 +1,166 @@
+"""Cursor pagination and filtering helpers for the API list endpoints."""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from dspm_engine.core.aggregation import PiiAggregate
+from dspm_engine.core.misconfig import MisconfigurationFinding
+from dspm_engine.core.models import PUBLIC_ASSET_FIELDS, StorageAsset
+from dspm_engine.core.pii_detector import PiiFinding
+
+T = TypeVar("T")
+Predicate = Callable[[T], bool]
+
+ASSET_FIELDS = PUBLIC_ASSET_FIELDS
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of filtered items and the cursor for the next page, if any."""
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(snapshot_id: str, position: int) -> str:
+    """Encode a resume position within a snapshot as an opaque cursor."""
+
+    raw = json.dumps({"s": snapshot_id, "p": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor into ``(snapshot_id, position)``; raise ``ValueError`` if invalid."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        snapshot_id, position = str(payload["s"]), int(payload["p"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if position < 0:
+        raise ValueError("Malformed cursor")
+    return snapshot_id, position
+
+
+def iter_matching(items: Sequence[T], predicate: Predicate, start: int = 0) -> Iterator[T]:
+    """Yield items from ``start`` onwards that satisfy ``predicate``."""
+
+    for index in range(start, len(items)):
+        if predicate(items[index]):
+            yield items[index]
+
+
+def paginate(
+    items: Sequence[T], predicate: Predicate, snapshot_id: str, start: int, limit: int
+) -> Page[T]:
+    """Collect up to ``limit`` matching items starting at position ``start``.
+
+    The cursor records the position in the unfiltered sequence, so later pages
+    resume without re-evaluating the filter over earlier items.
+    """
+
+    page: List[T] = []
+    for index in range(start, len(items)):
+        if not predicate(items[index]):
+            continue
+        if len(page) == limit:
+            return Page(items=page, next_cursor=encode_cursor(snapshot_id, index))
+        page.append(items[index])
+    return Page(items=page, next_cursor=None)
+
+
+def _matches(value: Optional[str], expected: Optional[str]) -> bool:
+    """Case-insensitive equality that treats a missing filter as a match."""
+
+    return expected is None or (value or "").lower() == expected.lower()
+
+
+def pii_filter(
+    provider: Optional[str] = None,
+    finding_type: Optional[str] = None,
+    resource: Optional[str] = None,
+    validated: Optional[bool] = None,
+) -> Predicate:
+    """Build a predicate over PII findings, or over PII aggregates without ``validated``."""
+
+    def predicate(finding: Union[PiiFinding, PiiAggregate]) -> bool:
+        return (
+            _matches(finding.provider, provider)
+            and _matches(finding.type, finding_type)
+            and (
+                resource is None
+                or finding.location.startswith(f"{finding.provider}://{resource}/")
+            )
+            and (validated is None or finding.validated == validated)
+        )
+
+    return predicate
+
+
+def misconfig_filter(
+    provider: Optional[str] = None,
+    finding_type: Optional[str] = None,
+    severity: Optional[str] = None,
+    resource: Optional[str] = None,
+) -> Predicate:
+    """Build a predicate over misconfiguration findings; ``finding_type`` matches the issue."""
+
+    def predicate(finding: MisconfigurationFinding) -> bool:
+        return (
+            _matches(finding.provider, provider)
+            and _matches(finding.issue, finding_type)
+            and _matches(finding.severity, severity)
+            and (resource is None or finding.resource == resource)
+        )
+
+    return predicate
+
+
+def asset_filter(
+    provider: Optional[str] = None,
+    resource: Optional[str] = None,
+    region: Optional[str] = None,
+    public: Optional[bool] = None,
+    encrypted: Optional[bool] = None,
+) -> Predicate:
+    """Build a predicate over storage assets."""
+
+    def predicate(asset: StorageAsset) -> bool:
+        return (
+            _matches(asset.provider, provider)
+            and (resource is None or asset.name == resource)
+            and _matches(asset.region, region)
+            and (public is None or asset.public == public)
+            and (encrypted is None or bool(asset.encryption) == encrypted)
+        )
+
+    return predicate
+
+
+def asset_record(asset: StorageAsset) -> Dict[str, Any]:
+    """Return the public fields of an asset without deep-copying tags or samples."""
+
+    return {name: getattr(asset, name) for name in ASSET_FIELDS}
+
+
+def iter_ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """Serialize records lazily as newline-delimited JSON."""
+
+    for record in records:
+        yield json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
@@ -1,15 +1,135 @@
 """FastAPI layer exposing DSPM results."""
 from __future__ import annotations
 
-from typing import List
-
-from fastapi import FastAPI
+import os
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from dspm_engine.core.scanner import Scanner, ScanResult
-
-app = FastAPI(title="DSPM Engine", version="1.1.0")
-scanner = Scanner()
+from dspm_engine.api.jobs import JobManager, JobQueueFull, ScanJob
+from dspm_engine.api.queries import (
+    Predicate,
+    asset_filter,
+    asset_record,
+    decode_cursor,
+    iter_matching,
+    iter_ndjson,
+    misconfig_filter,
+    paginate,
+    pii_filter,
+)
+from dspm_engine.api.snapshots import ScanSnapshot, SnapshotStore
+from dspm_engine.core import metrics
+from dspm_engine.core.history import FINDING_KINDS, ScanHistory
+from dspm_engine.core.misconfig import MisconfigurationDetector
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.prefilter import ContentRouter
+from dspm_engine.core.providers import PROVIDERS, provider_names
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.sampling import SamplingPolicy
+from dspm_engine.core.scanner import ProgressCallback, Scanner, ScanResult
+from dspm_engine.core.structured import TabularClassifier
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Stop background jobs and release the scanner and history when the app exits."""
+
+    global _scanner, _history_store
+    yield
+    jobs.shutdown()
+    with _state_lock:
+        scanner, history = _scanner, _history_store
+        _scanner = _history_store = None
+    if scanner is not None:
+        scanner.close()
+    if history is not None:
+        history.close()
+
+
+app = FastAPI(title="DSPM Engine", version="1.1.0", lifespan=_lifespan)
+CACHE_PATH = os.getenv("DSPM_CACHE_PATH")
+MISCONFIG_RULES = os.getenv("DSPM_MISCONFIG_RULES")
+SAMPLE_STRATEGY = os.getenv("DSPM_SAMPLE_STRATEGY")
+HISTORY_PATH = os.getenv("DSPM_HISTORY_PATH")
+SNAPSHOT_TTL = float(os.getenv("DSPM_SNAPSHOT_TTL", "300"))
+snapshots = SnapshotStore(max_snapshots=int(os.getenv("DSPM_SNAPSHOT_HISTORY", "10")))
+DEFAULT_PAGE_SIZE = int(os.getenv("DSPM_PAGE_SIZE", "1000"))
+MAX_PAGE_SIZE = 10000
+NDJSON = "application/x-ndjson"
+HISTORY_KIND_PATTERN = f"^({'|'.join(FINDING_KINDS)})$"
+# The scanner and history are built on first use, so importing the app stays cheap
+# and a misconfigured environment surfaces on the first request.
+_scanner: Optional[Scanner] = None
+_history_store: Optional[ScanHistory] = None
+_state_lock = threading.Lock()
+
+
+def get_history() -> Optional[ScanHistory]:
+    """Return the scan history configured by ``DSPM_HISTORY_PATH``, if any."""
+
+    global _history_store
+    with _state_lock:
+        if _history_store is None and HISTORY_PATH:
+            _history_store = ScanHistory(HISTORY_PATH)
+        return _history_store
+
+
+def get_scanner() -> Scanner:
+    """Return the shared scanner, building it from the environment on first use."""
+
+    global _scanner
+    if _scanner is not None:
+        return _scanner
+    history = get_history()
+    with _state_lock:
+        if _scanner is None:
+            _scanner = Scanner(
+                pii_detector=PiiDetector.from_default_rules(
+                    validation=os.getenv("DSPM_PII_VALIDATION", "mark")
+                ),
+                max_workers=int(os.getenv("DSPM_SCAN_WORKERS", "1")),
+                result_cache=ResultCache(CACHE_PATH) if CACHE_PATH else None,
+                discovery=os.getenv("DSPM_DISCOVERY", "sample"),
+                sampling=(
+                    SamplingPolicy(
+                        strategy=SAMPLE_STRATEGY,
+                        max_objects=int(os.getenv("DSPM_SAMPLE_OBJECTS", "20")),
+                        max_bytes=int(os.getenv("DSPM_SAMPLE_BYTES", str(1024 * 1024))),
+                    )
+                    if SAMPLE_STRATEGY
+                    else None
+                ),
+                misconfig_detector=(
+                    MisconfigurationDetector.from_file(MISCONFIG_RULES)
+                    if MISCONFIG_RULES
+                    else None
+                ),
+                prefilter=ContentRouter() if os.getenv("DSPM_PREFILTER") == "1" else None,
+                tabular=TabularClassifier() if os.getenv("DSPM_TABULAR") == "1" else None,
+                aggregate_pii=os.getenv("DSPM_AGGREGATE_PII") == "1",
+                history=history,
+            )
+        return _scanner
+
+
+def _run_job_scan(providers: List[str], progress: ProgressCallback) -> ScanSnapshot:
+    """Scan on behalf of a background job and publish the result as a snapshot."""
+
+    return snapshots.add(get_scanner().scan(providers, progress=progress), providers)
+
+
+jobs = JobManager(
+    _run_job_scan,
+    max_concurrent=int(os.getenv("DSPM_MAX_CONCURRENT_JOBS", "2")),
+    max_queue=int(os.getenv("DSPM_JOB_QUEUE_SIZE", "16")),
+)
 
 
 class MisconfigurationModel(BaseModel):
@@ -29,6 +149,33 @@ class PiiFindingModel(BaseModel):
     sample: str
     location: str
     provider: str
+    validated: bool = False
+
+
+class ColumnFindingModel(BaseModel):
+    """Pydantic view of a column-level PII finding."""
+
+    type: str
+    column: str
+    location: str
+    provider: str
+    hits: int
+    sampled: int
+    hit_ratio: float
+    validated: int = 0
+
+
+class PiiAggregateModel(BaseModel):
+    """Pydantic view of PII matches rolled up per location and rule."""
+
+    type: str
+    location: str
+    provider: str
+    count: int
+    validated: int = 0
+    first_offset: int = 0
+    last_offset: int = 0
+    examples: List[str] = []
 
 
 class RiskModel(BaseModel):
@@ -39,16 +186,132 @@ class RiskModel(BaseModel):
     data_score: int
 
 
+class CacheStatsModel(BaseModel):
+    """Result cache hit and miss counts for a scan."""
+
+    hits: int = 0
+    misses: int = 0
+
+
 class AssetModel(BaseModel):
     """Representation of a discovered storage asset."""
 
     name: str
     provider: str
-    public: bool
+    public: bool | None
     encryption: str | None
-    versioning: bool
+    versioning: bool | None
     policy: str
     region: str | None
+    posture_unknown: List[str] = []
+
+
+class SnapshotModel(BaseModel):
+    """Metadata describing a retained scan snapshot."""
+
+    id: str
+    providers: List[str]
+    created_at: float
+
+
+class HistoryScanModel(BaseModel):
+    """Summary of a scan recorded in the history store."""
+
+    id: int
+    created_at: float
+    providers: List[str]
+    score: int
+    misconfiguration_score: int
+    data_score: int
+    assets: int
+    errors: Dict[str, str] = {}
+
+
+class HistoryFindingModel(BaseModel):
+    """A finding as recorded in the history store, without matched values."""
+
+    kind: str
+    provider: str
+    resource: str
+    rule: str
+    location: str
+    severity: str
+    count: int
+    validated: int
+
+
+class HistoryDiffModel(BaseModel):
+    """Findings new, resolved and persistent between two recorded scans."""
+
+    base: int
+    head: int
+    new: List[HistoryFindingModel]
+    resolved: List[HistoryFindingModel]
+    persistent: List[HistoryFindingModel]
+
+
+class RiskPointModel(BaseModel):
+    """Risk breakdown and finding counts of one recorded scan."""
+
+    scan_id: int
+    created_at: float
+    score: int
+    misconfiguration_score: int
+    data_score: int
+    findings: int
+    matches: int
+
+
+class ProviderProgressModel(BaseModel):
+    """Per-provider progress of a scan job."""
+
+    stage: str
+    discovered: int
+    classified: int
+
+
+class JobModel(BaseModel):
+    """Status of an asynchronous scan job."""
+
+    id: str
+    providers: List[str]
+    status: str
+    progress: Dict[str, ProviderProgressModel]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    snapshot_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job: ScanJob) -> "JobModel":
+        """Build a response model from a job record."""
+
+        return cls(
+            id=job.id,
+            providers=job.providers,
+            status=job.status,
+            progress={
+                provider: ProviderProgressModel(**entry.__dict__)
+                for provider, entry in job.progress.items()
+            },
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            snapshot_id=job.snapshot_id,
+            error=job.error,
+        )
+
+
+class ShardStatusModel(BaseModel):
+    """Outcome of one shard of a sharded scan."""
+
+    shard: str
+    provider: str
+    status: str
+    assets: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
 
 
 class ScanResponse(BaseModel):
@@ -59,61 +322,441 @@ class ScanResponse(BaseModel):
     misconfigurations: List[MisconfigurationModel]
     lineage: dict
     risk: RiskModel
+    errors: Dict[str, str] = {}
+    cache_stats: CacheStatsModel = CacheStatsModel()
+    column_findings: List[ColumnFindingModel] = []
+    pii_aggregates: List[PiiAggregateModel] = []
+    shards: List[ShardStatusModel] = []
+    snapshot_id: Optional[str] = None
 
     @classmethod
-    def from_result(cls, result: ScanResult) -> "ScanResponse":
+    def from_result(
+        cls, result: ScanResult, snapshot_id: Optional[str] = None
+    ) -> "ScanResponse":
         """Build a response model from a core scan result."""
 
         return cls(
             assets=[AssetModel(**bucket.to_dict()) for bucket in result.assets.buckets],
             pii_findings=[PiiFindingModel(**finding.__dict__) for finding in result.pii_findings],
             misconfigurations=[
-                MisconfigurationModel(**finding.__dict__) for finding in result.misconfigurations
+                MisconfigurationModel(**asdict(finding)) for finding in result.misconfigurations
             ],
             lineage=result.lineage.to_json(),
             risk=RiskModel(**result.risk.__dict__),
+            errors=result.errors,
+            cache_stats=CacheStatsModel(**result.cache_stats.__dict__),
+            column_findings=[
+                ColumnFindingModel(**finding.__dict__) for finding in result.column_findings
+            ],
+            pii_aggregates=[
+                PiiAggregateModel(**aggregate.__dict__) for aggregate in result.pii_aggregates
+            ],
+            shards=[ShardStatusModel(**asdict(status)) for status in result.shards],
+            snapshot_id=snapshot_id,
         )
 
 
+def _resolve_snapshot(snapshot_id: Optional[str], max_age: Optional[float]) -> ScanSnapshot:
+    """Return the requested snapshot, or the latest one covering every provider.
+
+    Snapshots of ad-hoc provider subsets are never served as the default; a full
+    scan runs when no fresh snapshot covers every registered provider.
+    """
+
+    if snapshot_id:
+        snapshot = snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail=f"Unknown snapshot: {snapshot_id}")
+        return snapshot
+    ttl = SNAPSHOT_TTL if max_age is None else max_age
+    providers = provider_names()
+    return snapshots.latest(max_age=ttl, providers=providers) or snapshots.scan(
+        get_scanner(), providers
+    )
+
+
+def _conditional(request: Request, response: Response, snapshot: ScanSnapshot) -> bool:
+    """Set caching headers and report whether the client's copy is still current."""
+
+    response.headers["ETag"] = snapshot.etag
+    response.headers["X-Snapshot-Id"] = snapshot.id
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip() for tag in if_none_match.split(",") if tag.strip()}
+    return "*" in tags or snapshot.etag in tags or f"W/{snapshot.etag}" in tags
+
+
+def _not_modified(snapshot: ScanSnapshot) -> Response:
+    """Return an empty 304 response for an unchanged snapshot."""
+
+    return Response(
+        status_code=304, headers={"ETag": snapshot.etag, "X-Snapshot-Id": snapshot.id}
+    )
+
+
+def _resolve_page(
+    snapshot_id: Optional[str], max_age: Optional[float], cursor: Optional[str]
+) -> Tuple[ScanSnapshot, int]:
+    """Return the snapshot and start position for a list request."""
+
+    if not cursor:
+        return _resolve_snapshot(snapshot_id, max_age), 0
+    try:
+        cursor_snapshot, position = decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if snapshot_id and snapshot_id != cursor_snapshot:
+        raise HTTPException(status_code=400, detail="Cursor belongs to a different snapshot")
+    return _resolve_snapshot(cursor_snapshot, None), position
+
+
+def _list_response(
+    request: Request,
+    response: Response,
+    snapshot: ScanSnapshot,
+    items: Sequence[Any],
+    predicate: Predicate,
+    record: Callable[[Any], Dict[str, Any]],
+    start: int,
+    limit: Optional[int],
+    fmt: Optional[str],
+) -> List[Dict[str, Any]] | Response:
+    """Serve one page of filtered items, or stream them as NDJSON when requested."""
+
+    if _conditional(request, response, snapshot):
+        return _not_modified(snapshot)
+    if fmt == "ndjson" or NDJSON in request.headers.get("accept", ""):
+        matching = iter_matching(items, predicate, start)
+        if limit is not None:
+            matching = islice(matching, limit)
+        return StreamingResponse(
+            iter_ndjson(record(item) for item in matching),
+            media_type=NDJSON,
+            headers={"ETag": snapshot.etag, "X-Snapshot-Id": snapshot.id},
+        )
+    page = paginate(items, predicate, snapshot.id, start, limit or DEFAULT_PAGE_SIZE)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return [record(item) for item in page.items]
+
+
 @app.post("/scan", response_model=ScanResponse)
-def run_scan(providers: List[str] | None = None) -> ScanResponse:  # pragma: no cover
-    """Execute a scan across the requested providers."""
+def run_scan(
+    response: Response, providers: List[str] | None = None
+) -> ScanResponse:  # pragma: no cover
+    """Execute a scan across the requested providers and store it as a snapshot."""
 
-    providers = providers or ["aws", "azure", "gcp"]
-    result = scanner.scan(providers)
-    return ScanResponse.from_result(result)
+    providers = providers or provider_names()
+    snapshot = snapshots.scan(get_scanner(), providers)
+    response.headers["ETag"] = snapshot.etag
+    response.headers["X-Snapshot-Id"] = snapshot.id
+    return ScanResponse.from_result(snapshot.result, snapshot_id=snapshot.id)
 
 
-@app.get("/misconfigurations", response_model=List[MisconfigurationModel])
-def list_misconfigurations() -> List[MisconfigurationModel]:  # pragma: no cover
-    """Return current misconfiguration findings."""
+@app.post("/scan/stream")
+def stream_scan(providers: List[str] | None = None) -> StreamingResponse:  # pragma: no cover
+    """Stream assets and findings as NDJSON while the scan runs, ending with a summary.
 
-    result = scanner.scan(["aws", "azure", "gcp"])
-    return [MisconfigurationModel(**finding.__dict__) for finding in result.misconfigurations]
+    Batches are written as soon as the pipeline evaluates them, and a slow client
+    slows the pipeline down instead of buffering results. Streamed scans are not
+    stored as snapshots.
+    """
 
+    try:
+        pipeline = get_scanner().stream(providers or provider_names())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-@app.get("/sensitive-data", response_model=List[PiiFindingModel])
-def list_sensitive_data() -> List[PiiFindingModel]:  # pragma: no cover
-    """Return current PII findings."""
+    async def body() -> AsyncIterator[bytes]:
+        async for batch in pipeline:
+            yield b"".join(iter_ndjson(batch.records()))
+        yield b"".join(iter_ndjson(iter([pipeline.summary.record()])))
 
-    result = scanner.scan(["aws", "azure", "gcp"])
-    return [PiiFindingModel(**finding.__dict__) for finding in result.pii_findings]
+    return StreamingResponse(body(), media_type=NDJSON)
 
 
-@app.get("/lineage")
-def get_lineage() -> dict:  # pragma: no cover
-    """Return lineage information in JSON form."""
+@app.post("/scans", response_model=JobModel, status_code=202)
+def submit_scan_job(providers: List[str] | None = None) -> JobModel:  # pragma: no cover
+    """Queue a background scan and return its job immediately."""
 
-    result = scanner.scan(["aws", "azure", "gcp"])
-    return result.lineage.to_json()
+    requested = [provider.lower() for provider in providers or provider_names()]
+    unsupported = {provider for provider in requested if provider not in PROVIDERS}
+    if unsupported:
+        raise HTTPException(
+            status_code=422, detail=f"Unsupported providers: {sorted(unsupported)}"
+        )
+    try:
+        job = jobs.submit(list(dict.fromkeys(requested)))
+    except JobQueueFull as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    return JobModel.from_job(job)
 
 
-@app.get("/risk-score", response_model=RiskModel)
-def get_risk() -> RiskModel:  # pragma: no cover
-    """Return aggregate risk score and contributing components."""
+@app.get("/scans", response_model=List[JobModel])
+def list_scan_jobs() -> List[JobModel]:  # pragma: no cover
+    """Return retained scan jobs, oldest first."""
+
+    return [JobModel.from_job(job) for job in jobs.jobs()]
+
+
+@app.get("/scans/{job_id}", response_model=JobModel)
+def get_scan_job(job_id: str) -> JobModel:  # pragma: no cover
+    """Return status and per-provider progress for a scan job."""
+
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scan job: {job_id}")
+    return JobModel.from_job(job)
+
+
+@app.delete("/scans/{job_id}", response_model=JobModel)
+def cancel_scan_job(job_id: str) -> JobModel:  # pragma: no cover
+    """Cancel a queued or running scan job."""
+
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scan job: {job_id}")
+    return JobModel.from_job(job)
+
 
-    result = scanner.scan(["aws", "azure", "gcp"])
-    return RiskModel(**result.risk.__dict__)
+@app.get("/snapshots", response_model=List[SnapshotModel])
+def list_snapshots() -> List[SnapshotModel]:  # pragma: no cover
+    """Return metadata for retained scan snapshots, oldest first."""
+
+    return [
+        SnapshotModel(id=item.id, providers=list(item.providers), created_at=item.created_at)
+        for item in snapshots.history()
+    ]
+
+
+@app.get("/misconfigurations", response_model=List[MisconfigurationModel])
+def list_misconfigurations(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+    provider: Optional[str] = None,
+    finding_type: Optional[str] = Query(None, alias="type"),
+    severity: Optional[str] = None,
+    resource: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$"),
+) -> List[Dict[str, Any]] | Response:  # pragma: no cover
+    """Return misconfiguration findings from the latest (or requested) snapshot."""
+
+    snapshot, start = _resolve_page(snapshot_id, max_age, cursor)
+    return _list_response(
+        request,
+        response,
+        snapshot,
+        snapshot.result.misconfigurations,
+        misconfig_filter(provider, finding_type, severity, resource),
+        asdict,
+        start,
+        limit,
+        fmt,
+    )
+
+
+@app.get("/sensitive-data", response_model=List[PiiFindingModel])
+def list_sensitive_data(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+    provider: Optional[str] = None,
+    finding_type: Optional[str] = Query(None, alias="type"),
+    resource: Optional[str] = None,
+    validated: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$"),
+) -> List[Dict[str, Any]] | Response:  # pragma: no cover
+    """Return PII findings from the latest (or requested) snapshot.
+
+    Aggregated scans have no individual findings; see ``/sensitive-data/aggregates``.
+    """
+
+    snapshot, start = _resolve_page(snapshot_id, max_age, cursor)
+    return _list_response(
+        request,
+        response,
+        snapshot,
+        snapshot.result.pii_findings,
+        pii_filter(provider, finding_type, resource, validated),
+        lambda finding: finding.__dict__,
+        start,
+        limit,
+        fmt,
+    )
+
+
+@app.get("/sensitive-data/aggregates", response_model=List[PiiAggregateModel])
+def list_sensitive_data_aggregates(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+    provider: Optional[str] = None,
+    finding_type: Optional[str] = Query(None, alias="type"),
+    resource: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$"),
+) -> List[Dict[str, Any]] | Response:  # pragma: no cover
+    """Return PII aggregates from the latest (or requested) snapshot.
+
+    Scans run with ``DSPM_AGGREGATE_PII=1`` report PII here instead of through
+    ``/sensitive-data``.
+    """
+
+    snapshot, start = _resolve_page(snapshot_id, max_age, cursor)
+    return _list_response(
+        request,
+        response,
+        snapshot,
+        snapshot.result.pii_aggregates,
+        pii_filter(provider, finding_type, resource),
+        lambda aggregate: aggregate.__dict__,
+        start,
+        limit,
+        fmt,
+    )
+
+
+@app.get("/assets", response_model=List[AssetModel])
+def list_assets(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+    provider: Optional[str] = None,
+    resource: Optional[str] = None,
+    region: Optional[str] = None,
+    public: Optional[bool] = None,
+    encrypted: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$"),
+) -> List[Dict[str, Any]] | Response:  # pragma: no cover
+    """Return discovered storage assets from the latest (or requested) snapshot."""
+
+    snapshot, start = _resolve_page(snapshot_id, max_age, cursor)
+    return _list_response(
+        request,
+        response,
+        snapshot,
+        snapshot.result.assets.buckets,
+        asset_filter(provider, resource, region, public, encrypted),
+        asset_record,
+        start,
+        limit,
+        fmt,
+    )
+
+
+@app.get("/lineage", response_model=dict)
+def get_lineage(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+) -> dict | Response:  # pragma: no cover
+    """Return lineage information in JSON form from the latest (or requested) snapshot."""
+
+    snapshot = _resolve_snapshot(snapshot_id, max_age)
+    if _conditional(request, response, snapshot):
+        return _not_modified(snapshot)
+    return snapshot.result.lineage.to_json()
+
+
+@app.get("/risk-score", response_model=RiskModel)
+def get_risk(
+    request: Request,
+    response: Response,
+    snapshot_id: Optional[str] = None,
+    max_age: Optional[float] = None,
+) -> RiskModel | Response:  # pragma: no cover
+    """Return the risk breakdown from the latest (or requested) snapshot."""
+
+    snapshot = _resolve_snapshot(snapshot_id, max_age)
+    if _conditional(request, response, snapshot):
+        return _not_modified(snapshot)
+    return RiskModel(**snapshot.result.risk.__dict__)
+
+
+def _history() -> ScanHistory:
+    """Return the configured scan history, or fail with 404 when it is disabled."""
+
+    history = get_history()
+    if history is None:
+        raise HTTPException(status_code=404, detail="Scan history is disabled")
+    return history
+
+
+@app.get("/history/scans", response_model=List[HistoryScanModel])
+def list_history_scans(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+) -> List[HistoryScanModel]:  # pragma: no cover
+    """Return recorded scans, newest first."""
+
+    return [HistoryScanModel(**record.__dict__) for record in _history().scans(limit=limit)]
+
+
+@app.get("/history/diff", response_model=HistoryDiffModel)
+def diff_history(
+    base: Optional[int] = None,
+    head: Optional[int] = None,
+    provider: Optional[str] = None,
+    resource: Optional[str] = None,
+    rule: Optional[str] = None,
+    finding_type: Optional[str] = Query(None, alias="type", pattern=HISTORY_KIND_PATTERN),
+) -> HistoryDiffModel:  # pragma: no cover
+    """Diff two recorded scans; without ids, the two most recent scans are compared."""
+
+    store = _history()
+    if base is None or head is None:
+        pair = store.latest_pair()
+        if pair is None:
+            raise HTTPException(status_code=404, detail="At least two recorded scans are needed")
+        base, head = pair
+    try:
+        diff = store.diff(base, head, provider, resource, rule, finding_type)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
+    return HistoryDiffModel(
+        base=diff.base,
+        head=diff.head,
+        new=[HistoryFindingModel(**item.__dict__) for item in diff.new],
+        resolved=[HistoryFindingModel(**item.__dict__) for item in diff.resolved],
+        persistent=[HistoryFindingModel(**item.__dict__) for item in diff.persistent],
+    )
+
+
+@app.get("/history/trend", response_model=List[RiskPointModel])
+def history_trend(
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    provider: Optional[str] = None,
+    resource: Optional[str] = None,
+    rule: Optional[str] = None,
+) -> List[RiskPointModel]:  # pragma: no cover
+    """Return risk scores and matching finding counts per recorded scan, oldest first."""
+
+    points = _history().trend(since, until, limit, provider, resource, rule)
+    return [RiskPointModel(**point.__dict__) for point in points]
+
+
+@app.get("/metrics", response_class=Response)
+def prometheus_metrics() -> Response:  # pragma: no cover
+    """Expose scan metrics in the Prometheus text format when ``DSPM_METRICS=1``."""
+
+    if not metrics.is_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/healthz")
@@ -0,0 +1,136 @@
+"""Versioned scan snapshots served by the API read endpoints."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dspm_engine.core.logging_utils import get_logger
+from dspm_engine.core.scanner import Scanner, ScanResult
+
+logger = get_logger(__name__)
+
+
+def provider_key(providers: Iterable[str]) -> Tuple[str, ...]:
+    """Normalize a provider list to the sorted, lower-case tuple snapshots are keyed by."""
+
+    return tuple(sorted({provider.lower() for provider in providers}))
+
+
+@dataclass
+class ScanSnapshot:
+    """Immutable view of one completed scan."""
+
+    id: str
+    providers: Tuple[str, ...]
+    result: ScanResult
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag identifying this snapshot's content."""
+
+        return f'"{self.id}"'
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds elapsed since the snapshot was taken."""
+
+        return (now if now is not None else time.time()) - self.created_at
+
+
+class SnapshotStore:
+    """Keep recent scan snapshots and run at most one scan at a time.
+
+    Provider lists are normalized with :func:`provider_key`, so requests for a scan
+    of the same providers, in any case or order, that arrive while one is queued or
+    running share its snapshot instead of triggering another scan.
+    """
+
+    def __init__(self, max_snapshots: int = 10) -> None:
+        """Create a store retaining up to ``max_snapshots`` snapshots."""
+
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, ScanSnapshot]" = OrderedDict()
+        self._pending: Dict[Tuple[str, ...], Future] = {}
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+
+    def latest(
+        self, max_age: Optional[float] = None, providers: Optional[Iterable[str]] = None
+    ) -> Optional[ScanSnapshot]:
+        """Return the newest snapshot, or ``None`` if none is younger than ``max_age``.
+
+        With ``providers``, only snapshots covering exactly that provider set are
+        considered, so a scan of a subset is never served as the whole estate.
+        """
+
+        key = provider_key(providers) if providers is not None else None
+        with self._lock:
+            snapshot = next(
+                (
+                    item
+                    for item in reversed(self._snapshots.values())
+                    if key is None or item.providers == key
+                ),
+                None,
+            )
+        if snapshot is None:
+            return None
+        if max_age is not None and snapshot.age() > max_age:
+            return None
+        return snapshot
+
+    def get(self, snapshot_id: str) -> Optional[ScanSnapshot]:
+        """Return a retained snapshot by id."""
+
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    def history(self) -> List[ScanSnapshot]:
+        """Return retained snapshots, oldest first."""
+
+        with self._lock:
+            return list(self._snapshots.values())
+
+    def add(self, result: ScanResult, providers: Iterable[str]) -> ScanSnapshot:
+        """Record a completed scan as a new snapshot, evicting the oldest if full."""
+
+        snapshot = ScanSnapshot(
+            id=uuid.uuid4().hex[:16], providers=provider_key(providers), result=result
+        )
+        with self._lock:
+            self._snapshots[snapshot.id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def scan(self, scanner: Scanner, providers: Iterable[str]) -> ScanSnapshot:
+        """Run a scan and snapshot it, coalescing with an identical pending scan."""
+
+        key = provider_key(providers)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                future: Future = Future()
+                self._pending[key] = future
+        if pending is not None:
+            logger.info("Joining pending scan for providers %s", list(key))
+            return pending.result()
+
+        try:
+            with self._scan_lock:
+                snapshot = self.add(scanner.scan(key), key)
+            future.set_result(snapshot)
+            return snapshot
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
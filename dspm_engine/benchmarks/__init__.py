@@ -0,0 +1 @@
+"""Micro-benchmarks for DSPM engine hot paths."""
@@ -0,0 +1,229 @@
+"""Seeded synthetic storage estates for benchmarks.
+
+An estate is a reproducible stream of :class:`StorageAsset` records spread across
+providers, with configurable public, encrypted and versioned ratios and PII
+density. Each asset carries a prose or CSV ``sample_content`` payload. Payloads
+are drawn from a fixed pool of variants shared between assets, so a
+million-asset estate only costs memory for the asset records themselves.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.core.validators import get_validator
+
+PROVIDER_REGIONS = {
+    "aws": ("ap-southeast-2", "us-east-1", "eu-west-1"),
+    "azure": ("australiaeast", "eastus", "westeurope"),
+    "gcp": ("australia-southeast1", "us-central1", "europe-west1"),
+}
+# Digit groups and checksum validator of each bundled PII rule.
+PII_FORMATS: Dict[str, Tuple[Tuple[int, ...], str]] = {
+    "TFN": ((3, 3, 3), "tfn"),
+    "Medicare": ((4, 5, 1), "medicare"),
+    "ABN": ((2, 3, 3, 3), "abn"),
+    "Credit Card": ((4, 4, 4, 4), "luhn"),
+}
+_WORDS = (
+    "invoice customer total region order status note reference shipment account "
+    "balance quarterly summary pending approved archive export ledger supplier"
+).split()
+_FIRST_NAMES = ("Ava", "Noah", "Mia", "Leo", "Zoe", "Kai", "Ivy", "Max")
+_LAST_NAMES = ("Nguyen", "Smith", "Patel", "Jones", "Chen", "Brown", "Singh", "Kelly")
+
+
+@dataclass(frozen=True)
+class EstateProfile:
+    """Shape of a synthetic estate; equal profiles generate identical estates.
+
+    Attributes:
+        assets: Number of assets, spread round-robin over ``providers``.
+        providers: Providers the assets belong to.
+        public_ratio: Share of assets that are publicly accessible.
+        encrypted_ratio: Share of assets with encryption at rest.
+        versioned_ratio: Share of assets with versioning enabled.
+        pii_density: Share of assets whose payload contains PII.
+        csv_ratio: Share of payloads that are CSV rather than prose.
+        valid_ratio: Share of generated PII values that pass their checksum.
+        payload_size: Approximate payload length in characters.
+        variants: Distinct payloads generated per kind (clean or sensitive).
+        seed: Random seed.
+    """
+
+    assets: int = 1000
+    providers: Tuple[str, ...] = ("aws", "azure", "gcp")
+    public_ratio: float = 0.1
+    encrypted_ratio: float = 0.8
+    versioned_ratio: float = 0.7
+    pii_density: float = 0.3
+    csv_ratio: float = 0.4
+    valid_ratio: float = 0.5
+    payload_size: int = 1024
+    variants: int = 256
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        """Reject ratios outside ``[0, 1]`` and malformed estate shapes."""
+
+        for name in (
+            "public_ratio",
+            "encrypted_ratio",
+            "versioned_ratio",
+            "pii_density",
+            "csv_ratio",
+            "valid_ratio",
+        ):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        if self.assets < 0 or self.payload_size < 1 or self.variants < 1:
+            raise ValueError("assets, payload_size and variants must be positive")
+        unknown = set(self.providers) - set(PROVIDER_REGIONS)
+        if not self.providers or unknown:
+            raise ValueError(f"Unsupported providers requested: {sorted(unknown)}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile as a JSON-ready mapping."""
+
+        payload = asdict(self)
+        payload["providers"] = list(self.providers)
+        return payload
+
+
+def pii_value(rule: str, rng: random.Random, valid: bool) -> str:
+    """Return a value in ``rule``'s format that passes (or fails) its checksum."""
+
+    groups, validator_name = PII_FORMATS[rule]
+    validator = get_validator(validator_name)
+    while True:
+        digits = "".join(str(rng.randint(0, 9)) for _ in range(sum(groups)))
+        if digits[0] != "0" and validator(digits) == valid:
+            break
+    parts = []
+    start = 0
+    for size in groups:
+        parts.append(digits[start : start + size])
+        start += size
+    return " ".join(parts)
+
+
+def _pii_values(rng: random.Random, valid_ratio: float, count: int) -> List[Tuple[str, str]]:
+    """Return ``count`` labelled PII values."""
+
+    rules = list(PII_FORMATS)
+    return [
+        (rule, pii_value(rule, rng, rng.random() < valid_ratio))
+        for rule in (rng.choice(rules) for _ in range(count))
+    ]
+
+
+def text_payload(rng: random.Random, size: int, sensitive: bool, valid_ratio: float) -> str:
+    """Return prose of about ``size`` characters, with labelled PII when ``sensitive``."""
+
+    parts: List[str] = []
+    length = 0
+    values = _pii_values(rng, valid_ratio, rng.randint(1, 3)) if sensitive else []
+    slots = {rng.randrange(max(1, size // 40)): value for value in values}
+    while length < size:
+        if len(parts) in slots:
+            rule, value = slots.pop(len(parts))
+            part = f"{rule}: {value},"
+        elif rng.random() < 0.15:
+            part = str(rng.randint(0, 99999))
+        else:
+            part = rng.choice(_WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    parts.extend(f"{rule}: {value}" for rule, value in slots.values())
+    return " ".join(parts)
+
+
+def csv_payload(rng: random.Random, size: int, sensitive: bool, valid_ratio: float) -> str:
+    """Return a CSV export of about ``size`` characters, with PII columns when ``sensitive``."""
+
+    header = ["id", "region", "amount", "status"]
+    if sensitive:
+        header += ["name", "tfn", "card"]
+    lines = [",".join(header)]
+    length = len(lines[0])
+    row_id = 0
+    while length < size:
+        row_id += 1
+        row = [
+            str(row_id),
+            rng.choice(PROVIDER_REGIONS["aws"]),
+            f"{rng.uniform(1, 5000):.2f}",
+            rng.choice(("pending", "approved", "archived")),
+        ]
+        if sensitive:
+            row += [
+                f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+                pii_value("TFN", rng, rng.random() < valid_ratio),
+                pii_value("Credit Card", rng, rng.random() < valid_ratio),
+            ]
+        line = ",".join(row)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def payload_pool(profile: EstateProfile) -> Tuple[List[str], List[str]]:
+    """Return ``(clean, sensitive)`` payload variants for a profile."""
+
+    rng = random.Random(f"{profile.seed}:payloads")
+    pools: Tuple[List[str], List[str]] = ([], [])
+    for sensitive, pool in enumerate(pools):
+        for _ in range(profile.variants):
+            build = csv_payload if rng.random() < profile.csv_ratio else text_payload
+            pool.append(build(rng, profile.payload_size, bool(sensitive), profile.valid_ratio))
+    return pools
+
+
+def generate_assets(profile: EstateProfile) -> Iterator[StorageAsset]:
+    """Yield the profile's assets lazily, in a reproducible order."""
+
+    clean, sensitive = payload_pool(profile)
+    rng = random.Random(f"{profile.seed}:assets")
+    providers = profile.providers
+    for index in range(profile.assets):
+        provider = providers[index % len(providers)]
+        public = rng.random() < profile.public_ratio
+        payload = rng.choice(sensitive if rng.random() < profile.pii_density else clean)
+        yield StorageAsset(
+            name=f"{provider}-bench-{index:07d}",
+            provider=provider,  # type: ignore[arg-type]
+            public=public,
+            encryption="AES256" if rng.random() < profile.encrypted_ratio else None,
+            versioning=rng.random() < profile.versioned_ratio,
+            policy="allow-all" if public and rng.random() < 0.5 else "restricted",
+            region=rng.choice(PROVIDER_REGIONS[provider]),
+            tags={"backup": "true"} if rng.random() < 0.05 else {},
+            sample_content=payload,
+            etag=f"{index:08x}",
+            size=len(payload),
+        )
+
+
+def by_provider(assets: Iterable[StorageAsset]) -> Dict[str, List[StorageAsset]]:
+    """Group assets by provider, keeping their order."""
+
+    grouped: Dict[str, List[StorageAsset]] = {}
+    for asset in assets:
+        grouped.setdefault(asset.provider, []).append(asset)
+    return grouped
+
+
+class EstateScanner(Scanner):
+    """Scanner whose discovery returns a synthetic estate instead of sample buckets."""
+
+    def __init__(self, estate: Dict[str, List[StorageAsset]], **options: Any) -> None:
+        """Create a scanner over ``estate`` (assets by provider); options go to Scanner."""
+
+        super().__init__(**options)
+        self.estate = estate
+
+    def _scan_provider(self, provider: str) -> Iterable[StorageAsset]:
+        return self.estate.get(provider, [])
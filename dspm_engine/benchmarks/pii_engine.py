@@ -0,0 +1,135 @@
+"""Compare per-rule PII scanning against the combined single-pass engine.
+
+Run with ``python -m dspm_engine.benchmarks.pii_engine``.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from functools import partial
+from typing import Callable, Dict, List, Sequence
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector, PiiFinding, PiiRule
+
+
+def synthetic_rules(count: int) -> List[PiiRule]:
+    """Return the bundled rules padded with labelled identifier rules."""
+
+    rules = list(PiiDetector.from_default_rules().rules)
+    for index in range(max(0, count - len(rules))):
+        rules.append(
+            PiiRule(
+                name=f"Identifier {index}",
+                pattern=rf"\bID{index:03d}-\d{{6}}\b",
+                description="Synthetic labelled identifier",
+            )
+        )
+    return rules[:count]
+
+
+def synthetic_assets(count: int, payload_size: int, seed: int = 7) -> List[StorageAsset]:
+    """Generate assets whose samples mix prose, numbers and occasional PII."""
+
+    rng = random.Random(seed)
+    words = ["invoice", "customer", "total", "region", "order", "status", "note", "ref"]
+    assets = []
+    for index in range(count):
+        parts: List[str] = []
+        while sum(len(part) + 1 for part in parts) < payload_size:
+            roll = rng.random()
+            if roll < 0.02:
+                parts.append(f"TFN {rng.randint(100, 999)} {rng.randint(100, 999)} 123")
+            elif roll < 0.04:
+                parts.append(f"ID{rng.randint(0, 99):03d}-{rng.randint(100000, 999999)}")
+            elif roll < 0.2:
+                parts.append(str(rng.randint(0, 99999)))
+            else:
+                parts.append(rng.choice(words))
+        assets.append(
+            StorageAsset(name=f"bench-{index}", provider="aws", sample_content=" ".join(parts))
+        )
+    return assets
+
+
+def per_rule_scan(rules: Sequence[PiiRule], assets: Sequence[StorageAsset]) -> List[PiiFinding]:
+    """Baseline that recompiles and rescans every rule for every payload."""
+
+    findings: List[PiiFinding] = []
+    for asset in assets:
+        content = asset.sample_content or ""
+        location = f"aws://{asset.name}/sample.txt"
+        for rule in rules:
+            for match in rule.compiled().finditer(content):
+                findings.append(
+                    PiiFinding(
+                        type=rule.name, sample=match.group(0), location=location, provider="aws"
+                    )
+                )
+    return findings
+
+
+def _time(func: Callable[[], List[PiiFinding]], repeat: int) -> float:
+    """Return the best wall time over ``repeat`` runs."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(
+    rule_counts: Sequence[int] = (4, 16, 64),
+    assets: int = 500,
+    payload_size: int = 2048,
+    repeat: int = 3,
+) -> List[Dict[str, float]]:
+    """Benchmark both strategies for each rule count and return timing rows."""
+
+    corpus = synthetic_assets(assets, payload_size)
+    rows = []
+    for count in rule_counts:
+        rules = synthetic_rules(count)
+        detector = PiiDetector(rules)
+        baseline = per_rule_scan(rules, corpus)
+        combined = detector.scan_content_samples("aws", corpus)
+        if [(f.type, f.sample, f.location) for f in baseline] != [
+            (f.type, f.sample, f.location) for f in combined
+        ]:
+            raise AssertionError(f"Combined engine diverged from per-rule scan at {count} rules")
+        per_rule_seconds = _time(partial(per_rule_scan, rules, corpus), repeat)
+        combined_seconds = _time(partial(detector.scan_content_samples, "aws", corpus), repeat)
+        rows.append(
+            {
+                "rules": count,
+                "findings": len(combined),
+                "per_rule_seconds": per_rule_seconds,
+                "combined_seconds": combined_seconds,
+                "speedup": per_rule_seconds / combined_seconds if combined_seconds else 0.0,
+            }
+        )
+    return rows
+
+
+def main() -> None:  # pragma: no cover - benchmark wrapper
+    """Print a timing table for increasing rule counts."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    args = parser.parse_args()
+
+    print(f"{'rules':>6} {'findings':>9} {'per-rule s':>11} {'combined s':>11} {'speedup':>8}")
+    for row in run(args.rules, args.assets, args.payload_size):
+        print(
+            f"{row['rules']:>6} {row['findings']:>9} {row['per_rule_seconds']:>11.4f} "
+            f"{row['combined_seconds']:>11.4f} {row['speedup']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
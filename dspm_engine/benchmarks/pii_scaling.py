@@ -0,0 +1,78 @@
+"""Measure process-pool PII classification throughput from 1 to N workers.
+
+Run with ``python -m dspm_engine.benchmarks.pii_scaling``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+from dspm_engine.benchmarks.pii_engine import synthetic_assets
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.pii_parallel import DEFAULT_BATCH_SIZE, ProcessPoolPiiDetector
+
+
+def run(
+    worker_counts: Optional[Sequence[int]] = None,
+    assets: int = 4000,
+    payload_size: int = 4096,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Dict[str, float]]:
+    """Time the inline detector and the process pool at each worker count."""
+
+    corpus = synthetic_assets(assets, payload_size)
+    total_bytes = sum(len(asset.sample_content or "") for asset in corpus)
+    worker_counts = worker_counts or range(1, (os.cpu_count() or 1) + 1)
+    inline = PiiDetector.from_default_rules()
+
+    started = time.perf_counter()
+    expected = inline.scan_content_samples("aws", corpus)
+    inline_seconds = time.perf_counter() - started
+    rows = [{"workers": 0, "seconds": inline_seconds, "mb_per_second": 0.0, "speedup": 1.0}]
+
+    for workers in worker_counts:
+        with ProcessPoolPiiDetector.from_detector(
+            inline, max_workers=workers, batch_size=batch_size
+        ) as pooled:
+            pooled.scan_content_samples("aws", corpus[:workers])  # warm the pool
+            started = time.perf_counter()
+            findings = pooled.scan_content_samples("aws", corpus)
+            seconds = time.perf_counter() - started
+        if findings != expected:
+            raise AssertionError(f"Process pool diverged from inline scan at {workers} workers")
+        rows.append(
+            {
+                "workers": workers,
+                "seconds": seconds,
+                "mb_per_second": 0.0,
+                "speedup": inline_seconds / seconds if seconds else 0.0,
+            }
+        )
+    for row in rows:
+        row["mb_per_second"] = total_bytes / 1e6 / row["seconds"] if row["seconds"] else 0.0
+    return rows
+
+
+def main() -> None:  # pragma: no cover - benchmark wrapper
+    """Print a scaling table; worker count 0 denotes the inline detector."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--assets", type=int, default=4000)
+    parser.add_argument("--payload-size", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'seconds':>9} {'MB/s':>8} {'speedup':>8}")
+    for row in run(args.workers, args.assets, args.payload_size, args.batch_size):
+        label = "inline" if row["workers"] == 0 else str(row["workers"])
+        print(
+            f"{label:>7} {row['seconds']:>9.3f} {row['mb_per_second']:>8.2f} "
+            f"{row['speedup']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,146 @@
+"""Compare peak memory of string rendering against streamed report output.
+
+Run with ``python -m dspm_engine.benchmarks.report_memory``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable, Dict, List, Sequence
+
+from dspm_engine.core.lineage import LineageGraph
+from dspm_engine.core.misconfig import MisconfigurationFinding
+from dspm_engine.core.models import AssetInventory, StorageAsset
+from dspm_engine.core.pii_detector import PiiFinding
+from dspm_engine.core.risk_score import RiskAssessor
+from dspm_engine.core.scanner import ScanResult
+from dspm_engine.report.reporter import Reporter
+
+
+def synthetic_result(findings: int, assets: int = 1000, seed: int = 11) -> ScanResult:
+    """Build a scan result with ``findings`` PII matches spread over ``assets`` buckets."""
+
+    rng = random.Random(seed)
+    buckets = [
+        StorageAsset(name=f"bucket-{index}", provider="aws", public=index % 7 == 0)
+        for index in range(assets)
+    ]
+    pii_findings = [
+        PiiFinding(
+            type="TFN",
+            sample=f"{rng.randint(100, 999)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+            location=f"aws://bucket-{index % assets}/exports/part-{index // assets:05d}.csv",
+            provider="aws",
+        )
+        for index in range(findings)
+    ]
+    misconfigurations = [
+        MisconfigurationFinding(
+            resource=bucket.name,
+            provider="aws",
+            issue="Public access enabled",
+            severity="HIGH",
+            detail="Bucket allows public reads",
+        )
+        for bucket in buckets
+        if bucket.public
+    ]
+    inventory = AssetInventory()
+    inventory.add(buckets)
+    lineage = LineageGraph()
+    lineage.add_provider_assets("aws", buckets)
+    return ScanResult(
+        assets=inventory,
+        pii_findings=pii_findings,
+        misconfigurations=misconfigurations,
+        lineage=lineage,
+        risk=RiskAssessor().calculate(pii_findings, misconfigurations),
+    )
+
+
+def _write_rendered(reporter: Reporter, result: ScanResult, fmt: str, path: str) -> None:
+    """Previous path: render the whole report to a string, then write it."""
+
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(reporter.render(result, fmt))  # type: ignore[arg-type]
+
+
+def _write_streamed(reporter: Reporter, result: ScanResult, fmt: str, path: str) -> None:
+    """Streaming path: write report chunks as they are produced."""
+
+    reporter.stream(result, fmt, path)  # type: ignore[arg-type]
+
+
+def _measure(write: Callable[[], None], path: str) -> Dict[str, float]:
+    """Return the peak traced allocation and wall time of one report write to ``path``."""
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    write()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_mb": peak / 1e6, "seconds": seconds, "size_mb": os.path.getsize(path) / 1e6}
+
+
+def run(
+    finding_counts: Sequence[int] = (10_000, 100_000), fmt: str = "json"
+) -> List[Dict[str, float]]:
+    """Benchmark ``render`` + ``write_text`` against ``stream`` for each result size."""
+
+    reporter = Reporter()
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        rendered_path = os.path.join(workdir, "rendered")
+        streamed_path = os.path.join(workdir, "streamed")
+        for count in finding_counts:
+            result = synthetic_result(count)
+            rendered = _measure(
+                partial(_write_rendered, reporter, result, fmt, rendered_path), rendered_path
+            )
+            streamed = _measure(
+                partial(_write_streamed, reporter, result, fmt, streamed_path), streamed_path
+            )
+            with open(rendered_path, "rb") as left, open(streamed_path, "rb") as right:
+                if left.read() != right.read():
+                    raise AssertionError(f"Streamed report diverged at {count} findings")
+            rows.append(
+                {
+                    "findings": count,
+                    "size_mb": rendered["size_mb"],
+                    "render_peak_mb": rendered["peak_mb"],
+                    "stream_peak_mb": streamed["peak_mb"],
+                    "render_seconds": rendered["seconds"],
+                    "stream_seconds": streamed["seconds"],
+                }
+            )
+    return rows
+
+
+def main() -> None:  # pragma: no cover - benchmark wrapper
+    """Print a peak-memory table for increasing result sizes."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--findings", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--format", choices=["markdown", "json"], default="json")
+    args = parser.parse_args()
+
+    print(
+        f"{'findings':>9} {'size MB':>8} {'render MB':>10} {'stream MB':>10} "
+        f"{'render s':>9} {'stream s':>9}"
+    )
+    for row in run(args.findings, args.format):
+        print(
+            f"{row['findings']:>9} {row['size_mb']:>8.1f} {row['render_peak_mb']:>10.1f} "
+            f"{row['stream_peak_mb']:>10.1f} {row['render_seconds']:>9.2f} "
+            f"{row['stream_seconds']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,117 @@
+"""Cold-start benchmarks for ``dspmctl scan aws`` and API boot.
+
+Each target runs in a fresh interpreter, so no module is already imported. The
+best wall time over ``repeat`` runs is reported as a :class:`BenchmarkResult`
+with scale ``cold``, which ``dspmctl bench`` compares against the same baseline
+as the estate cases. :func:`heavy_imports` reads ``-X importtime`` output to
+show which slow-to-import dependencies a target loads.
+
+Run with ``python -m dspm_engine.benchmarks.startup``.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from dspm_engine.benchmarks.suite import BenchmarkResult
+
+TARGETS: Dict[str, Tuple[str, ...]] = {
+    "startup-cli": ("-m", "dspm_engine.cli.dspmctl", "scan", "aws"),
+    "startup-api": ("-c", "import dspm_engine.api.server"),
+}
+# Dependencies that only some commands need, each costing 10 ms or more to import.
+HEAVY_MODULES = (
+    "networkx",
+    "jinja2",
+    "boto3",
+    "azure.storage.blob",
+    "google.cloud.storage",
+    "multiprocessing",
+    "urllib.request",
+)
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _environment() -> Dict[str, str]:
+    """Return the current environment with this checkout first on ``PYTHONPATH``."""
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def _command(target: str, *flags: str) -> List[str]:
+    if target not in TARGETS:
+        raise ValueError(f"Unknown startup target: {target}")
+    return [sys.executable, *flags, *TARGETS[target]]
+
+
+def time_target(target: str, repeat: int = 5) -> float:
+    """Return the best wall time, in seconds, of ``repeat`` cold runs of ``target``."""
+
+    command = _command(target)
+    env = _environment()
+    best = math.inf
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        subprocess.run(
+            command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def heavy_imports(target: str) -> List[str]:
+    """Return the :data:`HEAVY_MODULES` that one run of ``target`` imports."""
+
+    completed = subprocess.run(
+        _command(target, "-X", "importtime"),
+        env=_environment(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return [module for module in HEAVY_MODULES if module in imported]
+
+
+def run(targets: Sequence[str] = tuple(TARGETS), repeat: int = 5) -> List[BenchmarkResult]:
+    """Time each target from a cold interpreter."""
+
+    results = []
+    for target in targets:
+        seconds = time_target(target, repeat)
+        results.append(
+            BenchmarkResult(
+                case=target, scale="cold", items=1, seconds=seconds, throughput=1 / seconds
+            )
+        )
+    return results
+
+
+def main() -> None:  # pragma: no cover - benchmark wrapper
+    """Print cold-start times and the heavy modules each target imports."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for result in run(args.target, args.repeat):
+        heavy = ", ".join(heavy_imports(result.case)) or "none"
+        print(f"{result.case:<12} {result.seconds * 1000:>8.1f} ms  heavy imports: {heavy}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,344 @@
+"""Throughput and peak-memory benchmarks over a seeded synthetic estate.
+
+Covers the PII detector, the misconfiguration detector, lineage graph building,
+risk scoring, JSON report rendering and end-to-end scans. Each case runs at one
+or more estate scales (``1k``, ``100k``, ``1M`` or a plain asset count). Results
+can be saved as a baseline, and later runs are compared against it to catch
+regressions. ``dspmctl bench`` wraps this module.
+
+Run with ``python -m dspm_engine.benchmarks.suite``.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from dspm_engine.benchmarks.estate import EstateProfile, EstateScanner, by_provider, generate_assets
+from dspm_engine.core.lineage import LineageGraph
+from dspm_engine.core.misconfig import MisconfigurationDetector
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.risk_score import RiskAssessor
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+DEFAULT_TOLERANCE = 0.25
+# Peak-memory growth below this many megabytes is treated as noise.
+MIN_PEAK_DELTA_MB = 1.0
+# Fast cases are looped until one timed sample lasts at least this long.
+MIN_SAMPLE_SECONDS = 0.2
+
+Estate = Dict[str, List[StorageAsset]]
+# Prepares a case over an estate, returning the number of items it processes and
+# the callable to time. Preparation itself is not measured.
+Case = Callable[[Estate], Tuple[int, Callable[[], Any]]]
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one case at one estate scale."""
+
+    case: str
+    scale: str
+    items: int
+    seconds: float
+    throughput: float
+    peak_mb: Optional[float] = None
+
+
+@dataclass
+class Regression:
+    """A case whose throughput dropped, or whose peak memory grew, beyond tolerance."""
+
+    case: str
+    scale: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from the baseline, e.g. ``-0.3`` for 30% slower."""
+
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def parse_scale(label: str) -> Tuple[str, int]:
+    """Return ``(label, assets)`` for ``1k``/``100k``/``1M`` style labels or plain counts."""
+
+    text = label.strip()
+    if text in SCALES:
+        return text, SCALES[text]
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    digits = text[:-1] if multiplier > 1 else text
+    if not digits.isdigit() or int(digits) < 1:
+        raise ValueError(f"Invalid benchmark scale: {label}")
+    return text, int(digits) * multiplier
+
+
+def _total(estate: Estate) -> int:
+    return sum(len(assets) for assets in estate.values())
+
+
+def _pii_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    detector = PiiDetector.from_default_rules()
+
+    def run() -> None:
+        for provider, assets in estate.items():
+            detector.scan_content_samples(provider, assets)
+
+    return _total(estate), run
+
+
+def _misconfig_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    detector = MisconfigurationDetector()
+
+    def run() -> None:
+        for provider, assets in estate.items():
+            detector.evaluate_assets(provider, assets)
+
+    return _total(estate), run
+
+
+def _lineage_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    def run() -> LineageGraph:
+        graph = LineageGraph()
+        for provider, assets in estate.items():
+            graph.replace_provider_assets(provider, assets)
+        return graph
+
+    return _total(estate), run
+
+
+def _risk_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    detector = PiiDetector.from_default_rules()
+    misconfig = MisconfigurationDetector()
+    pii_findings = []
+    misconfigurations = []
+    for provider, assets in estate.items():
+        pii_findings.extend(detector.scan_content_samples(provider, assets))
+        misconfigurations.extend(misconfig.evaluate_assets(provider, assets))
+    assessor = RiskAssessor()
+    return len(pii_findings) + len(misconfigurations), lambda: assessor.calculate(
+        pii_findings, misconfigurations
+    )
+
+
+def _report_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    from dspm_engine.report.reporter import Reporter
+
+    scanner = EstateScanner(estate)
+    result = scanner.scan(list(estate))
+    scanner.close()
+    reporter = Reporter()
+    return _total(estate), lambda: reporter.render(result, "json")
+
+
+def _scan_case(estate: Estate) -> Tuple[int, Callable[[], Any]]:
+    def run() -> None:
+        scanner = EstateScanner(estate)
+        scanner.scan(list(estate))
+        scanner.close()
+
+    return _total(estate), run
+
+
+CASES: Dict[str, Case] = {
+    "pii": _pii_case,
+    "misconfig": _misconfig_case,
+    "lineage": _lineage_case,
+    "risk": _risk_case,
+    "report": _report_case,
+    "scan": _scan_case,
+}
+
+
+def _time_loops(func: Callable[[], Any], loops: int) -> float:
+    """Return the wall time of ``loops`` consecutive calls."""
+
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def measure(func: Callable[[], Any], repeat: int = 1, memory: bool = True) -> Tuple[float, Any]:
+    """Return the best per-call wall time over ``repeat`` samples and the traced peak in MB.
+
+    Calls faster than ``MIN_SAMPLE_SECONDS`` are looped (10x at a time) until a
+    sample is long enough to time reliably. Peak memory comes from one extra call
+    under :mod:`tracemalloc`, which would otherwise slow the timed samples down.
+    """
+
+    loops = 1
+    elapsed = _time_loops(func, loops)
+    while elapsed < MIN_SAMPLE_SECONDS:
+        loops *= 10
+        elapsed = _time_loops(func, loops)
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        best = min(best, _time_loops(func, loops) / loops)
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return best, peak_mb
+
+
+def run(
+    scales: Sequence[str] = ("1k",),
+    cases: Optional[Sequence[str]] = None,
+    repeat: int = 1,
+    profile: Optional[EstateProfile] = None,
+    memory: bool = True,
+) -> List[BenchmarkResult]:
+    """Run the selected cases at each scale over estates generated from ``profile``."""
+
+    selected = list(cases or CASES)
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+    base = profile or EstateProfile()
+    results = []
+    for label, assets in (parse_scale(scale) for scale in scales):
+        estate = by_provider(generate_assets(replace(base, assets=assets)))
+        for name in selected:
+            items, func = CASES[name](estate)
+            seconds, peak_mb = measure(func, repeat, memory)
+            results.append(
+                BenchmarkResult(
+                    case=name,
+                    scale=label,
+                    items=items,
+                    seconds=seconds,
+                    throughput=items / seconds if seconds else 0.0,
+                    peak_mb=peak_mb,
+                )
+            )
+        del estate
+    return results
+
+
+def _profile_key(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the asset count, which varies by scale, from a profile mapping."""
+
+    return {key: value for key, value in profile.items() if key != "assets"}
+
+
+def save_baseline(
+    results: Sequence[BenchmarkResult], path: Union[str, Path], profile: EstateProfile
+) -> None:
+    """Write results, the estate profile and the interpreter version to ``path``.
+
+    Entries of an existing baseline with the same profile are kept for the cases
+    and scales this run did not measure.
+    """
+
+    key = _profile_key(profile.to_dict())
+    entries = {(result.case, result.scale): asdict(result) for result in results}
+    target = Path(path)
+    if target.exists():
+        previous = load_baseline(target)
+        if previous.get("profile") == key:
+            for entry in previous.get("results", []):
+                entries.setdefault((entry["case"], entry["scale"]), entry)
+    payload = {
+        "python": platform.python_version(),
+        "profile": key,
+        "results": list(entries.values()),
+    }
+    target.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read a baseline written by :func:`save_baseline`."""
+
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(
+    results: Sequence[BenchmarkResult],
+    baseline: Dict[str, Any],
+    profile: EstateProfile,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Regression]:
+    """Return regressions of ``results`` against a loaded baseline.
+
+    Throughput may drop, and peak memory grow, by ``tolerance`` (a fraction) before
+    a case counts as regressed. Cases or scales missing from the baseline are
+    skipped. Raises ``ValueError`` if the baseline used a different estate profile.
+    """
+
+    if baseline.get("profile") != _profile_key(profile.to_dict()):
+        raise ValueError("Baseline was recorded with a different estate profile")
+    recorded = {(entry["case"], entry["scale"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        entry = recorded.get((result.case, result.scale))
+        if entry is None:
+            continue
+        if result.throughput < entry["throughput"] * (1 - tolerance):
+            regressions.append(
+                Regression(
+                    result.case, result.scale, "throughput", entry["throughput"], result.throughput
+                )
+            )
+        previous = entry.get("peak_mb")
+        if (
+            previous is not None
+            and result.peak_mb is not None
+            and result.peak_mb > previous * (1 + tolerance)
+            and result.peak_mb - previous > MIN_PEAK_DELTA_MB
+        ):
+            regressions.append(
+                Regression(result.case, result.scale, "peak_mb", previous, result.peak_mb)
+            )
+    return regressions
+
+
+def format_table(results: Sequence[BenchmarkResult]) -> List[str]:
+    """Return a header and one aligned line per result."""
+
+    header = ("case", "scale", "items", "seconds", "items/s", "peak MB")
+    lines = ["{:<12} {:>6} {:>9} {:>9} {:>12} {:>9}".format(*header)]
+    for result in results:
+        peak = "-" if result.peak_mb is None else f"{result.peak_mb:.1f}"
+        lines.append(
+            f"{result.case:<12} {result.scale:>6} {result.items:>9} {result.seconds:>9.4f} "
+            f"{result.throughput:>12.0f} {peak:>9}"
+        )
+    return lines
+
+
+def main() -> None:  # pragma: no cover - benchmark wrapper
+    """Print a throughput and peak-memory table for the selected cases and scales."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", nargs="+", default=["1k"], help="1k, 100k, 1M or a count")
+    parser.add_argument("--case", nargs="+", choices=sorted(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak-memory runs")
+    args = parser.parse_args()
+
+    profile = EstateProfile(seed=args.seed)
+    for line in format_table(
+        run(args.scale, args.case, args.repeat, profile, memory=not args.no_memory)
+    ):
+        print(line)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,76 @@
+"""Minimal HTTP client for the DSPM API used by ``dspmctl``."""
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_API_URL = "http://localhost:8000"
+FINISHED_STATES = {"succeeded", "failed", "cancelled"}
+
+
+class ApiError(RuntimeError):
+    """Raised when the API returns an error response."""
+
+
+class ApiClient:
+    """Submit and poll scan jobs over the DSPM REST API."""
+
+    def __init__(self, base_url: str = DEFAULT_API_URL, timeout: float = 30.0) -> None:
+        """Create a client for the API served at ``base_url``."""
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Any = None) -> Any:
+        """Send a JSON request and decode the JSON response."""
+
+        # urllib.request pulls in http.client and ssl; only commands that talk to
+        # the API should pay for that at startup.
+        import urllib.error
+        import urllib.request
+
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")
+            raise ApiError(f"{method} {path} failed with HTTP {exc.code}: {detail}") from exc
+
+    def submit_job(self, providers: List[str]) -> Dict[str, Any]:
+        """Queue a background scan and return the job record."""
+
+        return self._request("POST", "/scans", providers)
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Return the current state of a scan job."""
+
+        return self._request("GET", f"/scans/{job_id}")
+
+    def cancel_job(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued or running scan job."""
+
+        return self._request("DELETE", f"/scans/{job_id}")
+
+    def wait_for_job(
+        self,
+        job_id: str,
+        interval: float = 1.0,
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Poll a job until it finishes, invoking ``on_update`` after each poll."""
+
+        while True:
+            job = self.get_job(job_id)
+            if on_update:
+                on_update(job)
+            if job["status"] in FINISHED_STATES:
+                return job
+            time.sleep(interval)
@@ -3,12 +3,158 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+from dataclasses import asdict
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
+from dspm_engine.cli.api_client import DEFAULT_API_URL, ApiClient
+from dspm_engine.core import metrics
+from dspm_engine.core.history import FINDING_KINDS, ScanHistory
 from dspm_engine.core.logging_utils import setup_logging
-from dspm_engine.core.scanner import Scanner
-from dspm_engine.report.reporter import Reporter
+from dspm_engine.core.misconfig import MisconfigurationDetector
+from dspm_engine.core.models import posture_errors
+from dspm_engine.core.pii_detector import VALIDATION_MODES, PiiDetector
+from dspm_engine.core.prefilter import ContentRouter
+from dspm_engine.core.providers import provider_names
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.sampling import SAMPLING_STRATEGIES, SamplingPolicy
+from dspm_engine.core.scanner import DISCOVERY_MODES, PII_BACKENDS, Scanner
+from dspm_engine.core.shards import DEFAULT_CONFIG_PATH, ShardGroup, load_shards
+from dspm_engine.core.structured import TabularClassifier
+
+if TYPE_CHECKING:
+    from dspm_engine.benchmarks.suite import Regression
+    from dspm_engine.core.pipeline import PipelineSummary, ScanBatch
+
+
+def _add_scan_options(parser: argparse.ArgumentParser) -> None:
+    """Register options that tune how scans are executed."""
+
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of providers scanned concurrently"
+    )
+    parser.add_argument(
+        "--pii-backend",
+        choices=sorted(PII_BACKENDS),
+        default="inline",
+        help="Run PII classification inline or on a process pool",
+    )
+    parser.add_argument(
+        "--pii-workers", type=int, default=None, help="Processes for the process PII backend"
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite result cache; unchanged assets reuse their previous findings",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=None,
+        help="SQLite scan history that records every completed scan for diffs and trends",
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=sorted(DISCOVERY_MODES),
+        default="sample",
+        help="Use bundled sample assets or page through the live cloud APIs",
+    )
+    parser.add_argument(
+        "--sample-strategy",
+        choices=sorted(SAMPLING_STRATEGIES),
+        default=None,
+        help="Classify a bounded sample of each asset's objects instead of its sample content",
+    )
+    parser.add_argument(
+        "--sample-objects", type=int, default=20, help="Objects sampled per asset"
+    )
+    parser.add_argument(
+        "--sample-bytes", type=int, default=1024 * 1024, help="Byte budget per asset"
+    )
+    parser.add_argument(
+        "--sample-seconds", type=float, default=30.0, help="Latency budget per asset (s)"
+    )
+    parser.add_argument(
+        "--validation",
+        choices=sorted(VALIDATION_MODES),
+        default="mark",
+        help="Flag checksum-validated PII findings, or drop matches that fail validation",
+    )
+    parser.add_argument(
+        "--prefilter",
+        action="store_true",
+        help="Skip binary objects and inflate gzip/zip objects before PII classification",
+    )
+    parser.add_argument(
+        "--tabular",
+        action="store_true",
+        help="Classify sampled CSV, JSON Lines and Parquet objects per column",
+    )
+    parser.add_argument(
+        "--tabular-values", type=int, default=100, help="Values sampled per column"
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Roll PII matches up per object and rule, with masked examples",
+    )
+    parser.add_argument(
+        "--misconfig-rules",
+        type=Path,
+        default=None,
+        help="JSON file of extra misconfiguration rules, merged over the bundled rules",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print a JSON summary of stage timings and scan counters when done",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help="Scan each account and region/project in --providers-config "
+        "as an independent shard",
+    )
+    parser.add_argument(
+        "--providers-config",
+        type=Path,
+        default=DEFAULT_CONFIG_PATH,
+        help="providers.yaml used by --shards",
+    )
+
+
+def _build_scanner(args: argparse.Namespace) -> Scanner:
+    """Create a scanner configured from CLI options."""
+
+    return Scanner(
+        pii_detector=PiiDetector.from_default_rules(validation=args.validation),
+        max_workers=args.workers,
+        pii_backend=args.pii_backend,
+        pii_workers=args.pii_workers,
+        result_cache=ResultCache(args.cache) if args.cache else None,
+        history=ScanHistory(args.history) if args.history else None,
+        discovery=args.discovery,
+        sampling=(
+            SamplingPolicy(
+                strategy=args.sample_strategy,
+                max_objects=args.sample_objects,
+                max_bytes=args.sample_bytes,
+                max_seconds=args.sample_seconds,
+            )
+            if args.sample_strategy
+            else None
+        ),
+        misconfig_detector=(
+            MisconfigurationDetector.from_file(args.misconfig_rules)
+            if args.misconfig_rules
+            else None
+        ),
+        prefilter=ContentRouter() if args.prefilter else None,
+        tabular=TabularClassifier(max_values=args.tabular_values) if args.tabular else None,
+        aggregate_pii=args.aggregate,
+    )
 
 
 def parse_args() -> argparse.Namespace:
@@ -19,39 +165,358 @@ def parse_args() -> argparse.Namespace:
 
     scan_parser = subparsers.add_parser("scan", help="Run scans against providers")
     scan_parser.add_argument(
-        "providers", nargs="*", default=["aws", "azure", "gcp"], help="Provider list"
+        "providers", nargs="*", default=None, help="Provider list (default: all registered)"
+    )
+    _add_scan_options(scan_parser)
+    scan_parser.add_argument(
+        "--rule-stats", action="store_true", help="Print per-rule evaluation timings"
+    )
+    scan_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print assets and findings as NDJSON while the scan runs, then a summary",
     )
 
     report_parser = subparsers.add_parser("report", help="Generate reports from a new scan")
     report_parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
     report_parser.add_argument("--output", type=Path, default=Path("dspm_report.md"))
+    report_parser.add_argument(
+        "--gzip", action="store_true", help="Gzip-compress the report as it is written"
+    )
+    report_parser.add_argument(
+        "--template-dir",
+        type=Path,
+        default=None,
+        help="Directory of templates that override the bundled report templates",
+    )
+    _add_scan_options(report_parser)
+
+    jobs_parser = subparsers.add_parser("jobs", help="Submit and poll scan jobs on the API")
+    jobs_parser.add_argument("--url", default=DEFAULT_API_URL, help="DSPM API base URL")
+    jobs_subparsers = jobs_parser.add_subparsers(dest="jobs_command", required=True)
+    submit_parser = jobs_subparsers.add_parser("submit", help="Queue a background scan")
+    submit_parser.add_argument(
+        "providers", nargs="*", default=[], help="Provider list (default: all the API knows)"
+    )
+    submit_parser.add_argument("--wait", action="store_true", help="Poll until the job ends")
+    submit_parser.add_argument("--interval", type=float, default=1.0, help="Poll interval (s)")
+    status_parser = jobs_subparsers.add_parser("status", help="Show a job's progress")
+    status_parser.add_argument("job_id")
+    status_parser.add_argument("--wait", action="store_true", help="Poll until the job ends")
+    status_parser.add_argument("--interval", type=float, default=1.0, help="Poll interval (s)")
+    cancel_parser = jobs_subparsers.add_parser("cancel", help="Cancel a queued or running job")
+    cancel_parser.add_argument("job_id")
+
+    history_parser = subparsers.add_parser("history", help="Query the local scan history")
+    history_parser.add_argument(
+        "--db", type=Path, default=Path("dspm_history.sqlite"), help="Scan history database"
+    )
+    history_subparsers = history_parser.add_subparsers(dest="history_command", required=True)
+    list_parser = history_subparsers.add_parser("list", help="List recorded scans, newest first")
+    list_parser.add_argument("--limit", type=int, default=20)
+    diff_parser = history_subparsers.add_parser(
+        "diff", help="Show new, resolved and persistent findings between two scans"
+    )
+    diff_parser.add_argument("base", type=int, nargs="?", help="Older scan id")
+    diff_parser.add_argument("head", type=int, nargs="?", help="Newer scan id")
+    diff_parser.add_argument(
+        "--persistent", action="store_true", help="Also list findings present in both scans"
+    )
+    trend_parser = history_subparsers.add_parser("trend", help="Show risk scores over time")
+    trend_parser.add_argument("--limit", type=int, default=None, help="Most recent scans only")
+    trend_parser.add_argument("--since", type=float, default=None, help="Unix timestamp")
+    for query_parser in (diff_parser, trend_parser):
+        query_parser.add_argument("--provider", default=None)
+        query_parser.add_argument("--resource", default=None)
+        query_parser.add_argument("--rule", default=None)
+    diff_parser.add_argument("--kind", choices=FINDING_KINDS, default=None)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark the engine on a synthetic estate against a stored baseline"
+    )
+    bench_parser.add_argument(
+        "--scale", nargs="+", default=["1k"], help="Estate sizes: 1k, 100k, 1M or a count"
+    )
+    bench_parser.add_argument(
+        "--case",
+        nargs="+",
+        default=None,
+        help="Cases to run (default: all): pii, misconfig, lineage, risk, report, scan, "
+        "and the cold-start cases startup-cli and startup-api",
+    )
+    bench_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Estate generator seed")
+    bench_parser.add_argument(
+        "--baseline", type=Path, default=Path("dspm_bench_baseline.json"), help="Baseline file"
+    )
+    bench_parser.add_argument(
+        "--update-baseline", action="store_true", help="Overwrite the baseline with this run"
+    )
+    bench_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Allowed throughput drop or peak-memory growth, as a fraction (default: 0.25)",
+    )
+    bench_parser.add_argument("--no-memory", action="store_true", help="Skip peak-memory runs")
 
     return parser.parse_args()
 
 
-def run_scan(providers: Iterable[str]) -> Scanner:
-    """Execute a scan and print risk summary."""
+def _format_job(job: Dict[str, Any]) -> str:
+    """Summarize a job's status and per-provider progress on one line."""
+
+    progress = ", ".join(
+        f"{provider}={entry['stage']} ({entry['classified']}/{entry['discovered']})"
+        for provider, entry in job["progress"].items()
+    )
+    return f"{job['id']} {job['status']}: {progress}"
+
+
+def run_jobs(args: argparse.Namespace) -> Dict[str, Any]:
+    """Handle ``dspmctl jobs`` subcommands against the API."""
+
+    client = ApiClient(args.url)
+    if args.jobs_command == "submit":
+        job = client.submit_job(args.providers)
+    elif args.jobs_command == "cancel":
+        job = client.cancel_job(args.job_id)
+    else:
+        job = client.get_job(args.job_id)
+    print(_format_job(job))
+    if getattr(args, "wait", False):
+        job = client.wait_for_job(
+            job["id"], interval=args.interval, on_update=lambda item: print(_format_job(item))
+        )
+        if job.get("snapshot_id"):
+            print(f"Snapshot {job['snapshot_id']} is available from the API read endpoints")
+        if job.get("error"):
+            print(f"Error: {job['error']}")
+    return job
+
+
+def run_history(args: argparse.Namespace) -> None:
+    """Handle ``dspmctl history`` subcommands against the local history database."""
+
+    if not args.db.exists():
+        raise SystemExit(f"No scan history at {args.db}; scan with --history first")
+    history = ScanHistory(args.db)
+    try:
+        if args.history_command == "list":
+            for record in history.scans(limit=args.limit):
+                print(json.dumps(asdict(record)))
+        elif args.history_command == "trend":
+            for point in history.trend(
+                since=args.since,
+                limit=args.limit,
+                provider=args.provider,
+                resource=args.resource,
+                rule=args.rule,
+            ):
+                print(json.dumps(asdict(point)))
+        else:
+            pair = (args.base, args.head) if args.head is not None else history.latest_pair()
+            if pair is None or pair[0] is None:
+                raise SystemExit("Two scans are needed for a diff; pass BASE and HEAD ids")
+            diff = history.diff(
+                *pair,
+                provider=args.provider,
+                resource=args.resource,
+                rule=args.rule,
+                kind=args.kind,
+            )
+            print(f"Scan {diff.base} -> {diff.head}")
+            sections = [("+", diff.new), ("-", diff.resolved)]
+            if args.persistent:
+                sections.append(("=", diff.persistent))
+            for marker, findings in sections:
+                for finding in findings:
+                    print(
+                        f"{marker} {finding.kind} {finding.provider}/{finding.resource} "
+                        f"{finding.rule} {finding.location or finding.severity} x{finding.count}"
+                    )
+            print(
+                f"{len(diff.new)} new, {len(diff.resolved)} resolved, "
+                f"{len(diff.persistent)} persistent"
+            )
+    finally:
+        history.close()
 
-    scanner = Scanner()
-    result = scanner.scan(providers)
+
+def run_bench(args: argparse.Namespace) -> List[Regression]:
+    """Run benchmarks and compare them with the baseline, saving it when missing."""
+
+    from dspm_engine.benchmarks import startup
+    from dspm_engine.benchmarks import suite as bench
+    from dspm_engine.benchmarks.estate import EstateProfile
+
+    selected = args.case or [*bench.CASES, *startup.TARGETS]
+    unknown = sorted(set(selected) - set(bench.CASES) - set(startup.TARGETS))
+    if unknown:
+        raise SystemExit(f"Unknown benchmark cases: {unknown}")
+    profile = EstateProfile(seed=args.seed)
+    cases = [case for case in selected if case in bench.CASES]
+    results = (
+        bench.run(args.scale, cases, args.repeat, profile, memory=not args.no_memory)
+        if cases
+        else []
+    )
+    results += startup.run([case for case in selected if case in startup.TARGETS], args.repeat)
+    for line in bench.format_table(results):
+        print(line)
+    if args.update_baseline or not args.baseline.exists():
+        bench.save_baseline(results, args.baseline, profile)
+        print(f"Baseline written to {args.baseline}")
+        return []
+    try:
+        regressions = bench.compare(
+            results,
+            bench.load_baseline(args.baseline),
+            profile,
+            bench.DEFAULT_TOLERANCE if args.tolerance is None else args.tolerance,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"{exc}; rerun with --update-baseline") from exc
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.case} @ {regression.scale}: {regression.metric} "
+            f"{regression.baseline:.1f} -> {regression.current:.1f} ({regression.change:+.0%})"
+        )
+    print(f"{len(regressions)} regressions against {args.baseline}")
+    return regressions
+
+
+def run_stream(providers: Iterable[str], scanner: Scanner) -> PipelineSummary:
+    """Stream a scan, printing one JSON line per asset and finding as batches finish."""
+
+    def emit(batch: ScanBatch) -> None:
+        for record in batch.records():
+            print(json.dumps(record))
+        sys.stdout.flush()
+
+    summary = scanner.stream(providers).run(emit)
+    print(json.dumps(summary.record()))
+    return summary
+
+
+def shard_plan(
+    config: Path, providers: Optional[Iterable[str]] = None
+) -> List[ShardGroup]:
+    """Load the shard groups of a providers config, keeping only ``providers`` if given."""
+
+    wanted = {provider.lower() for provider in providers or ()}
+    return [group for group in load_shards(config) if not wanted or group.provider in wanted]
+
+
+def run_scan(
+    providers: Iterable[str],
+    scanner: Scanner | None = None,
+    rule_stats: bool = False,
+    shards: Optional[List[ShardGroup]] = None,
+) -> Scanner:
+    """Execute a scan, or a sharded scan of ``shards``, and print risk summary."""
+
+    scanner = scanner or Scanner()
+    result = scanner.scan(providers) if shards is None else scanner.scan_shards(shards)
     print(json.dumps(result.risk.__dict__, indent=2))
+    for status in result.shards:
+        print(
+            f"Shard {status.shard}: {status.status}, "
+            f"{status.assets} assets in {status.seconds:.2f}s"
+        )
+    unknown = posture_errors(result.assets.buckets)
+    for name, error in result.errors.items():
+        if name in unknown:
+            print(f"Asset {name}: {error}")
+        else:
+            print(f"{'Shard' if result.shards else 'Provider'} {name} failed: {error}")
+    for aggregate in result.pii_aggregates:
+        print(
+            f"PII {aggregate.location}: {aggregate.count} x {aggregate.type} "
+            f"({aggregate.validated} validated), e.g. {', '.join(aggregate.examples)}"
+        )
+    for column in result.column_findings:
+        print(
+            f"Column {column.location}#{column.column}: {column.type} in "
+            f"{column.hits}/{column.sampled} sampled values ({column.hit_ratio:.0%})"
+        )
+    if scanner.result_cache is not None:
+        stats = result.cache_stats
+        print(f"Result cache: {stats.hits} hits, {stats.misses} misses")
+    prefilter = scanner.pii_detector.prefilter
+    if prefilter is not None:
+        counters = prefilter.stats
+        skipped = ", ".join(
+            f"{reason}={size}" for reason, size in sorted(counters.skipped_bytes.items())
+        )
+        print(
+            f"Pre-filter: {counters.scanned_bytes} bytes scanned, "
+            f"{counters.decompressed_bytes} bytes inflated, skipped: {skipped or 'none'}"
+        )
+    if rule_stats:
+        for name, counters in scanner.misconfig_detector.rule_stats().items():
+            print(
+                f"Rule {name}: {counters.matches}/{counters.evaluations} matched "
+                f"in {counters.seconds * 1000:.2f} ms"
+            )
     return scanner
 
 
+def metrics_summary() -> Dict[str, Any]:
+    """Return recorded metrics, dropping families with no values."""
+
+    return {
+        name: family
+        for name, family in metrics.REGISTRY.summary().items()
+        if family["values"]
+    }
+
+
 def main() -> None:  # pragma: no cover - CLI wrapper
     """Entry point for the ``dspmctl`` CLI."""
 
     setup_logging()
     args = parse_args()
-    if args.command == "scan":
-        run_scan(args.providers)
+    if getattr(args, "metrics", False):
+        metrics.enable()
+    if args.command == "scan" and args.shards and args.stream:
+        raise SystemExit("--shards cannot be combined with --stream")
+    if args.command == "scan" and not args.providers and not args.shards:
+        args.providers = provider_names()
+    if args.command == "scan" and args.stream:
+        scanner = _build_scanner(args)
+        run_stream(args.providers, scanner)
+        scanner.close()
+        if args.metrics:
+            print(json.dumps({"event": "metrics", "metrics": metrics_summary()}))
+    elif args.command == "scan":
+        shards = shard_plan(args.providers_config, args.providers) if args.shards else None
+        scanner = run_scan(
+            args.providers or [], _build_scanner(args), rule_stats=args.rule_stats, shards=shards
+        )
+        scanner.close()
+        if args.metrics:
+            print(json.dumps(metrics_summary(), indent=2))
     elif args.command == "report":
-        scanner = Scanner()
-        result = scanner.scan(["aws", "azure", "gcp"])
-        reporter = Reporter()
-        rendered = reporter.render(result, fmt=args.format)
-        args.output.write_text(rendered, encoding="utf-8")
+        from dspm_engine.report.reporter import Reporter
+
+        scanner = _build_scanner(args)
+        if args.shards:
+            result = scanner.scan_shards(shard_plan(args.providers_config))
+        else:
+            result = scanner.scan(provider_names())
+        scanner.close()
+        reporter = Reporter(args.template_dir)
+        reporter.stream(result, args.format, args.output, compress=args.gzip)
         print(f"Report written to {args.output}")
+        if args.metrics:
+            print(json.dumps(metrics_summary(), indent=2))
+    elif args.command == "jobs":
+        run_jobs(args)
+    elif args.command == "history":
+        run_history(args)
+    elif args.command == "bench" and run_bench(args):
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":  # pragma: no cover
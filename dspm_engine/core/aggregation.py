@@ -0,0 +1,114 @@
+"""Roll PII matches up into per-location aggregates with masked examples."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_MAX_EXAMPLES = 5
+MASK_KEEP = 4
+
+# One regex hit: (rule name, matched text, location, validated, offset in location).
+Hit = Tuple[str, str, str, bool, int]
+
+
+def mask_sample(sample: str, keep: int = MASK_KEEP) -> str:
+    """Replace every letter and digit except the last ``keep`` with ``*``.
+
+    Separators are preserved so the shape of the value stays recognisable.
+    """
+
+    remaining = sum(char.isalnum() for char in sample) - keep
+    masked = []
+    for char in sample:
+        if char.isalnum() and remaining > 0:
+            masked.append("*")
+            remaining -= 1
+        else:
+            masked.append(char)
+    return "".join(masked)
+
+
+@dataclass
+class PiiAggregate:
+    """Every match of one rule at one location, summarised.
+
+    Attributes:
+        type: Name of the matching rule.
+        location: Object URI.
+        provider: Cloud provider identifier.
+        count: Number of matches.
+        validated: Matches confirmed by the rule's checksum validator.
+        first_offset: Offset of the first match in the object: the byte offset of
+            the sampled range holding it plus its character offset in that range.
+        last_offset: Offset of the last match, measured the same way.
+        examples: Uniform sample of masked matches, at most ``max_examples``.
+    """
+
+    type: str
+    location: str
+    provider: str
+    count: int = 0
+    validated: int = 0
+    first_offset: int = 0
+    last_offset: int = 0
+    examples: List[str] = field(default_factory=list)
+
+
+class FindingAggregator:
+    """Accumulate hits into one :class:`PiiAggregate` per (provider, location, type).
+
+    Memory is proportional to the number of distinct locations and rules, not to
+    the number of matches: each aggregate keeps counters and a reservoir of at most
+    ``max_examples`` masked examples.
+    """
+
+    def __init__(self, max_examples: int = DEFAULT_MAX_EXAMPLES, seed: int = 0) -> None:
+        """Create an empty aggregator."""
+
+        if max_examples < 0:
+            raise ValueError("max_examples must not be negative")
+        self.max_examples = max_examples
+        self._rng = random.Random(seed)
+        self._aggregates: Dict[Tuple[str, str, str], PiiAggregate] = {}
+
+    def add(
+        self,
+        provider: str,
+        rule: str,
+        sample: str,
+        location: str,
+        validated: bool = False,
+        offset: int = 0,
+    ) -> None:
+        """Record a single match."""
+
+        key = (provider, location, rule)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = self._aggregates[key] = PiiAggregate(
+                type=rule, location=location, provider=provider, first_offset=offset
+            )
+        aggregate.count += 1
+        aggregate.validated += validated
+        aggregate.first_offset = min(aggregate.first_offset, offset)
+        aggregate.last_offset = max(aggregate.last_offset, offset)
+        examples = aggregate.examples
+        if len(examples) < self.max_examples:
+            examples.append(mask_sample(sample))
+        elif self.max_examples:
+            slot = self._rng.randrange(aggregate.count)
+            if slot < self.max_examples:
+                examples[slot] = mask_sample(sample)
+
+    def extend(self, provider: str, hits: Iterable[Hit]) -> "FindingAggregator":
+        """Record every hit of an iterable."""
+
+        for rule, sample, location, validated, offset in hits:
+            self.add(provider, rule, sample, location, validated, offset)
+        return self
+
+    def results(self) -> List[PiiAggregate]:
+        """Return the aggregates in the order their first match was seen."""
+
+        return list(self._aggregates.values())
@@ -0,0 +1,140 @@
+"""Shared helpers for live cloud storage discovery: throttling backoff and fan-out."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_DISCOVERY_WORKERS = 8
+DEFAULT_PAGE_SIZE = 500
+
+
+class AdaptiveBackoff:
+    """Retry throttled calls with a delay shared by every worker of a client.
+
+    Each throttling response doubles the shared delay (up to ``max_delay``) and
+    each success halves it, so concurrent posture lookups slow down together when
+    a provider pushes back and recover once it stops. Calls are retried up to
+    ``max_attempts`` times before the throttling error is re-raised.
+    """
+
+    def __init__(
+        self,
+        is_throttle: Callable[[BaseException], bool],
+        base_delay: float = 0.05,
+        max_delay: float = 20.0,
+        max_attempts: int = 8,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """Create a backoff that treats errors matching ``is_throttle`` as retryable."""
+
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.is_throttle = is_throttle
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._sleep = sleep
+        self._jitter = jitter or random.random
+        self._delay = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    @property
+    def delay(self) -> float:
+        """Current shared delay in seconds applied before each call."""
+
+        return self._delay
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._delay = self._delay / 2 if self._delay > self.base_delay else 0.0
+
+    def _on_throttle(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            self._delay = min(self.max_delay, max(self.base_delay, self._delay * 2))
+
+    def call(self, func: Callable[..., R], *args: object, **kwargs: object) -> R:
+        """Invoke ``func``, pausing for the shared delay and retrying when throttled."""
+
+        for attempt in range(1, self.max_attempts + 1):
+            delay = self._delay
+            if delay:
+                # Jitter keeps concurrent workers from retrying in lockstep.
+                self._sleep(delay * (0.5 + self._jitter() / 2))
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                if not self.is_throttle(exc) or attempt == self.max_attempts:
+                    raise
+                self._on_throttle()
+                logger.warning(
+                    "Throttled by provider (attempt %d/%d); backing off %.2fs",
+                    attempt,
+                    self.max_attempts,
+                    self._delay,
+                )
+                continue
+            self._on_success()
+            return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+
+# Fetches one page of a listing given its continuation token (``None`` for the first
+# page) and returns the page's items with the token for the next page, if any.
+PageFetcher = Callable[[Optional[str]], Tuple[List[T], Optional[str]]]
+
+
+def paginate(fetch_page: PageFetcher, backoff: AdaptiveBackoff) -> Iterator[T]:
+    """Lazily yield every item of a token-paginated listing.
+
+    Pages are requested one at a time as the caller consumes items. A throttled
+    page is retried from its own continuation token, so no items are skipped.
+    """
+
+    token: Optional[str] = None
+    while True:
+        items, token = backoff.call(fetch_page, token)
+        yield from items
+        if not token:
+            return
+
+
+def bounded_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_DISCOVERY_WORKERS
+) -> Iterator[R]:
+    """Lazily map ``func`` over ``items`` on a thread pool, preserving input order.
+
+    At most ``2 * max_workers`` calls are in flight, so a paginated listing is
+    consumed only as fast as its results are used.
+    """
+
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dspm-discovery")
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
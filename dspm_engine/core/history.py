@@ -0,0 +1,403 @@
+"""Persistent scan history with posture diffs and risk trends."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .logging_utils import get_logger
+from .scanner import ScanResult, _asset_name
+
+logger = get_logger(__name__)
+
+FINDING_KINDS = ("misconfiguration", "pii", "column")
+
+# Posture flags are NULL when discovery could not read them.
+_ASSETS_TABLE = """
+CREATE TABLE IF NOT EXISTS scan_assets (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    public INTEGER,
+    encryption TEXT,
+    versioning INTEGER,
+    region TEXT,
+    PRIMARY KEY (scan_id, provider, resource)
+) WITHOUT ROWID;
+"""
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    providers TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    misconfiguration_score INTEGER NOT NULL,
+    data_score INTEGER NOT NULL,
+    assets INTEGER NOT NULL,
+    errors TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_created_at ON scans (created_at);
+"""
+    + _ASSETS_TABLE
+    + """
+CREATE TABLE IF NOT EXISTS scan_findings (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    location TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    validated INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, kind, provider, resource, rule, location)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scan_findings_resource
+    ON scan_findings (provider, resource, rule, scan_id);
+CREATE INDEX IF NOT EXISTS scan_findings_rule ON scan_findings (rule, scan_id);
+"""
+)
+
+# Bumped when stored tables need rewriting; version 1 makes posture flags nullable.
+_USER_VERSION = 1
+
+# Columns that identify "the same finding" across scans.
+_IDENTITY = ("kind", "provider", "resource", "rule", "location")
+_FINDING_FIELDS = _IDENTITY + ("severity", "count", "validated")
+
+# (kind, provider, resource, rule, location) -> [severity, count, validated]
+FindingRows = Dict[Tuple[str, str, str, str, str], List]
+
+
+@dataclass
+class ScanRecord:
+    """Summary row for one recorded scan."""
+
+    id: int
+    created_at: float
+    providers: List[str]
+    score: int
+    misconfiguration_score: int
+    data_score: int
+    assets: int
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class HistoryFinding:
+    """A finding as stored in the history, without matched values.
+
+    PII matches are rolled up per object and rule, and column findings per column,
+    so ``count`` is the number of matches (or hits) and ``validated`` how many of
+    them passed checksum validation. ``location`` is empty for misconfigurations.
+    """
+
+    kind: str
+    provider: str
+    resource: str
+    rule: str
+    location: str
+    severity: str
+    count: int
+    validated: int
+
+
+@dataclass
+class FindingDiff:
+    """Findings that appeared, disappeared or persisted between two scans."""
+
+    base: int
+    head: int
+    new: List[HistoryFinding] = field(default_factory=list)
+    resolved: List[HistoryFinding] = field(default_factory=list)
+    persistent: List[HistoryFinding] = field(default_factory=list)
+
+
+@dataclass
+class RiskPoint:
+    """Risk breakdown of one scan with its distinct findings and total matches."""
+
+    scan_id: int
+    created_at: float
+    score: int
+    misconfiguration_score: int
+    data_score: int
+    findings: int
+    matches: int
+
+
+def _finding_rows(result: ScanResult) -> FindingRows:
+    """Collapse a scan's findings to one row per identity, counting repeats."""
+
+    rows: FindingRows = {}
+
+    def add(key: Tuple[str, str, str, str, str], severity: str, count: int, valid: int) -> None:
+        row = rows.get(key)
+        if row is None:
+            rows[key] = [severity, count, valid]
+        else:
+            row[1] += count
+            row[2] += valid
+
+    for finding in result.misconfigurations:
+        key = ("misconfiguration", finding.provider, finding.resource, finding.issue, "")
+        add(key, finding.severity, 1, 0)
+    for match in result.pii_findings:
+        resource = _asset_name(match.provider, match.location)
+        add(("pii", match.provider, resource, match.type, match.location), "", 1, match.validated)
+    for aggregate in result.pii_aggregates:
+        resource = _asset_name(aggregate.provider, aggregate.location)
+        key = ("pii", aggregate.provider, resource, aggregate.type, aggregate.location)
+        add(key, "", aggregate.count, aggregate.validated)
+    for column in result.column_findings:
+        resource = _asset_name(column.provider, column.location)
+        location = f"{column.location}#{column.column}"
+        key = ("column", column.provider, resource, column.type, location)
+        add(key, "", column.hits, column.validated)
+    return rows
+
+
+def _filters(alias: str, **values: Optional[str]) -> Tuple[List[str], List[object]]:
+    """Build equality clauses on ``alias`` for the filters that are set."""
+
+    clauses = [f"{alias}.{column} = ?" for column, value in values.items() if value is not None]
+    return clauses, [value for value in values.values() if value is not None]
+
+
+class ScanHistory:
+    """SQLite store of completed scans for diffs and trends.
+
+    Each scan keeps its risk breakdown, an asset posture row per asset and one
+    row per distinct finding. Matched PII values are never stored. Diffs and
+    trends are answered by indexed SQL, so older scans are never loaded into
+    memory wholesale.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        """Open (and create if needed) the history database at ``path``."""
+
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _USER_VERSION:
+            self._relax_posture_flags()
+            self._conn.execute(f"PRAGMA user_version = {_USER_VERSION}")
+        self._conn.commit()
+
+    def _relax_posture_flags(self) -> None:
+        """Rebuild a ``scan_assets`` table whose posture flags were ``NOT NULL``."""
+
+        columns = self._conn.execute("PRAGMA table_info(scan_assets)").fetchall()
+        if not any(name == "public" and notnull for _, name, _, notnull, _, _ in columns):
+            return
+        self._conn.executescript(
+            "ALTER TABLE scan_assets RENAME TO scan_assets_v0;"
+            + _ASSETS_TABLE
+            + "INSERT INTO scan_assets SELECT * FROM scan_assets_v0;"
+            "DROP TABLE scan_assets_v0;"
+        )
+
+    def record(
+        self,
+        result: ScanResult,
+        providers: Iterable[str],
+        created_at: Optional[float] = None,
+    ) -> int:
+        """Store a completed scan in one transaction and return its id."""
+
+        risk = result.risk
+        assets = result.assets.buckets
+        findings = _finding_rows(result)
+        with self._lock:
+            with self._conn:
+                scan_id = self._conn.execute(
+                    "INSERT INTO scans (created_at, providers, score, misconfiguration_score, "
+                    "data_score, assets, errors) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        time.time() if created_at is None else created_at,
+                        ",".join(providers),
+                        risk.score,
+                        risk.misconfiguration_score,
+                        risk.data_score,
+                        len(assets),
+                        json.dumps(result.errors),
+                    ),
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scan_assets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            scan_id,
+                            asset.provider,
+                            asset.name,
+                            asset.public,
+                            asset.encryption,
+                            asset.versioning,
+                            asset.region,
+                        )
+                        for asset in assets
+                    ),
+                )
+                self._conn.executemany(
+                    f"INSERT INTO scan_findings (scan_id, {', '.join(_FINDING_FIELDS)}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((scan_id, *key, *values) for key, values in findings.items()),
+                )
+        logger.info("Recorded scan %s with %s distinct findings", scan_id, len(findings))
+        return scan_id
+
+    def scans(self, limit: Optional[int] = None) -> List[ScanRecord]:
+        """Return recorded scans, newest first."""
+
+        rows = self._query(
+            "SELECT id, created_at, providers, score, misconfiguration_score, data_score, "
+            "assets, errors FROM scans ORDER BY created_at DESC, id DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [
+            ScanRecord(
+                id=row[0],
+                created_at=row[1],
+                providers=row[2].split(",") if row[2] else [],
+                score=row[3],
+                misconfiguration_score=row[4],
+                data_score=row[5],
+                assets=row[6],
+                errors=json.loads(row[7]),
+            )
+            for row in rows
+        ]
+
+    def latest_pair(self) -> Optional[Tuple[int, int]]:
+        """Return ``(previous, latest)`` scan ids, or ``None`` with fewer than two scans."""
+
+        rows = self._query("SELECT id FROM scans ORDER BY created_at DESC, id DESC LIMIT 2")
+        if len(rows) < 2:
+            return None
+        return rows[1][0], rows[0][0]
+
+    def diff(
+        self,
+        base: int,
+        head: int,
+        provider: Optional[str] = None,
+        resource: Optional[str] = None,
+        rule: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> FindingDiff:
+        """Compare two scans: findings new in ``head``, resolved since ``base``, persistent.
+
+        Only providers that both scans covered without errors are compared, so a
+        provider skipped or failed in one scan does not show up as resolved or new.
+        Optional filters narrow all three lists. Each list is one indexed query that
+        probes the other scan's primary key per finding.
+        """
+
+        if kind is not None and kind not in FINDING_KINDS:
+            raise ValueError(f"Unsupported finding kind: {kind}")
+        covered = self._covered_providers(base) & self._covered_providers(head)
+        if provider is not None:
+            covered &= {provider}
+        filters = {"resource": resource, "rule": rule, "kind": kind}
+        providers = sorted(covered)
+        return FindingDiff(
+            base=base,
+            head=head,
+            new=list(self._compare(head, base, False, providers, filters)),
+            resolved=list(self._compare(base, head, False, providers, filters)),
+            persistent=list(self._compare(head, base, True, providers, filters)),
+        )
+
+    def trend(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+        provider: Optional[str] = None,
+        resource: Optional[str] = None,
+        rule: Optional[str] = None,
+    ) -> List[RiskPoint]:
+        """Return each scan's risk breakdown and finding counts, oldest first.
+
+        ``findings`` and ``matches`` count only findings that pass the optional
+        provider, resource and rule filters, so a single rule or bucket can be
+        tracked over time. With ``limit`` only the most recent ``limit`` scans in
+        the ``since``/``until`` window are returned.
+        """
+
+        clauses, params = _filters("f", provider=provider, resource=resource, rule=rule)
+        matching = " AND ".join(["f.scan_id = s.id", *clauses])
+        rows = self._query(
+            "SELECT * FROM ("
+            " SELECT s.id, s.created_at, s.score, s.misconfiguration_score, s.data_score,"
+            f" (SELECT COUNT(*) FROM scan_findings f WHERE {matching}),"
+            f" (SELECT COALESCE(SUM(f.count), 0) FROM scan_findings f WHERE {matching})"
+            " FROM scans s WHERE s.created_at >= ? AND s.created_at <= ?"
+            " ORDER BY s.created_at DESC, s.id DESC LIMIT ?"
+            ") ORDER BY 2, 1",
+            (
+                *params,
+                *params,
+                float("-inf") if since is None else since,
+                float("inf") if until is None else until,
+                -1 if limit is None else limit,
+            ),
+        )
+        return [RiskPoint(*row) for row in rows]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            self._conn.close()
+
+    def _covered_providers(self, scan_id: int) -> Set[str]:
+        """Return the providers a scan completed, raising ``KeyError`` for unknown scans."""
+
+        rows = self._query("SELECT providers, errors FROM scans WHERE id = ?", (scan_id,))
+        if not rows:
+            raise KeyError(f"Unknown scan: {scan_id}")
+        providers, errors = rows[0]
+        return set(providers.split(",")) - set(json.loads(errors)) if providers else set()
+
+    def _compare(
+        self,
+        scan_id: int,
+        other: int,
+        present: bool,
+        providers: Sequence[str],
+        filters: Dict[str, Optional[str]],
+    ) -> Iterator[HistoryFinding]:
+        """Yield findings of ``scan_id`` that are (or are not) also in ``other``."""
+
+        if not providers:
+            return
+        # Unary plus keeps the planner on the scan_id primary key prefix.
+        clauses, params = _filters("+f", **filters)
+        clauses[:0] = ["f.scan_id = ?", f"+f.provider IN ({', '.join('?' * len(providers))})"]
+        params[:0] = [scan_id, *providers]
+        match = " AND ".join(f"o.{column} = f.{column}" for column in _IDENTITY)
+        params.append(other)
+        sql = (
+            f"SELECT {', '.join(f'f.{column}' for column in _FINDING_FIELDS)} "
+            f"FROM scan_findings f WHERE {' AND '.join(clauses)} "
+            f"AND {'' if present else 'NOT '}EXISTS "
+            f"(SELECT 1 FROM scan_findings o WHERE o.scan_id = ? AND {match}) "
+            "ORDER BY f.kind, f.provider, f.resource, f.rule, f.location"
+        )
+        for row in self._query(sql, params):
+            yield HistoryFinding(*row)
+
+    def _query(self, sql: str, params: Iterable[object] = ()) -> List[tuple]:
+        """Run a read query under the connection lock."""
+
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
@@ -0,0 +1,397 @@
+"""Columnar asset inventory for very large storage estates."""
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from itertools import compress
+from operator import attrgetter, methodcaller
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .models import StorageAsset
+
+Codes = Union[bytearray, "array[int]"]
+ValueTest = Callable[[Any], bool]
+
+CATEGORY_FIELDS = ("provider", "region", "policy", "encryption")
+FLAG_FIELDS = ("public", "versioning")
+# Flag columns store 0 (false), 1 (true) or UNKNOWN_FLAG for a posture not read.
+UNKNOWN_FLAG = 2
+
+
+def _encode_flag(value: Optional[bool]) -> int:
+    """Return the flag column code for ``value``."""
+
+    return UNKNOWN_FLAG if value is None else int(value)
+
+
+def _decode_flag(code: int) -> Optional[bool]:
+    """Return the flag value stored as ``code``."""
+
+    return None if code == UNKNOWN_FLAG else bool(code)
+
+
+def _flag_mask(flags: bytearray, value: bool) -> bytes:
+    """Return a 0/1 byte mask of rows whose flag is known and equal to ``value``."""
+
+    table = bytearray(256)
+    table[int(value)] = 1
+    return bytes(flags).translate(table)
+
+
+class _CategoryColumn:
+    """Dictionary-encoded column of low-cardinality, interned strings.
+
+    Codes are stored one byte per row while the column holds at most 256 distinct
+    values, which lets equality masks be computed with :meth:`bytes.translate`
+    at C speed. Wider columns transparently switch to a 32-bit ``array``.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+        self._index: Dict[Optional[str], int] = {}
+        self.codes: Codes = bytearray()
+
+    def append(self, value: Optional[str]) -> None:
+        """Append a value, assigning it a code on first sight."""
+
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value) if value is not None else None)
+            self._index[value] = code
+            if code == 256 and isinstance(self.codes, bytearray):
+                self.codes = array("I", iter(self.codes))
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+    def mask(self, value: Optional[str]) -> bytes:
+        """Return a 0/1 byte mask of rows equal to ``value``."""
+
+        code = self._index.get(value)
+        if code is None:
+            return bytes(len(self.codes))
+        if isinstance(self.codes, bytearray):
+            table = bytearray(256)
+            table[code] = 1
+            return bytes(self.codes).translate(table)
+        return bytes(int(item == code) for item in self.codes)
+
+    def mask_where(self, test: ValueTest) -> bytes:
+        """Return a 0/1 byte mask of rows whose value satisfies ``test``.
+
+        ``test`` runs once per distinct value rather than once per row.
+        """
+
+        hits = [code for code, value in enumerate(self.values) if test(value)]
+        if not hits:
+            return bytes(len(self.codes))
+        if isinstance(self.codes, bytearray):
+            table = bytearray(256)
+            for code in hits:
+                table[code] = 1
+            return bytes(self.codes).translate(table)
+        selected = set(hits)
+        return bytes(int(item in selected) for item in self.codes)
+
+    def nbytes(self) -> int:
+        """Approximate size of the code storage in bytes."""
+
+        if isinstance(self.codes, bytearray):
+            return len(self.codes)
+        return len(self.codes) * self.codes.itemsize
+
+
+def mask_and(left: bytes, right: bytes) -> bytes:
+    """Combine two 0/1 byte masks with a single big-integer AND."""
+
+    size = len(left)
+    combined = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return combined.to_bytes(size, "little")
+
+
+def mask_or(left: bytes, right: bytes) -> bytes:
+    """Combine two 0/1 byte masks with a single big-integer OR."""
+
+    size = len(left)
+    combined = int.from_bytes(left, "little") | int.from_bytes(right, "little")
+    return combined.to_bytes(size, "little")
+
+
+def mask_not(mask: bytes) -> bytes:
+    """Flip a 0/1 byte mask."""
+
+    return mask.translate(b"\x01\x00" + bytes(254))
+
+
+def mask_rows(mask: bytes) -> List[int]:
+    """Return the row indices selected by a 0/1 byte mask."""
+
+    return list(compress(range(len(mask)), mask))
+
+
+def value_mask(values: List[Any], test: ValueTest) -> bytes:
+    """Return a 0/1 byte mask over ``values``, calling ``test`` once per distinct value."""
+
+    outcomes = {value: int(bool(test(value))) for value in set(values)}
+    return bytes(map(outcomes.__getitem__, values))
+
+
+class AssetColumns:
+    """Column view over a plain sequence of :class:`StorageAsset` rows.
+
+    Columns are extracted on first use and cached, so rule masks can be computed
+    over a scanner batch without first building a :class:`CompactInventory`.
+    """
+
+    def __init__(self, assets: Iterable[StorageAsset]) -> None:
+        self.assets = assets if isinstance(assets, list) else list(assets)
+        self._columns: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    @property
+    def names(self) -> List[str]:
+        """Asset names in row order."""
+
+        return self.column("name")
+
+    def column(self, name: str) -> List[Any]:
+        """Return the values of attribute ``name`` for every row."""
+
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = list(map(attrgetter(name), self.assets))
+        return values
+
+    def field_mask(self, name: str, test: ValueTest) -> bytes:
+        """Return a 0/1 byte mask of rows whose field ``name`` satisfies ``test``."""
+
+        return value_mask(self.column(name), test)
+
+    def tag_mask(self, key: str, test: ValueTest) -> bytes:
+        """Return a 0/1 byte mask of rows whose tag ``key`` satisfies ``test``."""
+
+        return value_mask(list(map(methodcaller("get", key), self.column("tags"))), test)
+
+
+class CompactInventory:
+    """Column-oriented store of storage assets.
+
+    Flags live in ``bytearray`` columns, provider/region/policy/encryption are
+    dictionary encoded, and rarely populated fields (tags, samples, object
+    identity, unreadable posture) are kept sparsely. :class:`StorageAsset`
+    remains the row-level API: indexing or iterating materializes rows on demand.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.provider = _CategoryColumn()
+        self.region = _CategoryColumn()
+        self.policy = _CategoryColumn()
+        self.encryption = _CategoryColumn()
+        self.public = bytearray()
+        self.versioning = bytearray()
+        self.tags: Dict[int, Dict[str, str]] = {}
+        self.samples: Dict[int, str] = {}
+        self.object_meta: Dict[int, Dict[str, Any]] = {}
+        self.posture_unknown: Dict[int, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_assets(cls, assets: Iterable[StorageAsset]) -> "CompactInventory":
+        """Build a compact inventory from row-level assets."""
+
+        inventory = cls()
+        inventory.extend(assets)
+        return inventory
+
+    def append(self, asset: StorageAsset) -> None:
+        """Append a single asset."""
+
+        row = len(self.names)
+        self.names.append(asset.name)
+        self.provider.append(asset.provider)
+        self.region.append(asset.region)
+        self.policy.append(asset.policy)
+        self.encryption.append(asset.encryption or None)
+        self.public.append(_encode_flag(asset.public))
+        self.versioning.append(_encode_flag(asset.versioning))
+        if asset.posture_unknown:
+            self.posture_unknown[row] = asset.posture_unknown
+        if asset.tags:
+            self.tags[row] = dict(asset.tags)
+        if asset.sample_content is not None:
+            self.samples[row] = asset.sample_content
+        if asset.etag or asset.size is not None or asset.last_modified:
+            self.object_meta[row] = {
+                "etag": asset.etag,
+                "size": asset.size,
+                "last_modified": asset.last_modified,
+            }
+
+    def extend(self, assets: Iterable[StorageAsset]) -> None:
+        """Append many assets."""
+
+        for asset in assets:
+            self.append(asset)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, row: int) -> StorageAsset:
+        meta = self.object_meta.get(row, {})
+        return StorageAsset(
+            name=self.names[row],
+            provider=self.provider[row],
+            public=_decode_flag(self.public[row]),
+            encryption=self.encryption[row],
+            versioning=_decode_flag(self.versioning[row]),
+            policy=self.policy[row] or "restricted",
+            region=self.region[row],
+            tags=dict(self.tags.get(row, {})),
+            sample_content=self.samples.get(row),
+            etag=meta.get("etag"),
+            size=meta.get("size"),
+            last_modified=meta.get("last_modified"),
+            posture_unknown=self.posture_unknown.get(row, ()),
+        )
+
+    def __iter__(self) -> Iterator[StorageAsset]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def mask(
+        self,
+        provider: Optional[str] = None,
+        region: Optional[str] = None,
+        public: Optional[bool] = None,
+        encrypted: Optional[bool] = None,
+        versioning: Optional[bool] = None,
+    ) -> bytes:
+        """Return a 0/1 byte mask of rows matching every given criterion.
+
+        Rows whose ``public`` or ``versioning`` flag is unknown match neither value.
+        """
+
+        result = b"\x01" * len(self)
+        if provider is not None:
+            result = mask_and(result, self.provider.mask(provider))
+        if region is not None:
+            result = mask_and(result, self.region.mask(region))
+        if public is not None:
+            result = mask_and(result, _flag_mask(self.public, public))
+        if versioning is not None:
+            result = mask_and(result, _flag_mask(self.versioning, versioning))
+        if encrypted is not None:
+            unencrypted = self.encryption.mask(None)
+            result = mask_and(result, mask_not(unencrypted) if encrypted else unencrypted)
+        return result
+
+    def field_mask(self, name: str, test: ValueTest) -> bytes:
+        """Return a 0/1 byte mask of rows whose field ``name`` satisfies ``test``.
+
+        ``test`` is called once per distinct value of the column.
+        """
+
+        if name in CATEGORY_FIELDS:
+            return getattr(self, name).mask_where(test)
+        if name in FLAG_FIELDS:
+            table = bytes([int(bool(test(value))) for value in (False, True, None)])
+            table += bytes(253)
+            return bytes(getattr(self, name)).translate(table)
+        if name == "name":
+            return value_mask(self.names, test)
+        if name == "size":
+            sizes = [self.object_meta.get(row, {}).get("size") for row in range(len(self))]
+            return value_mask(sizes, test)
+        raise ValueError(f"Unsupported inventory field: {name}")
+
+    def tag_mask(self, key: str, test: ValueTest) -> bytes:
+        """Return a 0/1 byte mask of rows whose tag ``key`` satisfies ``test``.
+
+        Rows without the tag are tested once with ``None``.
+        """
+
+        default = int(bool(test(None)))
+        mask = bytearray([default]) * len(self)
+        for row, tags in self.tags.items():
+            mask[row] = int(bool(test(tags.get(key))))
+        return bytes(mask)
+
+    def where(self, **criteria: Any) -> List[int]:
+        """Return row indices matching the criteria accepted by :meth:`mask`."""
+
+        return mask_rows(self.mask(**criteria))
+
+    def select(self, **criteria: Any) -> List[StorageAsset]:
+        """Materialize the assets matching the criteria accepted by :meth:`mask`."""
+
+        return [self[row] for row in self.where(**criteria)]
+
+    def public_assets(self) -> List[int]:
+        """Row indices of publicly exposed assets."""
+
+        return self.where(public=True)
+
+    def unencrypted_assets(self) -> List[int]:
+        """Row indices of assets without encryption at rest."""
+
+        return self.where(encrypted=False)
+
+    def iter_records(self, include_samples: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield JSON-ready row dictionaries straight from the columns."""
+
+        provider, region = self.provider, self.region
+        policy, encryption = self.policy, self.encryption
+        for row, name in enumerate(self.names):
+            meta = self.object_meta.get(row, {})
+            record: Dict[str, Any] = {
+                "name": name,
+                "provider": provider[row],
+                "public": _decode_flag(self.public[row]),
+                "encryption": encryption[row],
+                "versioning": _decode_flag(self.versioning[row]),
+                "policy": policy[row],
+                "region": region[row],
+                "tags": self.tags.get(row, {}),
+                "etag": meta.get("etag"),
+                "size": meta.get("size"),
+                "last_modified": meta.get("last_modified"),
+                "posture_unknown": list(self.posture_unknown.get(row, ())),
+            }
+            if include_samples:
+                record["sample_content"] = self.samples.get(row)
+            yield record
+
+    def to_json(self, include_samples: bool = False) -> str:
+        """Serialize the inventory to a JSON array without intermediate dataclass copies."""
+
+        return json.dumps(list(self.iter_records(include_samples=include_samples)))
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """Return the inventory as decoded column lists."""
+
+        return {
+            "name": list(self.names),
+            "provider": [self.provider[row] for row in range(len(self))],
+            "region": [self.region[row] for row in range(len(self))],
+            "policy": [self.policy[row] for row in range(len(self))],
+            "encryption": [self.encryption[row] for row in range(len(self))],
+            "public": [_decode_flag(flag) for flag in self.public],
+            "versioning": [_decode_flag(flag) for flag in self.versioning],
+        }
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the fixed-width columns, excluding names."""
+
+        return (
+            self.provider.nbytes()
+            + self.region.nbytes()
+            + self.policy.nbytes()
+            + self.encryption.nbytes()
+            + len(self.public)
+            + len(self.versioning)
+        )
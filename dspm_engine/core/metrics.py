@@ -0,0 +1,409 @@
+"""In-process scan metrics, exported in the Prometheus text format.
+
+Instrumentation is off until :func:`enable` is called or ``DSPM_METRICS=1`` is
+set. While it is off, every recording call returns after a single flag check and
+:func:`timed` hands back a shared no-op context manager, so the hooks in the
+scanner, detectors, lineage graph and reporter cost next to nothing.
+
+Stage timings may nest: ``pii`` includes time spent waiting on lazily read
+``sample`` ranges, and ``scan`` covers every other stage of that scan.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+_NULL_TIMER: ContextManager[None] = nullcontext()
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, dropping the fraction of whole numbers."""
+
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base class for a named metric family with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        """Validate label values against the label names."""
+
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def _labels(self, key: LabelValues, **extra: str) -> str:
+        """Render a label set as ``{name="value",...}``, or nothing when empty."""
+
+        pairs = [*zip(self.labelnames, key, strict=True), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def reset(self) -> None:
+        """Forget every recorded value."""
+
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> Dict[LabelValues, Any]:
+        """Return a copy of the recorded values keyed by label values."""
+
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return value
+
+    def samples(self) -> Iterator[str]:
+        """Yield the exposition lines for every label set."""
+
+        for key, value in sorted(self.snapshot().items()):
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return JSON-ready values, one entry per label set."""
+
+        return [
+            {"labels": dict(zip(self.labelnames, key, strict=True)), "value": value}
+            for key, value in sorted(self.snapshot().items())
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add ``amount`` to the total for the given label values."""
+
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, such as the number of running scans."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Raise the gauge by ``amount``."""
+
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Lower the gauge by ``amount``."""
+
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed upper bounds, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for the given label values."""
+
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), sum, count and maximum.
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0, 0.0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+            state[3] = max(state[3], value)
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        return [list(value[0]), *value[1:]]
+
+    def samples(self) -> Iterator[str]:
+        for key, (counts, total, count, _) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, observed in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += observed
+                labels = self._labels(key, le=_format_value(bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(key)} {count}"
+
+    def summary(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "labels": dict(zip(self.labelnames, key, strict=True)),
+                "count": count,
+                "sum": total,
+                "max": maximum,
+            }
+            for key, (_, total, count, maximum) in sorted(self.snapshot().items())
+        ]
+
+
+class MetricsRegistry:
+    """A set of metric families that are enabled, reset and exported together."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def reset(self) -> None:
+        """Clear every metric's values."""
+
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Return recorded values as a JSON-ready mapping keyed by metric name."""
+
+        return {
+            name: {"type": metric.kind, "values": metric.summary()}
+            for name, metric in self._metrics.items()
+        }
+
+
+REGISTRY = MetricsRegistry(enabled=os.getenv("DSPM_METRICS") == "1")
+STAGE_SECONDS = REGISTRY.histogram(
+    "dspm_stage_duration_seconds",
+    "Wall-clock time spent in each scan stage.",
+    ("stage", "provider"),
+)
+ASSETS_PROCESSED = REGISTRY.counter(
+    "dspm_assets_processed_total", "Assets discovered and analyzed.", ("provider",)
+)
+BYTES_PROCESSED = REGISTRY.counter(
+    "dspm_bytes_processed_total",
+    "Content bytes handed to PII classification, before any decompression.",
+    ("provider",),
+)
+FINDINGS = REGISTRY.counter(
+    "dspm_findings_total",
+    "Findings reported by scans; aggregated PII counts every match.",
+    ("kind", "rule"),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "dspm_cache_lookups_total", "Result cache lookups by outcome.", ("result",)
+)
+SCANS = REGISTRY.counter("dspm_scans_total", "Scans finished, by outcome.", ("status",))
+SCANS_IN_FLIGHT = REGISTRY.gauge("dspm_scans_in_flight", "Scans currently running.")
+REPORT_BYTES = REGISTRY.counter(
+    "dspm_report_bytes_total", "Uncompressed report bytes streamed.", ("format",)
+)
+
+
+def enable(enabled: bool = True) -> None:
+    """Turn instrumentation on or off for the whole process."""
+
+    REGISTRY.enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is currently recording."""
+
+    return REGISTRY.enabled
+
+
+class _Timer:
+    """Context manager that records its duration in :data:`STAGE_SECONDS`."""
+
+    __slots__ = ("stage", "provider", "started")
+
+    def __init__(self, stage: str, provider: str) -> None:
+        self.stage = stage
+        self.provider = provider
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, self.stage, self.provider)
+
+
+def timed(stage: str, provider: str = "") -> ContextManager[None]:
+    """Time a block as one observation of ``stage``."""
+
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return _Timer(stage, provider)
+
+
+def timed_iter(items: Iterable[Any], stage: str, provider: str = "") -> Iterable[Any]:
+    """Time only the work done producing ``items``, not the consumer's work between them.
+
+    The total is recorded as one observation once the iterator is exhausted or closed.
+    """
+
+    if not REGISTRY.enabled:
+        return items
+    return _timed_iter(iter(items), stage, provider)
+
+
+def _timed_iter(items: Iterator[Any], stage: str, provider: str) -> Iterator[Any]:
+    elapsed = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - started
+            yield item
+    finally:
+        STAGE_SECONDS.observe(elapsed, stage, provider)
+
+
+@contextmanager
+def track_scan(cancelled: Tuple[Type[BaseException], ...] = ()) -> Iterator[None]:
+    """Count a scan as in flight while the block runs, then record its outcome.
+
+    Exceptions listed in ``cancelled`` are counted as ``cancelled``; any other
+    exception as ``failed``.
+    """
+
+    if not REGISTRY.enabled:
+        yield
+        return
+    SCANS_IN_FLIGHT.inc()
+    status = "failed"
+    try:
+        with _Timer("scan", ""):
+            yield
+        status = "completed"
+    except cancelled:
+        status = "cancelled"
+        raise
+    finally:
+        SCANS_IN_FLIGHT.dec()
+        SCANS.inc(status)
+
+
+def record_findings(
+    pii_findings: Iterable[Any],
+    misconfigurations: Iterable[Any],
+    column_findings: Iterable[Any],
+    pii_aggregates: Iterable[Any] = (),
+) -> None:
+    """Count findings per kind and rule, using the scan history's finding kinds."""
+
+    if not REGISTRY.enabled:
+        return
+    counts: Dict[Tuple[str, str], int] = {}
+    for finding in pii_findings:
+        counts[("pii", finding.type)] = counts.get(("pii", finding.type), 0) + 1
+    for aggregate in pii_aggregates:
+        counts[("pii", aggregate.type)] = counts.get(("pii", aggregate.type), 0) + aggregate.count
+    for finding in misconfigurations:
+        key = ("misconfiguration", finding.issue)
+        counts[key] = counts.get(key, 0) + 1
+    for column in column_findings:
+        counts[("column", column.type)] = counts.get(("column", column.type), 0) + 1
+    for (kind, rule), count in counts.items():
+        FINDINGS.inc(kind, rule, amount=count)
+
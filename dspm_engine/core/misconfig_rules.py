@@ -0,0 +1,117 @@
+"""Compiler for the declarative misconfiguration rule conditions.
+
+A condition is a JSON object in one of these forms::
+
+    {"field": "public", "equals": true}
+    {"field": "encryption", "empty": true}
+    {"field": "policy", "in": ["allow-all", "public"], "ignore_case": true}
+    {"tag": "backup", "equals": "true"}
+    {"all": [...]}, {"any": [...]}, {"not": {...}}
+
+Leaf conditions support exactly one operator out of ``equals``, ``not_equals``,
+``in``, ``not_in``, ``empty`` and ``matches`` (a regular expression searched in
+the value). Conditions compile once into a function that evaluates a whole
+batch at a time and returns a 0/1 byte mask with one entry per asset.
+"""
+from __future__ import annotations
+
+import re
+from functools import reduce
+from typing import Any, Callable, Dict, List, Protocol
+
+from .inventory import mask_and, mask_not, mask_or
+
+CONDITION_FIELDS = frozenset(
+    {"name", "provider", "public", "encryption", "versioning", "policy", "region", "size"}
+)
+OPERATORS = ("equals", "not_equals", "in", "not_in", "empty", "matches")
+
+ValueTest = Callable[[Any], bool]
+
+
+class ColumnSource(Protocol):
+    """Batch of assets that can compute per-column masks.
+
+    Implemented by :class:`~dspm_engine.core.inventory.CompactInventory` and
+    :class:`~dspm_engine.core.inventory.AssetColumns`.
+    """
+
+    names: List[str]
+
+    def __len__(self) -> int: ...
+
+    def field_mask(self, name: str, test: ValueTest) -> bytes: ...
+
+    def tag_mask(self, key: str, test: ValueTest) -> bytes: ...
+
+
+# Compiled condition: returns a 0/1 byte mask of the matching rows.
+Condition = Callable[[ColumnSource], bytes]
+
+
+def _normalize(value: Any, ignore_case: bool) -> Any:
+    """Lowercase strings when comparisons ignore case."""
+
+    return value.lower() if ignore_case and isinstance(value, str) else value
+
+
+def _value_test(spec: Dict[str, Any]) -> ValueTest:
+    """Compile the operator of a leaf condition into a test over one value."""
+
+    operators = [name for name in OPERATORS if name in spec]
+    if len(operators) != 1:
+        raise ValueError(f"Condition needs exactly one of {', '.join(OPERATORS)}: {spec}")
+    operator = operators[0]
+    operand = spec[operator]
+    ignore_case = bool(spec.get("ignore_case", False))
+
+    if operator == "empty":
+        expected = bool(operand)
+        return lambda value: (not value) == expected
+    if operator == "matches":
+        pattern = re.compile(operand, re.IGNORECASE if ignore_case else 0)
+        return lambda value: value is not None and pattern.search(str(value)) is not None
+    if operator in {"in", "not_in"}:
+        if not isinstance(operand, list):
+            raise ValueError(f"'{operator}' expects a list: {spec}")
+        choices = frozenset(_normalize(item, ignore_case) for item in operand)
+        if operator == "in":
+            return lambda value: _normalize(value, ignore_case) in choices
+        return lambda value: _normalize(value, ignore_case) not in choices
+    expected = _normalize(operand, ignore_case)
+    if operator == "equals":
+        return lambda value: _normalize(value, ignore_case) == expected
+    return lambda value: _normalize(value, ignore_case) != expected
+
+
+def _leaf(spec: Dict[str, Any]) -> Condition:
+    """Compile a field or tag comparison."""
+
+    test = _value_test(spec)
+    if "tag" in spec:
+        key = str(spec["tag"])
+        return lambda batch: batch.tag_mask(key, test)
+    name = spec.get("field")
+    if name not in CONDITION_FIELDS:
+        raise ValueError(
+            f"Unknown condition field {name!r}; expected one of {sorted(CONDITION_FIELDS)}"
+        )
+    return lambda batch: batch.field_mask(name, test)
+
+
+def compile_condition(spec: Any) -> Condition:
+    """Compile a condition specification, raising ``ValueError`` if it is malformed."""
+
+    if not isinstance(spec, dict):
+        raise ValueError(f"Condition must be an object: {spec!r}")
+    if "all" in spec or "any" in spec:
+        combinator = "all" if "all" in spec else "any"
+        if not isinstance(spec[combinator], list) or not spec[combinator]:
+            raise ValueError(f"'{combinator}' expects a non-empty list: {spec}")
+        parts: List[Condition] = [compile_condition(item) for item in spec[combinator]]
+        combine = mask_and if combinator == "all" else mask_or
+        return lambda batch: reduce(combine, (part(batch) for part in parts))
+    if "not" in spec:
+        inner = compile_condition(spec["not"])
+        return lambda batch: mask_not(inner(batch))
+    return _leaf(spec)
@@ -1,34 +1,62 @@
 """Core dataclasses and type helpers for DSPM components."""
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, Iterable, List, Literal, Optional
+import sys
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .inventory import CompactInventory
 
 Provider = Literal["aws", "azure", "gcp"]
 
+# Encryption and policy reported for settings discovery could not read.
+UNKNOWN_ENCRYPTION = "UNKNOWN"
+UNKNOWN_POLICY = "unknown"
 
-@dataclass
+
+@dataclass(slots=True)
 class StorageAsset:
-    """Normalized representation of a cloud storage asset."""
+    """Normalized representation of a cloud storage asset.
+
+    Uses ``__slots__`` and interns low-cardinality strings (provider, region,
+    policy, encryption) so large inventories share one copy of each value.
+
+    Live discovery may be denied some posture settings. Those are reported as
+    unknown rather than as a secure default: ``public`` and ``versioning`` are
+    ``None``, encryption is :data:`UNKNOWN_ENCRYPTION`, policy is
+    :data:`UNKNOWN_POLICY` and region is ``None``. ``posture_unknown`` names every
+    field that could not be read.
+    """
 
     name: str
     provider: Provider
-    public: bool = False
+    public: Optional[bool] = False
     encryption: Optional[str] = None
-    versioning: bool = True
+    versioning: Optional[bool] = True
     policy: str = "restricted"
     region: Optional[str] = None
     tags: Dict[str, str] = field(default_factory=dict)
     sample_content: Optional[str] = None
+    etag: Optional[str] = None
+    size: Optional[int] = None
+    last_modified: Optional[str] = None
+    posture_unknown: Tuple[str, ...] = ()
 
     def __post_init__(self) -> None:
         """Normalize booleans and casing for consistent downstream usage."""
 
-        self.public = bool(self.public)
-        self.versioning = bool(self.versioning)
+        if self.public is not None:
+            self.public = bool(self.public)
+        if self.versioning is not None:
+            self.versioning = bool(self.versioning)
+        self.posture_unknown = tuple(self.posture_unknown)
+        self.provider = sys.intern(self.provider)
         if self.encryption:
-            self.encryption = self.encryption.upper()
-        self.policy = self.policy or "restricted"
+            self.encryption = sys.intern(self.encryption.upper())
+        self.policy = sys.intern(self.policy or "restricted")
+        if self.region:
+            self.region = sys.intern(self.region)
 
     @classmethod
     def from_dict(cls, payload: Dict[str, Any]) -> "StorageAsset":
@@ -37,19 +65,30 @@ class StorageAsset:
         return cls(
             name=payload.get("name", "unknown"),
             provider=payload.get("provider", "aws"),
-            public=_coerce_bool(payload.get("public", False)),
+            public=_coerce_flag(payload.get("public", False)),
             encryption=payload.get("encryption"),
-            versioning=_coerce_bool(payload.get("versioning", True)),
+            versioning=_coerce_flag(payload.get("versioning", True)),
             policy=payload.get("policy", "restricted"),
             region=payload.get("region"),
             tags=payload.get("tags", {}),
             sample_content=payload.get("sample_content"),
+            etag=payload.get("etag"),
+            size=payload.get("size"),
+            last_modified=payload.get("last_modified"),
+            posture_unknown=tuple(payload.get("posture_unknown", ())),
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize the asset into a dictionary for JSON rendering."""
+        """Serialize the asset into a dictionary for JSON rendering.
 
-        return asdict(self)
+        Only ``tags`` is copied; every other field is an immutable scalar, so the
+        recursive deep copy performed by :func:`dataclasses.asdict` is unnecessary.
+        """
+
+        record = {name: getattr(self, name) for name in ASSET_FIELD_NAMES}
+        record["tags"] = dict(self.tags)
+        record["posture_unknown"] = list(self.posture_unknown)
+        return record
 
 
 @dataclass
@@ -61,7 +100,14 @@ class AssetInventory:
     def add(self, assets: Iterable[StorageAsset]) -> None:
         """Append discovered assets to the inventory."""
 
-        self.buckets.extend(list(assets))
+        self.buckets.extend(assets)
+
+    def compact(self) -> "CompactInventory":
+        """Return a columnar copy of the inventory for filtering and export."""
+
+        from .inventory import CompactInventory
+
+        return CompactInventory.from_assets(self.buckets)
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the inventory into a dictionary."""
@@ -69,6 +115,38 @@ class AssetInventory:
         return {"buckets": [bucket.to_dict() for bucket in self.buckets]}
 
 
+ASSET_FIELD_NAMES = tuple(item.name for item in fields(StorageAsset))
+# Posture fields safe to publish; tags and sampled content are left out.
+PUBLIC_ASSET_FIELDS = (
+    "name",
+    "provider",
+    "public",
+    "encryption",
+    "versioning",
+    "policy",
+    "region",
+    "posture_unknown",
+)
+
+
+def posture_errors(assets: Iterable[StorageAsset]) -> Dict[str, str]:
+    """Describe assets with unreadable posture, keyed by ``provider/name``."""
+
+    return {
+        f"{asset.provider}/{asset.name}": (
+            f"PostureUnknown: could not read {', '.join(asset.posture_unknown)}"
+        )
+        for asset in assets
+        if asset.posture_unknown
+    }
+
+
+def _coerce_flag(value: Any) -> Optional[bool]:
+    """Convert a loosely-typed flag, keeping ``None`` as unknown."""
+
+    return None if value is None else _coerce_bool(value)
+
+
 def _coerce_bool(value: Any) -> bool:
     """Convert loosely-typed truthy values into booleans."""
 
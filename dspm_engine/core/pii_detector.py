@@ -1,26 +1,94 @@
 """Rule-based PII detection for Australian data classes."""
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from . import metrics
+from .aggregation import DEFAULT_MAX_EXAMPLES, FindingAggregator, Hit, PiiAggregate
 from .logging_utils import get_logger
 from .models import StorageAsset
+from .prefilter import ContentRouter
+from .sampling import ObjectSample
+from .validators import get_validator
 
 logger = get_logger(__name__)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_OVERLAP = 256
+# Characters kept before each streamed window so ``\b`` and short lookbehinds at
+# the window start see the text that precedes it.
+STREAM_CONTEXT = 32
+# "mark" keeps every regex hit and flags whether a checksum confirmed it; "drop"
+# discards hits that fail their rule's validator.
+VALIDATION_MODES = {"mark", "drop"}
+
+ChunkSource = Union[Iterable[Union[bytes, str]], IO[Any]]
+
 
 @dataclass
 class PiiFinding:
-    """Structured result describing a PII match."""
+    """Structured result describing a PII match.
+
+    Attributes:
+        type: Name of the matching rule.
+        sample: Matched text. Scans run with a result cache report it masked with
+            :func:`~dspm_engine.core.aggregation.mask_sample`, whether the finding
+            was reused from the cache or freshly detected.
+        location: Object URI.
+        provider: Cloud provider identifier.
+        validated: Whether the rule's checksum validator confirmed the match.
+    """
 
     type: str
     sample: str
     location: str
     provider: str
+    validated: bool = False
+
+
+@dataclass
+class ColumnFinding:
+    """PII classification of one column of a tabular object.
+
+    Attributes:
+        type: Name of the matching rule.
+        column: Column name (dotted path for nested JSON fields).
+        location: Object URI.
+        provider: Cloud provider identifier.
+        hits: Sampled values containing at least one match.
+        sampled: Non-empty values sampled from the column.
+        hit_ratio: ``hits / sampled``.
+        validated: Hits confirmed by the rule's checksum validator, if it has one.
+    """
+
+    type: str
+    column: str
+    location: str
+    provider: str
+    hits: int
+    sampled: int
+    hit_ratio: float
+    validated: int = 0
 
 
 @dataclass
@@ -30,6 +98,7 @@ class PiiRule:
     name: str
     pattern: str
     description: str
+    validator: Optional[str] = None
 
     def compiled(self) -> re.Pattern[str]:
         """Return a compiled regex for the rule."""
@@ -37,16 +106,166 @@ class PiiRule:
         return re.compile(self.pattern, re.IGNORECASE)
 
 
+# Backreferences are numbered relative to the whole expression, so they cannot be
+# spliced into a combined alternation without changing their meaning.
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class CompiledRuleSet:
+    """Rules compiled once into a single-pass, multi-rule matching engine.
+
+    Every rule is wrapped in a zero-width lookahead with its own named group, behind
+    a prefilter alternation of all patterns. The regex engine therefore skips
+    positions where no rule can match and, at each candidate position, reports the
+    match every rule would produce there. Tracking where each rule's previous match
+    ended reproduces the non-overlapping ``finditer`` semantics of scanning rule by
+    rule, so findings are identical to the per-rule loop in a single pass.
+    """
+
+    def __init__(self, rules: Sequence[PiiRule]) -> None:
+        """Compile the combined expression, falling back to per-rule patterns."""
+
+        self.rules: Tuple[PiiRule, ...] = tuple(rules)
+        self._patterns = [rule.compiled() for rule in self.rules]
+        self._validators = {
+            id(rule): get_validator(rule.validator) for rule in self.rules if rule.validator
+        }
+        self._combined = self._compile_combined()
+        self._groups = (
+            [self._combined.groupindex[f"r{index}"] for index in range(len(self.rules))]
+            if self._combined is not None
+            else []
+        )
+
+    def _compile_combined(self) -> Optional[re.Pattern[str]]:
+        """Build the combined expression, or ``None`` if the rules cannot be merged."""
+
+        if not self.rules:
+            return None
+        if any(_BACKREFERENCE.search(rule.pattern) for rule in self.rules):
+            logger.debug("PII rules use backreferences; using per-rule matching")
+            return None
+        prefilter = "|".join(f"(?:{rule.pattern})" for rule in self.rules)
+        captures = "".join(
+            f"(?:(?=(?P<r{index}>{rule.pattern})))?" for index, rule in enumerate(self.rules)
+        )
+        try:
+            return re.compile(f"(?=(?:{prefilter})){captures}", re.IGNORECASE)
+        except re.error as exc:
+            logger.debug("PII rules cannot be combined (%s); using per-rule matching", exc)
+            return None
+
+    @property
+    def combined(self) -> bool:
+        """Whether payloads are scanned with the single-pass combined expression."""
+
+        return self._combined is not None
+
+    def iter_matches(
+        self,
+        content: str,
+        resume_at: Optional[List[int]] = None,
+        limit: Optional[int] = None,
+    ) -> Iterable[Tuple[PiiRule, int, int]]:
+        """Yield ``(rule, start, end)`` in rule order, then match order per rule.
+
+        Args:
+            content: Text to scan.
+            resume_at: Optional per-rule offsets before which matches are ignored, as if
+                an earlier ``finditer`` pass had stopped there. Updated in place so the
+                caller can carry state across windows of a larger stream.
+            limit: Optional offset; matches starting at or after it are not reported.
+        """
+
+        resume = resume_at if resume_at is not None else [0] * len(self.rules)
+        stop = len(content) + 1 if limit is None else limit
+        if self._combined is None:
+            for index, (rule, pattern) in enumerate(
+                zip(self.rules, self._patterns, strict=True)
+            ):
+                for match in pattern.finditer(content, resume[index]):
+                    start, end = match.span()
+                    if start >= stop:
+                        break
+                    resume[index] = end if end > start else end + 1
+                    yield rule, start, end
+            return
+
+        per_rule: List[List[Tuple[int, int]]] = [[] for _ in self.rules]
+        for match in self._combined.finditer(content, min(resume, default=0)):
+            position = match.start()
+            if position >= stop:
+                break
+            for index, group in enumerate(self._groups):
+                start, end = match.span(group)
+                if start < 0 or position < resume[index]:
+                    continue
+                per_rule[index].append((start, end))
+                resume[index] = end if end > start else end + 1
+        for rule, spans in zip(self.rules, per_rule, strict=True):
+            for start, end in spans:
+                yield rule, start, end
+
+    def iter_checked(
+        self,
+        content: str,
+        resume_at: Optional[List[int]] = None,
+        limit: Optional[int] = None,
+        drop_invalid: bool = False,
+    ) -> Iterator[Tuple[PiiRule, int, int, bool]]:
+        """Like :meth:`iter_matches`, adding whether a checksum validated each match.
+
+        Matches of rules without a validator are reported as unvalidated. With
+        ``drop_invalid``, matches that fail their rule's validator are skipped.
+        """
+
+        validators = self._validators
+        for rule, start, end in self.iter_matches(content, resume_at, limit):
+            check = validators.get(id(rule))
+            if check is None:
+                yield rule, start, end, False
+            elif check(content[start:end]):
+                yield rule, start, end, True
+            elif not drop_invalid:
+                yield rule, start, end, False
+
+
 class PiiDetector:
     """Detect PII using rule-based regex matching."""
 
-    def __init__(self, rules: Sequence[PiiRule]):
-        """Create a detector with a set of rules."""
+    def __init__(
+        self,
+        rules: Sequence[PiiRule],
+        prefilter: Optional[ContentRouter] = None,
+        validation: str = "mark",
+    ):
+        """Create a detector with a set of rules.
+
+        When ``prefilter`` is set, binary payloads are skipped and compressed ones
+        inflated before any rule runs; see :class:`~dspm_engine.core.prefilter.ContentRouter`.
+        ``validation`` is ``"mark"`` to flag checksum-confirmed findings or ``"drop"``
+        to also discard matches that fail their rule's validator.
+        """
 
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"Unsupported validation mode: {validation}")
         self.rules = list(rules)
+        self.prefilter = prefilter
+        self.validation = validation
+        self._engine = CompiledRuleSet(self.rules)
+
+    @property
+    def engine(self) -> CompiledRuleSet:
+        """Return the compiled rule set, rebuilding it if ``rules`` was modified."""
+
+        if self._engine.rules != tuple(self.rules):
+            self._engine = CompiledRuleSet(self.rules)
+        return self._engine
 
     @classmethod
-    def from_default_rules(cls) -> "PiiDetector":
+    def from_default_rules(
+        cls, prefilter: Optional[ContentRouter] = None, validation: str = "mark"
+    ) -> "PiiDetector":
         """Instantiate a detector using bundled JSON rules."""
 
         rule_path = Path(__file__).resolve().parent.parent / "config" / "pii_rules.json"
@@ -69,34 +288,291 @@ class PiiDetector:
                     description="Australian Tax File Number",
                 ),
             ]
-        return cls(rules)
+        return cls(rules, prefilter=prefilter, validation=validation)
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the rule set, used to invalidate cached results."""
+
+        payload = json.dumps(
+            [[rule.name, rule.pattern, rule.description, rule.validator] for rule in self.rules]
+        )
+        payload += self.validation
+        if self.prefilter is not None:
+            payload += self.prefilter.fingerprint()
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def sample_location(provider: str, asset: StorageAsset) -> str:
+        """Return the location recorded on findings for an asset's sample payload."""
+
+        return f"{provider}://{asset.name}/sample.txt"
 
     def _content_samples(self, provider: str, assets: Iterable[StorageAsset]) -> Dict[str, str]:
         """Extract sample payloads from assets for scanning."""
 
         samples: Dict[str, str] = {}
+        prefilter = self.prefilter
         for asset in assets:
-            key = f"{provider}://{asset.name}/sample.txt"
-            samples[key] = asset.sample_content or ""
+            location = self.sample_location(provider, asset)
+            content = asset.sample_content or ""
+            if prefilter is not None and prefilter.filter_text(location, content) is None:
+                continue
+            samples[location] = content
+        if metrics.is_enabled():
+            size = sum(len(content.encode("utf-8")) for content in samples.values())
+            metrics.BYTES_PROCESSED.inc(provider, amount=size)
         return samples
 
+    def _object_texts(
+        self, provider: str, samples: Iterable[ObjectSample], encoding: str
+    ) -> Iterator[Tuple[str, str, int]]:
+        """Yield ``(location, text, offset)`` for every sampled segment worth scanning."""
+
+        prefilter = self.prefilter
+        metered = metrics.is_enabled()
+        for sample in samples:
+            if metered:
+                size = sum(len(segment) for segment in sample.segments)
+                metrics.BYTES_PROCESSED.inc(provider, amount=size)
+            offsets = sample.segment_offsets()
+            if prefilter is not None:
+                yield from prefilter.texts(
+                    sample.location, sample.segments, sample.content_type, encoding, offsets
+                )
+                continue
+            for segment, offset in zip(sample.segments, offsets, strict=True):
+                yield sample.location, segment.decode(encoding, errors="replace"), offset
+
     def scan_content_samples(
         self, provider: str, assets: Iterable[StorageAsset]
     ) -> List[PiiFinding]:
         """Scan provided assets for PII matches using configured rules."""
 
-        findings: List[PiiFinding] = []
+        with metrics.timed("pii", provider):
+            findings = self._findings(provider, self._content_hits(provider, assets))
+        logger.info("Detected %s PII matches for provider %s", len(findings), provider)
+        return findings
+
+    def aggregate_content_samples(
+        self,
+        provider: str,
+        assets: Iterable[StorageAsset],
+        max_examples: int = DEFAULT_MAX_EXAMPLES,
+    ) -> List[PiiAggregate]:
+        """Like :meth:`scan_content_samples`, rolled up per location and rule."""
+
+        aggregator = FindingAggregator(max_examples)
+        with metrics.timed("pii", provider):
+            hits = self._content_hits(provider, assets)
+            aggregates = aggregator.extend(provider, hits).results()
+        logger.info("Aggregated PII matches into %s groups for %s", len(aggregates), provider)
+        return aggregates
+
+    def _content_hits(self, provider: str, assets: Iterable[StorageAsset]) -> Iterator[Hit]:
+        """Yield the hits in every asset's sample content."""
+
         samples = self._content_samples(provider, assets)
-        for location, content in samples.items():
-            for rule in self.rules:
-                for match in rule.compiled().finditer(content):
+        return self._iter_hits((location, content, 0) for location, content in samples.items())
+
+    def _iter_hits(self, texts: Iterable[Tuple[str, str, int]]) -> Iterator[Hit]:
+        """Run the rule set over ``(location, content, offset)`` triples.
+
+        ``offset`` is where ``content`` starts in its object (such as the start of
+        an object's tail range), and is added to each hit's offset.
+        """
+
+        engine = self.engine
+        drop_invalid = self.validation == "drop"
+        for location, content, base in texts:
+            for rule, start, end, validated in engine.iter_checked(
+                content, drop_invalid=drop_invalid
+            ):
+                yield rule.name, content[start:end], location, validated, base + start
+
+    @staticmethod
+    def _findings(provider: str, hits: Iterable[Hit]) -> List[PiiFinding]:
+        """Build one finding per hit."""
+
+        return [
+            PiiFinding(
+                type=name,
+                sample=sample,
+                location=location,
+                provider=provider,
+                validated=validated,
+            )
+            for name, sample, location, validated, _ in hits
+        ]
+
+    def scan_object_samples(
+        self, provider: str, samples: Iterable[ObjectSample], encoding: str = "utf-8"
+    ) -> List[PiiFinding]:
+        """Scan byte ranges read by an :class:`~dspm_engine.core.sampling.ObjectSampler`.
+
+        Each segment is matched on its own, so the gap between an object's head and
+        tail ranges can never produce a spurious match. Members of sampled zip
+        archives are reported as ``<object location>!<member name>``.
+        """
+
+        with metrics.timed("pii", provider):
+            hits = self._iter_hits(self._object_texts(provider, samples, encoding))
+            findings = self._findings(provider, hits)
+        logger.info("Detected %s PII matches in sampled %s objects", len(findings), provider)
+        return findings
+
+    def aggregate_object_samples(
+        self,
+        provider: str,
+        samples: Iterable[ObjectSample],
+        encoding: str = "utf-8",
+        max_examples: int = DEFAULT_MAX_EXAMPLES,
+    ) -> List[PiiAggregate]:
+        """Like :meth:`scan_object_samples`, rolled up per location and rule."""
+
+        aggregator = FindingAggregator(max_examples)
+        with metrics.timed("pii", provider):
+            hits = self._iter_hits(self._object_texts(provider, samples, encoding))
+            aggregates = aggregator.extend(provider, hits).results()
+        logger.info("Aggregated PII matches into %s groups for %s", len(aggregates), provider)
+        return aggregates
+
+    def classify_columns(
+        self,
+        provider: str,
+        location: str,
+        columns: Mapping[str, Sequence[str]],
+        min_hit_ratio: float = 0.0,
+    ) -> List[ColumnFinding]:
+        """Classify sampled column values, returning one finding per column and rule.
+
+        Each column's values are joined and matched in a single engine pass; match
+        offsets are mapped back to the value they fall in, so ``hits`` counts values
+        rather than matches. Columns whose hit ratio is below ``min_hit_ratio`` are
+        not reported.
+        """
+
+        findings: List[ColumnFinding] = []
+        engine = self.engine
+        drop_invalid = self.validation == "drop"
+        for column, values in columns.items():
+            if not values:
+                continue
+            starts: List[int] = []
+            offset = 0
+            for value in values:
+                starts.append(offset)
+                offset += len(value) + 1
+            content = "\n".join(value.replace("\n", " ") for value in values)
+            hit_values: Dict[str, Set[int]] = {}
+            valid_values: Dict[str, Set[int]] = {}
+            for rule, start, _, validated in engine.iter_checked(
+                content, drop_invalid=drop_invalid
+            ):
+                index = bisect_right(starts, start) - 1
+                hit_values.setdefault(rule.name, set()).add(index)
+                if validated:
+                    valid_values.setdefault(rule.name, set()).add(index)
+            for name, hit in hit_values.items():
+                ratio = len(hit) / len(values)
+                if ratio >= min_hit_ratio:
                     findings.append(
-                        PiiFinding(
-                            type=rule.name,
-                            sample=match.group(0),
+                        ColumnFinding(
+                            type=name,
+                            column=column,
                             location=location,
                             provider=provider,
+                            hits=len(hit),
+                            sampled=len(values),
+                            hit_ratio=round(ratio, 4),
+                            validated=len(valid_values.get(name, ())),
                         )
                     )
-        logger.info("Detected %s PII matches for provider %s", len(findings), provider)
         return findings
+
+    def scan_stream(
+        self,
+        provider: str,
+        location: str,
+        source: ChunkSource,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        overlap: int = STREAM_OVERLAP,
+        encoding: str = "utf-8",
+    ) -> Iterator[PiiFinding]:
+        """Scan an object body incrementally, yielding findings as they are confirmed.
+
+        Args:
+            provider: Cloud provider identifier.
+            location: Object URI recorded on each finding.
+            source: Iterable of ``bytes``/``str`` chunks, or a binary/text file object.
+            chunk_size: Maximum number of bytes or characters decoded per step.
+            overlap: Characters carried between windows so matches spanning a chunk
+                boundary are still found. Must exceed the longest match a rule can
+                produce plus its surrounding context (e.g. ``\\b``).
+            encoding: Codec used to decode ``bytes`` chunks; invalid sequences are replaced.
+
+        Peak memory is bounded by ``chunk_size + overlap`` (plus a few characters of
+        context) regardless of object size.
+        Each match is reported exactly once, with the same non-overlapping semantics
+        as :meth:`scan_content_samples`.
+        """
+
+        if chunk_size <= 0 or overlap <= 0:
+            raise ValueError("chunk_size and overlap must be positive")
+
+        engine = self.engine
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        resume_at = [0] * len(engine.rules)
+        buffer = ""
+        base = 0
+        total = 0
+
+        drop_invalid = self.validation == "drop"
+
+        def drain(limit: Optional[int]) -> Iterator[PiiFinding]:
+            relative = [max(0, offset - base) for offset in resume_at]
+            for rule, start, end, validated in engine.iter_checked(
+                buffer, relative, limit, drop_invalid
+            ):
+                yield PiiFinding(
+                    type=rule.name,
+                    sample=buffer[start:end],
+                    location=location,
+                    provider=provider,
+                    validated=validated,
+                )
+            resume_at[:] = [base + offset for offset in relative]
+
+        for block in _iter_blocks(source, chunk_size):
+            buffer += decoder.decode(block) if isinstance(block, bytes) else block
+            if len(buffer) <= overlap:
+                continue
+            limit = len(buffer) - overlap
+            for finding in drain(limit):
+                total += 1
+                yield finding
+            # Every match starting before ``limit`` has been reported. Keep a little
+            # text before it as context only; matching resumes at ``limit``.
+            resume_at[:] = [max(offset, base + limit) for offset in resume_at]
+            keep = max(0, limit - STREAM_CONTEXT)
+            buffer = buffer[keep:]
+            base += keep
+
+        buffer += decoder.decode(b"", final=True)
+        for finding in drain(None):
+            total += 1
+            yield finding
+        logger.info("Detected %s PII matches in streamed object %s", total, location)
+
+
+def _iter_blocks(source: ChunkSource, chunk_size: int) -> Iterator[Union[bytes, str]]:
+    """Yield blocks of at most ``chunk_size`` from chunk iterables or file objects."""
+
+    if isinstance(source, (bytes, str)):
+        chunks: Iterable[Union[bytes, str]] = [source]
+    elif hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+    for chunk in chunks:
+        for offset in range(0, len(chunk), chunk_size):
+            yield chunk[offset : offset + chunk_size]
@@ -0,0 +1,193 @@
+"""Process-pool backend for CPU-bound PII classification."""
+from __future__ import annotations
+
+import os
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import metrics
+from .aggregation import Hit
+from .logging_utils import get_logger
+from .models import StorageAsset
+from .pii_detector import PiiDetector, PiiFinding, PiiRule
+from .prefilter import ContentRouter
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 64
+
+# Detector built once per worker process by :func:`_init_worker`.
+_WORKER_DETECTOR: Optional[PiiDetector] = None
+
+RuleSpec = Tuple[str, str, str, Optional[str]]
+# (location, content, offset of the content in its object)
+Text = Tuple[str, str, int]
+FindingRow = Hit
+
+
+def _init_worker(rule_specs: Sequence[RuleSpec], validation: str = "mark") -> None:
+    """Compile the rule set once when a worker process starts."""
+
+    global _WORKER_DETECTOR
+    _WORKER_DETECTOR = PiiDetector(
+        [PiiRule(*spec) for spec in rule_specs], validation=validation
+    )
+
+
+def _scan_batch(texts: Sequence[Text]) -> List[FindingRow]:
+    """Classify a batch of ``(location, content, offset)`` texts inside a worker."""
+
+    if _WORKER_DETECTOR is None:
+        raise RuntimeError("PII worker used before initialization")
+    engine = _WORKER_DETECTOR.engine
+    drop_invalid = _WORKER_DETECTOR.validation == "drop"
+    rows: List[FindingRow] = []
+    for location, content, base in texts:
+        for rule, start, end, validated in engine.iter_checked(
+            content, drop_invalid=drop_invalid
+        ):
+            rows.append((rule.name, content[start:end], location, validated, base + start))
+    return rows
+
+
+class ProcessPoolPiiDetector(PiiDetector):
+    """PII detector that shards content samples across worker processes.
+
+    The rule set is shipped to each worker once through the pool initializer, so
+    tasks only carry sample payloads. Asset content and the decoded segments of
+    sampled objects are grouped into batches of ``batch_size`` and results stream
+    back per batch in submission order, keeping findings identical to the inline
+    :class:`PiiDetector`.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[PiiRule],
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        prefilter: Optional[ContentRouter] = None,
+        validation: str = "mark",
+    ) -> None:
+        """Create a detector backed by a lazily started process pool.
+
+        The ``prefilter`` runs in the parent process, so skipped payloads are never
+        shipped to workers.
+        """
+
+        super().__init__(rules, prefilter=prefilter, validation=validation)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_rules: Tuple[Tuple[PiiRule, ...], str] = ((), "")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_detector(
+        cls,
+        detector: PiiDetector,
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> "ProcessPoolPiiDetector":
+        """Wrap the rules of an existing detector in a process-pool backend."""
+
+        return cls(
+            detector.rules,
+            max_workers=max_workers,
+            batch_size=batch_size,
+            prefilter=detector.prefilter,
+            validation=detector.validation,
+        )
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Return the worker pool, restarting it if the rule set or validation changed."""
+
+        rules = tuple(self.rules)
+        config = (rules, self.validation)
+        with self._lock:
+            if self._executor is not None and self._executor_rules != config:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self._executor is None:
+                # Imported on first use: it loads multiprocessing, which inline
+                # scans never need.
+                from concurrent.futures import ProcessPoolExecutor
+
+                logger.info("Starting PII worker pool with %s processes", self.max_workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        [
+                            (rule.name, rule.pattern, rule.description, rule.validator)
+                            for rule in rules
+                        ],
+                        self.validation,
+                    ),
+                )
+                self._executor_rules = config
+            return self._executor
+
+    def iter_finding_batches(
+        self, provider: str, assets: Iterable[StorageAsset]
+    ) -> Iterator[List[PiiFinding]]:
+        """Yield findings one batch at a time, in the same order as a serial scan."""
+
+        for rows in self._hit_batches(provider, assets):
+            yield self._findings(provider, rows)
+
+    def _hit_batches(
+        self, provider: str, assets: Iterable[StorageAsset]
+    ) -> Iterator[List[FindingRow]]:
+        """Scan content samples on the pool, yielding raw hits one batch at a time."""
+
+        samples = self._content_samples(provider, assets)
+        return self._text_batches((location, content, 0) for location, content in samples.items())
+
+    def _text_batches(self, texts: Iterable[Text]) -> Iterator[List[FindingRow]]:
+        """Scan texts on the pool in batches of ``batch_size``, in submission order."""
+
+        remaining = iter(texts)
+        batches = iter(lambda: list(islice(remaining, self.batch_size)), [])
+        yield from self._pool().map(_scan_batch, batches)
+
+    def _iter_hits(self, texts: Iterable[Text]) -> Iterator[Hit]:
+        """Yield hits computed on the worker pool, in serial scan order.
+
+        Content samples and sampled object segments both arrive here, so every
+        text scan of this detector runs on the pool.
+        """
+
+        for rows in self._text_batches(texts):
+            yield from rows
+
+    def scan_content_samples(
+        self, provider: str, assets: Iterable[StorageAsset]
+    ) -> List[PiiFinding]:
+        """Scan provided assets for PII matches on the worker pool."""
+
+        findings: List[PiiFinding] = []
+        with metrics.timed("pii", provider):
+            for batch in self.iter_finding_batches(provider, assets):
+                findings.extend(batch)
+        logger.info("Detected %s PII matches for provider %s", len(findings), provider)
+        return findings
+
+    def close(self) -> None:
+        """Shut down the worker pool; it restarts on the next scan if needed."""
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __enter__(self) -> "ProcessPoolPiiDetector":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,406 @@
+"""Streaming scan pipeline: discover -> sample -> classify -> evaluate -> sink.
+
+Each stage runs on its own thread and hands batches of assets to the next through
+a bounded queue. A full queue blocks the stage feeding it, so discovery never
+runs more than a few batches ahead of the slowest stage and memory stays flat
+regardless of estate size. Results reach the caller batch by batch through a
+callback, a plain iterator or an async iterator.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from . import metrics
+from .aggregation import PiiAggregate
+from .logging_utils import get_logger
+from .misconfig import MisconfigurationFinding
+from .models import PUBLIC_ASSET_FIELDS, StorageAsset, posture_errors
+from .pii_detector import ColumnFinding, PiiFinding
+from .result_cache import CacheStats
+from .risk_score import RiskBreakdown, RiskTally
+from .sampling import ObjectSample, ObjectSampler
+from .scanner import ProgressCallback, ScanCancelled, _normalize_providers
+
+if TYPE_CHECKING:
+    from .scanner import Scanner
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_QUEUE_SIZE = 4
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+# Receives each analyzed batch in discovery order; may raise ScanCancelled to stop.
+BatchSink = Callable[["ScanBatch"], None]
+
+
+class _Stopped(Exception):
+    """Raised inside stage threads once the pipeline has been stopped."""
+
+
+@dataclass
+class ScanBatch:
+    """A batch of one provider's assets and the findings produced for them."""
+
+    provider: str
+    assets: List[StorageAsset]
+    pii_findings: List[PiiFinding] = field(default_factory=list)
+    misconfigurations: List[MisconfigurationFinding] = field(default_factory=list)
+    column_findings: List[ColumnFinding] = field(default_factory=list)
+    pii_aggregates: List[PiiAggregate] = field(default_factory=list)
+    cache_stats: CacheStats = field(default_factory=CacheStats)
+    samples: Optional[List[ObjectSample]] = field(default=None, repr=False)
+    analyzed: bool = field(default=False, repr=False)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield one JSON-ready record per asset and finding, tagged by ``event``."""
+
+        for asset in self.assets:
+            record = {name: getattr(asset, name) for name in PUBLIC_ASSET_FIELDS}
+            yield {"event": "asset", **record}
+        for event, items in (
+            ("misconfiguration", self.misconfigurations),
+            ("pii", self.pii_findings),
+            ("pii_aggregate", self.pii_aggregates),
+            ("column", self.column_findings),
+        ):
+            for item in items:
+                yield {"event": event, **asdict(item)}
+
+
+@dataclass
+class PipelineSummary:
+    """Totals for a completed pipeline run; findings themselves went to the sink."""
+
+    risk: RiskBreakdown
+    assets: int = 0
+    pii_findings: int = 0
+    misconfigurations: int = 0
+    column_findings: int = 0
+    pii_aggregates: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    cache_stats: CacheStats = field(default_factory=CacheStats)
+
+    def record(self) -> Dict[str, Any]:
+        """Return the summary as a JSON-ready ``summary`` event."""
+
+        return {
+            "event": "summary",
+            "risk": self.risk.__dict__,
+            "assets": self.assets,
+            "pii_findings": self.pii_findings,
+            "misconfigurations": self.misconfigurations,
+            "column_findings": self.column_findings,
+            "pii_aggregates": self.pii_aggregates,
+            "errors": self.errors,
+            "cache_stats": self.cache_stats.__dict__,
+        }
+
+
+class ScanPipeline:
+    """One streaming scan over a set of providers.
+
+    Create it with :meth:`Scanner.stream`, then consume it once: call :meth:`run`
+    with a sink, or iterate it with ``for`` or ``async for``. :attr:`summary` is
+    available after the last batch. With a result cache configured, the classify
+    stage reuses the scanner's incremental analysis per batch (which plans and
+    samples only changed assets itself) and the sample stage passes batches through.
+
+    Unlike :meth:`Scanner.scan`, the pipeline keeps no inventory, lineage graph or
+    finding lists, so nothing is recorded in the scan history.
+    """
+
+    def __init__(
+        self,
+        scanner: "Scanner",
+        providers: Iterable[str],
+        progress: Optional[ProgressCallback] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Prepare a pipeline; stage threads start when consumption begins."""
+
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("batch_size and queue_size must be at least 1")
+        self.scanner = scanner
+        self.providers = _normalize_providers(providers)
+        self.progress = progress
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.summary: Optional[PipelineSummary] = None
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in range(4)]
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._failure: Optional[BaseException] = None
+        self._errors: Dict[str, str] = {}
+        self._samplers: Dict[str, Optional[ObjectSampler]] = {}
+        self._classified: Dict[str, int] = {}
+        self._tally = RiskTally()
+        self._totals = PipelineSummary(risk=RiskBreakdown(0, 0, 0))
+
+    def run(self, sink: BatchSink) -> PipelineSummary:
+        """Feed every batch to ``sink`` and return the summary."""
+
+        for batch in self:
+            sink(batch)
+        return self._totals
+
+    def __iter__(self) -> Iterator[ScanBatch]:
+        """Yield analyzed batches as they leave the evaluate stage."""
+
+        self._start()
+        try:
+            with metrics.track_scan(cancelled=(ScanCancelled, GeneratorExit)):
+                while True:
+                    batch = self._next_batch()
+                    if batch is None:
+                        return
+                    yield batch
+        finally:
+            self.close()
+
+    async def __aiter__(self) -> AsyncIterator[ScanBatch]:
+        """Async variant of iteration; waiting for a batch does not block the event loop."""
+
+        self._start()
+        try:
+            cancelled = (ScanCancelled, GeneratorExit, asyncio.CancelledError)
+            with metrics.track_scan(cancelled=cancelled):
+                while True:
+                    batch = await asyncio.to_thread(self._next_batch)
+                    if batch is None:
+                        return
+                    yield batch
+        finally:
+            await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        """Stop every stage and wait for the stage threads to exit."""
+
+        self._stop.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _start(self) -> None:
+        """Start the stage threads; a pipeline can be consumed only once."""
+
+        if self._threads:
+            raise RuntimeError("A scan pipeline can only be consumed once")
+        inbox, sampled, classified, evaluated = self._queues
+        stages = [
+            ("discover", self._discover, None, inbox),
+            ("sample", self._sample, inbox, sampled),
+            ("classify", self._classify, sampled, classified),
+            ("evaluate", self._evaluate, classified, evaluated),
+        ]
+        for name, work, source, target in stages:
+            thread = threading.Thread(
+                target=self._stage,
+                args=(work, source, target),
+                name=f"dspm-pipeline-{name}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_batch(self) -> Optional[ScanBatch]:
+        """Return the next evaluated batch, or ``None`` once the pipeline is drained."""
+
+        try:
+            item = self._get(self._queues[-1])
+        except _Stopped:
+            item = _DONE
+        if self._failure is not None:
+            raise self._failure
+        if item is _DONE:
+            self._finish()
+            return None
+        return item
+
+    def _finish(self) -> None:
+        """Freeze the totals into :attr:`summary`."""
+
+        totals = self._totals
+        totals.risk = self.scanner.risk_assessor.score(self._tally)
+        totals.errors = dict(self._errors)
+        self.summary = totals
+
+    def _stage(
+        self,
+        work: Callable[..., Any],
+        source: Optional[queue.Queue],
+        target: queue.Queue,
+    ) -> None:
+        """Run one stage until its input is exhausted or the pipeline stops."""
+
+        try:
+            if source is None:
+                for batch in work():
+                    self._put(target, batch)
+            else:
+                while True:
+                    batch = self._get(source)
+                    if batch is _DONE:
+                        break
+                    if batch.provider in self._errors:
+                        continue
+                    try:
+                        work(batch)
+                    except ScanCancelled:
+                        raise
+                    except Exception as exc:
+                        self._fail_provider(batch.provider, exc)
+                        continue
+                    self._put(target, batch)
+            self._put(target, _DONE)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            with self._lock:
+                self._failure = self._failure or exc
+            self._stop.set()
+
+    def _discover(self) -> Iterator[ScanBatch]:
+        """Page through each provider's assets in batches."""
+
+        for provider in self.providers:
+            if self.progress:
+                self.progress(provider, "started", 0)
+            discovered = 0
+            try:
+                assets = iter(
+                    metrics.timed_iter(self.scanner._scan_provider(provider), "discover", provider)
+                )
+                while True:
+                    chunk = list(islice(assets, self.batch_size))
+                    if not chunk:
+                        break
+                    discovered += len(chunk)
+                    metrics.ASSETS_PROCESSED.inc(provider, amount=len(chunk))
+                    if self.progress:
+                        self.progress(provider, "discovered", discovered)
+                    yield ScanBatch(provider=provider, assets=chunk)
+            except ScanCancelled:
+                raise
+            except Exception as exc:
+                self._fail_provider(provider, exc)
+
+    def _sampler(self, provider: str) -> Optional[ObjectSampler]:
+        """Return the provider's object sampler, building it on first use."""
+
+        if provider not in self._samplers:
+            self._samplers[provider] = self.scanner._sampler(provider)
+        return self._samplers[provider]
+
+    def _sample(self, batch: ScanBatch) -> None:
+        """Read the sampled byte ranges of a batch's objects."""
+
+        scanner = self.scanner
+        if scanner.sampling is None or scanner.result_cache is not None:
+            return
+        sampler = self._sampler(batch.provider)
+        if sampler is not None:
+            with metrics.timed("sample", batch.provider):
+                batch.samples = list(sampler.sample(batch.provider, batch.assets))
+
+    def _classify(self, batch: ScanBatch) -> None:
+        """Run PII classification, or cached incremental analysis, on a batch."""
+
+        scanner = self.scanner
+        if scanner.result_cache is not None:
+            outcome = scanner._analyze_incrementally(
+                batch.provider, batch.assets, scanner.result_cache, self._sampler(batch.provider)
+            )
+            batch.pii_findings = outcome.pii_findings
+            batch.misconfigurations = outcome.misconfigurations
+            batch.column_findings = outcome.column_findings
+            batch.pii_aggregates = outcome.pii_aggregates
+            batch.cache_stats = outcome.cache_stats
+            batch.analyzed = True
+            return
+        if batch.samples is not None:
+            classified = scanner._classify_samples(batch.provider, batch.samples)
+            batch.samples = None
+        else:
+            classified = scanner._classify(batch.provider, batch.assets, None)
+        batch.pii_findings, batch.column_findings, batch.pii_aggregates = classified
+
+    def _evaluate(self, batch: ScanBatch) -> None:
+        """Evaluate posture and fold the batch into the running totals."""
+
+        if not batch.analyzed:
+            batch.misconfigurations = self.scanner.misconfig_detector.evaluate_assets(
+                batch.provider, batch.assets
+            )
+        metrics.record_findings(
+            batch.pii_findings,
+            batch.misconfigurations,
+            batch.column_findings,
+            batch.pii_aggregates,
+        )
+        self._tally.add(
+            [*batch.pii_findings, *batch.pii_aggregates],
+            batch.misconfigurations,
+            batch.column_findings,
+        )
+        unknown = posture_errors(batch.assets)
+        if unknown:
+            with self._lock:
+                self._errors.update(unknown)
+        totals = self._totals
+        totals.assets += len(batch.assets)
+        totals.pii_findings += len(batch.pii_findings)
+        totals.misconfigurations += len(batch.misconfigurations)
+        totals.column_findings += len(batch.column_findings)
+        totals.pii_aggregates += len(batch.pii_aggregates)
+        totals.cache_stats += batch.cache_stats
+        classified = self._classified.get(batch.provider, 0) + len(batch.assets)
+        self._classified[batch.provider] = classified
+        if self.progress:
+            self.progress(batch.provider, "classified", classified)
+
+    def _fail_provider(self, provider: str, exc: Exception) -> None:
+        """Record a provider failure; its remaining batches are dropped."""
+
+        logger.error("Provider %s pipeline failed", provider, exc_info=exc)
+        with self._lock:
+            self._errors.setdefault(provider, f"{type(exc).__name__}: {exc}")
+
+    def _put(self, target: queue.Queue, item: Any) -> None:
+        """Block until ``target`` has room (backpressure) or the pipeline stops."""
+
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def _get(self, source: queue.Queue) -> Any:
+        """Block until ``source`` has an item or the pipeline stops."""
+
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        raise _Stopped()
@@ -0,0 +1,337 @@
+"""Cheap content routing that keeps binary and compressed payloads away from the regex engine."""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import math
+import struct
+import threading
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+SKIP = "skip"
+TEXT = "text"
+GZIP = "gzip"
+ZIP = "zip"
+
+PROBE_BYTES = 4096
+MAX_ENTROPY = 7.2
+MIN_PRINTABLE_RATIO = 0.85
+MAX_DECOMPRESSED_BYTES = 1024 * 1024
+
+# Bumped when routing decisions change for the same thresholds, so cached results
+# computed under the old rules are invalidated.
+ROUTING_VERSION = 2
+
+# Characters that do not occur in text: C0 controls other than common whitespace,
+# DEL, and the replacement character standing in for invalid UTF-8.
+_NON_TEXT = dict.fromkeys([*range(0, 9), 11, *range(14, 32), 127, 0xFFFD])
+
+MAGIC_NUMBERS: Tuple[Tuple[bytes, str, str], ...] = (
+    (b"\x1f\x8b", GZIP, "magic:gzip"),
+    (b"PK\x03\x04", ZIP, "magic:zip"),
+    (b"\x89PNG\r\n\x1a\n", SKIP, "magic:png"),
+    (b"\xff\xd8\xff", SKIP, "magic:jpeg"),
+    (b"GIF8", SKIP, "magic:gif"),
+    (b"%PDF-", SKIP, "magic:pdf"),
+    (b"7z\xbc\xaf\x27\x1c", SKIP, "magic:7z"),
+    (b"Rar!\x1a\x07", SKIP, "magic:rar"),
+    (b"BZh", SKIP, "magic:bzip2"),
+    (b"\xfd7zXZ\x00", SKIP, "magic:xz"),
+    (b"\x28\xb5\x2f\xfd", SKIP, "magic:zstd"),
+    (b"\x7fELF", SKIP, "magic:elf"),
+    (b"MZ", SKIP, "magic:pe"),
+    (b"PAR1", SKIP, "magic:parquet"),
+    (b"Obj\x01", SKIP, "magic:avro"),
+    (b"ORC", SKIP, "magic:orc"),
+)
+
+BINARY_EXTENSIONS = frozenset(
+    {
+        "png", "jpg", "jpeg", "gif", "bmp", "webp", "ico", "tif", "tiff", "heic",
+        "mp3", "mp4", "m4a", "mov", "avi", "mkv", "wav", "flac", "ogg", "webm",
+        "pdf", "7z", "rar", "bz2", "xz", "zst", "tgz", "exe", "dll", "so", "bin",
+        "class", "pyc", "parquet", "avro", "orc", "iso", "dmg", "woff", "woff2", "ttf",
+    }
+)  # fmt: skip
+TEXT_EXTENSIONS = frozenset(
+    {
+        "txt", "csv", "tsv", "json", "jsonl", "ndjson", "log", "md", "xml", "yaml",
+        "yml", "html", "htm", "sql", "ini", "cfg", "conf", "env", "eml",
+    }
+)  # fmt: skip
+COMPRESSED_EXTENSIONS = {"gz": GZIP, "zip": ZIP}
+COMPRESSED_TYPES = {
+    "application/gzip": GZIP,
+    "application/x-gzip": GZIP,
+    "application/zip": ZIP,
+    "application/x-zip-compressed": ZIP,
+}
+BINARY_TYPE_PREFIXES = ("image/", "video/", "audio/", "font/")
+TEXT_TYPES = {"application/json", "application/xml", "application/x-ndjson", "application/csv"}
+
+
+@dataclass(frozen=True)
+class Route:
+    """Routing decision for one payload and why it was taken."""
+
+    action: str
+    reason: str
+
+
+@dataclass
+class PrefilterStats:
+    """Counters describing what the pre-filter did with the bytes it saw."""
+
+    objects: Dict[str, int] = field(default_factory=dict)
+    skipped_bytes: Dict[str, int] = field(default_factory=dict)
+    scanned_bytes: int = 0
+    decompressed_bytes: int = 0
+
+
+def _extension(name: str) -> str:
+    """Return the lowercase extension of the last path segment of ``name``."""
+
+    leaf = name.rsplit("/", 1)[-1]
+    return leaf.rsplit(".", 1)[-1].lower() if "." in leaf else ""
+
+
+def shannon_entropy(data: bytes) -> float:
+    """Return the entropy of ``data`` in bits per byte (0-8)."""
+
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+def printable_ratio(data: bytes) -> float:
+    """Return the fraction of ``data``'s characters that are text, decoding it as UTF-8.
+
+    Invalid UTF-8 sequences and control characters count against the ratio. A
+    multi-byte character cut off at the end of ``data`` is ignored.
+    """
+
+    text = codecs.getincrementaldecoder("utf-8")(errors="replace").decode(data)
+    if not text:
+        return 1.0
+    return len(text.translate(_NON_TEXT)) / len(text)
+
+
+# Signatures made only of printable ASCII, such as "MZ" or "PAR1", also start
+# ordinary text, so they are trusted only when the payload does not read as text.
+_TEXTUAL_MAGIC = frozenset(
+    magic for magic, _, _ in MAGIC_NUMBERS if printable_ratio(magic) == 1.0
+)
+
+
+def _iter_zip_members(data: bytes, limit: int) -> Iterator[Tuple[str, bytes]]:
+    """Inflate members of a (possibly truncated) zip archive from its local headers.
+
+    Only the leading bytes of an archive are needed, so the head range of a sampled
+    object is enough. At most ``limit`` bytes are produced in total.
+    """
+
+    offset = 0
+    remaining = limit
+    while remaining > 0 and data.startswith(b"PK\x03\x04", offset) and len(data) >= offset + 30:
+        flags, method, size, name_length, extra_length = struct.unpack_from(
+            "<6xHH8xI4xHH", data, offset
+        )
+        name = data[offset + 30 : offset + 30 + name_length].decode("utf-8", errors="replace")
+        start = offset + 30 + name_length + extra_length
+        if method == 8:
+            inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            body = inflater.decompress(data[start:], remaining)
+            if not inflater.eof:
+                yield name, body
+                return
+            end = len(data) - len(inflater.unused_data)
+        elif method == 0 and not (flags & 0x08 and size == 0):
+            body = data[start : start + min(size, remaining)]
+            end = start + size
+        else:
+            return
+        remaining -= len(body)
+        yield name, body
+        offset = end
+        if flags & 0x08:
+            offset += 16 if data.startswith(b"PK\x07\x08", offset) else 12
+
+
+class ContentRouter:
+    """Route payloads to skip, scan as text, or decompress before scanning.
+
+    Decisions use, in order: magic bytes, the declared content type, the object
+    extension, and finally entropy and printable-ratio heuristics over the first
+    ``probe_bytes``. Magic bytes that are themselves printable ASCII only count
+    when the probe does not read as UTF-8 text. Counters of objects per route and
+    skipped bytes per reason accumulate in :attr:`stats` across scans.
+    """
+
+    def __init__(
+        self,
+        probe_bytes: int = PROBE_BYTES,
+        max_entropy: float = MAX_ENTROPY,
+        min_printable: float = MIN_PRINTABLE_RATIO,
+        max_decompressed: int = MAX_DECOMPRESSED_BYTES,
+    ) -> None:
+        """Create a router with the given heuristic thresholds."""
+
+        self.probe_bytes = probe_bytes
+        self.max_entropy = max_entropy
+        self.min_printable = min_printable
+        self.max_decompressed = max_decompressed
+        self._stats = PrefilterStats()
+        self._lock = threading.Lock()
+
+    def fingerprint(self) -> str:
+        """Hash of the thresholds, so changing them invalidates cached results."""
+
+        payload = json.dumps(
+            [
+                ROUTING_VERSION,
+                self.probe_bytes,
+                self.max_entropy,
+                self.min_printable,
+                self.max_decompressed,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> PrefilterStats:
+        """Return a snapshot of the routing counters."""
+
+        with self._lock:
+            return PrefilterStats(
+                objects=dict(self._stats.objects),
+                skipped_bytes=dict(self._stats.skipped_bytes),
+                scanned_bytes=self._stats.scanned_bytes,
+                decompressed_bytes=self._stats.decompressed_bytes,
+            )
+
+    def reset_stats(self) -> None:
+        """Zero the routing counters."""
+
+        with self._lock:
+            self._stats = PrefilterStats()
+
+    def route(self, name: str, head: bytes, content_type: Optional[str] = None) -> Route:
+        """Decide how to handle a payload from its name, leading bytes and content type."""
+
+        probe = head[: self.probe_bytes]
+        for magic, action, reason in MAGIC_NUMBERS:
+            if head.startswith(magic):
+                if magic in _TEXTUAL_MAGIC and printable_ratio(probe) >= self.min_printable:
+                    break
+                return Route(action, reason)
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        if media_type in COMPRESSED_TYPES:
+            return Route(COMPRESSED_TYPES[media_type], "content-type")
+        if media_type.startswith(BINARY_TYPE_PREFIXES):
+            return Route(SKIP, "content-type")
+        extension = _extension(name)
+        if extension in COMPRESSED_EXTENSIONS:
+            return Route(COMPRESSED_EXTENSIONS[extension], "extension")
+        if extension in BINARY_EXTENSIONS:
+            return Route(SKIP, "extension")
+        if printable_ratio(probe) < self.min_printable:
+            return Route(SKIP, "binary")
+        if len(probe) >= 256 and shannon_entropy(probe) > self.max_entropy:
+            return Route(SKIP, "entropy")
+        declared = media_type.startswith("text/") or media_type in TEXT_TYPES
+        if declared or extension in TEXT_EXTENSIONS:
+            return Route(TEXT, "declared")
+        return Route(TEXT, "sniffed")
+
+    def _count(self, route: Route, size: int) -> None:
+        with self._lock:
+            objects = self._stats.objects
+            objects[route.action] = objects.get(route.action, 0) + 1
+            if route.action == SKIP:
+                skipped = self._stats.skipped_bytes
+                skipped[route.reason] = skipped.get(route.reason, 0) + size
+            else:
+                self._stats.scanned_bytes += size
+
+    def _skip(self, reason: str, size: int) -> None:
+        with self._lock:
+            skipped = self._stats.skipped_bytes
+            skipped[reason] = skipped.get(reason, 0) + size
+
+    def _decompressed(self, size: int) -> None:
+        with self._lock:
+            self._stats.decompressed_bytes += size
+
+    def filter_text(self, name: str, content: str) -> Optional[str]:
+        """Return ``content`` if it should be scanned, or ``None`` to skip it."""
+
+        probe = content[: self.probe_bytes].encode("utf-8", errors="replace")
+        route = self.route(name, probe)
+        size = len(content)
+        if route.action != TEXT:
+            # Already-decoded text cannot be decompressed; treat archives as skipped.
+            route = Route(SKIP, route.reason)
+        self._count(route, size)
+        return content if route.action == TEXT else None
+
+    def texts(
+        self,
+        name: str,
+        segments: Tuple[bytes, ...],
+        content_type: Optional[str] = None,
+        encoding: str = "utf-8",
+        offsets: Optional[Sequence[int]] = None,
+    ) -> Iterator[Tuple[str, str, int]]:
+        """Yield ``(name, text, offset)`` for the parts of an object worth scanning.
+
+        ``segments[0]`` must start at offset 0. ``offsets`` gives each segment's
+        byte offset in the object; without it the segments are taken to run on
+        from each other. Compressed objects are inflated from the first range
+        only, up to ``max_decompressed`` bytes, and their other ranges are counted
+        as skipped. Inflated texts start at offset 0 of the decompressed member.
+        """
+
+        if not segments:
+            return
+        head = segments[0]
+        route = self.route(name, head, content_type)
+        total = sum(len(segment) for segment in segments)
+        self._count(route, total)
+        if route.action == SKIP:
+            return
+        if route.action == TEXT:
+            if offsets is None:
+                offsets = list(accumulate((len(segment) for segment in segments[:-1]), initial=0))
+            for segment, offset in zip(segments, offsets, strict=True):
+                yield name, segment.decode(encoding, errors="replace"), offset
+            return
+        self._skip("compressed-tail", total - len(head))
+        try:
+            if route.action == GZIP:
+                inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                # Route the payload by its inner name ("x.csv.gz" -> "x.csv") or content.
+                inner = name[:-3] if name.lower().endswith(".gz") else ""
+                members = iter([(inner, inflater.decompress(head, self.max_decompressed))])
+            else:
+                members = _iter_zip_members(head, self.max_decompressed)
+            for member, body in members:
+                self._decompressed(len(body))
+                member_route = self.route(member, body)
+                if member_route.action != TEXT:
+                    self._skip(f"archive-member:{member_route.reason}", len(body))
+                    continue
+                location = f"{name}!{member}" if route.action == ZIP else name
+                yield location, body.decode(encoding, errors="replace"), 0
+        except zlib.error as exc:
+            logger.debug("Could not decompress %s: %s", name, exc)
+            self._skip("corrupt", len(head))
@@ -0,0 +1,148 @@
+"""Registry of storage providers, imported lazily on first use.
+
+A provider is a storage scanner class that:
+
+* builds from ``cls()`` with no arguments over offline sample assets;
+* builds from ``cls.from_environment()`` as a live scanner, using the SDK's
+  default credentials or environment variables;
+* yields its assets from ``iter_assets()``;
+* returns an :class:`~dspm_engine.core.sampling.ObjectStore` from
+  ``object_store()`` for object sampling (live scanners only).
+
+The built-in providers are registered by import path, so a scan only imports
+the modules of the providers it uses. Other packages add providers through the
+``dspm_engine.providers`` entry-point group, for example::
+
+    [project.entry-points."dspm_engine.providers"]
+    oci = "dspm_oci.storage:OciStorageScanner"
+
+Entry points are only read when a name that is not built in is requested, or
+when the full list of names is needed.
+"""
+from __future__ import annotations
+
+import threading
+from importlib import import_module
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Protocol, Union
+
+from .models import StorageAsset
+from .sampling import ObjectStore
+
+ENTRY_POINT_GROUP = "dspm_engine.providers"
+BUILTIN_PROVIDERS = {
+    "aws": "dspm_engine.core.storage_aws:AwsStorageScanner",
+    "azure": "dspm_engine.core.storage_azure:AzureStorageScanner",
+    "gcp": "dspm_engine.core.storage_gcp:GcpStorageScanner",
+}
+
+
+class StorageProvider(Protocol):
+    """A provider scanner instance, built in sample or live mode."""
+
+    def iter_assets(self) -> Iterator[StorageAsset]: ...
+
+    def object_store(self) -> ObjectStore: ...
+
+
+# A provider class, or a "module:attribute" path that resolves to one.
+ProviderTarget = Union[str, Any]
+
+
+class ProviderRegistry:
+    """Maps provider names to scanner classes, importing each on first use."""
+
+    def __init__(
+        self,
+        builtins: Mapping[str, ProviderTarget] = BUILTIN_PROVIDERS,
+        group: Optional[str] = ENTRY_POINT_GROUP,
+    ) -> None:
+        """Create a registry seeded with ``builtins``.
+
+        Args:
+            builtins: Provider names mapped to classes or ``"module:Class"`` paths.
+            group: Entry-point group consulted for further providers; ``None``
+                disables entry points.
+        """
+
+        self._targets: Dict[str, ProviderTarget] = {
+            name.lower(): target for name, target in builtins.items()
+        }
+        self._loaded: Dict[str, Any] = {}
+        self._group = group
+        self._entry_points_read = group is None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: ProviderTarget) -> None:
+        """Register (or replace) a provider class or ``"module:Class"`` path."""
+
+        key = name.lower()
+        with self._lock:
+            self._targets[key] = target
+            self._loaded.pop(key, None)
+
+    def _read_entry_points(self) -> None:
+        """Add entry-point providers, without overriding registered names."""
+
+        if self._entry_points_read:
+            return
+        from importlib.metadata import entry_points
+
+        with self._lock:
+            for entry_point in entry_points(group=self._group):
+                self._targets.setdefault(entry_point.name.lower(), entry_point.value)
+            self._entry_points_read = True
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        if name.lower() not in self._targets:
+            self._read_entry_points()
+        return name.lower() in self._targets
+
+    def names(self) -> List[str]:
+        """Return every known provider name, sorted."""
+
+        self._read_entry_points()
+        return sorted(self._targets)
+
+    def load(self, name: str) -> Any:
+        """Return the scanner class for ``name``, importing it on first use."""
+
+        key = name.lower()
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+        if key not in self:
+            raise ValueError(f"Unsupported provider: {name}")
+        target = self._targets[key]
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            loaded = import_module(module_name)
+            for part in attribute.split(".") if attribute else ():
+                loaded = getattr(loaded, part)
+        else:
+            loaded = target
+        with self._lock:
+            self._loaded[key] = loaded
+        return loaded
+
+
+PROVIDERS = ProviderRegistry()
+
+
+def register_provider(name: str, target: ProviderTarget) -> None:
+    """Make a provider scanner class available to scans as ``name``."""
+
+    PROVIDERS.register(name, target)
+
+
+def get_provider(name: str) -> Any:
+    """Return the scanner class registered as ``name``."""
+
+    return PROVIDERS.load(name)
+
+
+def provider_names() -> List[str]:
+    """Return the names of every registered provider, sorted."""
+
+    return PROVIDERS.names()
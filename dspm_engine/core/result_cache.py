@@ -0,0 +1,200 @@
+"""Persistent per-asset result cache for incremental re-scans."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .aggregation import PiiAggregate, mask_sample
+from .logging_utils import get_logger
+from .misconfig import MisconfigurationFinding
+from .models import StorageAsset
+from .pii_detector import ColumnFinding, PiiFinding
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS asset_results (
+    provider TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    pii_findings TEXT NOT NULL,
+    misconfigurations TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    column_findings TEXT NOT NULL DEFAULT '[]',
+    pii_aggregates TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (provider, asset)
+)
+"""
+
+# Columns added after the first release, migrated into older cache files on open.
+_ADDED_COLUMNS = {
+    "column_findings": "TEXT NOT NULL DEFAULT '[]'",
+    "pii_aggregates": "TEXT NOT NULL DEFAULT '[]'",
+}
+# Bumped when stored rows need rewriting; version 1 masks PII finding samples.
+_USER_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for cached asset analysis."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(hits=self.hits + other.hits, misses=self.misses + other.misses)
+
+
+@dataclass
+class CachedAnalysis:
+    """Findings previously computed for an unchanged asset."""
+
+    pii_findings: List[PiiFinding] = field(default_factory=list)
+    misconfigurations: List[MisconfigurationFinding] = field(default_factory=list)
+    column_findings: List[ColumnFinding] = field(default_factory=list)
+    pii_aggregates: List[PiiAggregate] = field(default_factory=list)
+
+
+def asset_fingerprint(asset: StorageAsset, ruleset: str) -> str:
+    """Hash the posture metadata, content identity and rule set for an asset.
+
+    Object identity comes from the ETag, size and modification time when discovery
+    provides them; otherwise the sampled content itself is hashed.
+    """
+
+    if asset.etag or asset.size is not None or asset.last_modified:
+        content = [asset.etag, asset.size, asset.last_modified]
+    else:
+        content = [hashlib.sha256((asset.sample_content or "").encode("utf-8")).hexdigest()]
+    payload = json.dumps(
+        [
+            ruleset,
+            asset.public,
+            asset.encryption,
+            asset.versioning,
+            asset.policy,
+            asset.region,
+            sorted(asset.tags.items()),
+            content,
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _masked_findings(findings: Iterable[PiiFinding]) -> str:
+    """Serialize PII findings with their samples masked."""
+
+    return json.dumps(
+        [dict(asdict(finding), sample=mask_sample(finding.sample)) for finding in findings]
+    )
+
+
+class ResultCache:
+    """SQLite-backed store of per-asset findings keyed by provider and asset name.
+
+    An entry is reused only when its stored fingerprint matches the current one, so
+    any change to the asset, its content or the detection rules invalidates it.
+    Matched values are never written to disk: PII finding samples are stored masked
+    with :func:`~dspm_engine.core.aggregation.mask_sample`. The scanner masks fresh
+    findings the same way, so cached scans report one representation on hits and
+    misses alike.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        """Open (and create if needed) the cache database at ``path``."""
+
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Overwrite replaced rows so earlier findings do not linger in free pages.
+        self._conn.execute("PRAGMA secure_delete = ON")
+        self._conn.execute(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(asset_results)")}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE asset_results ADD COLUMN {name} {definition}")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _USER_VERSION:
+            self._mask_stored_samples()
+            self._conn.execute(f"PRAGMA user_version = {_USER_VERSION}")
+        self._conn.commit()
+        self.stats = CacheStats()
+
+    def _mask_stored_samples(self) -> None:
+        """Mask the PII samples of rows written by releases that stored them raw."""
+
+        rows = self._conn.execute("SELECT rowid, pii_findings FROM asset_results").fetchall()
+        self._conn.executemany(
+            "UPDATE asset_results SET pii_findings = ? WHERE rowid = ?",
+            [
+                (_masked_findings(PiiFinding(**item) for item in json.loads(findings)), rowid)
+                for rowid, findings in rows
+            ],
+        )
+
+    def lookup(self, provider: str, asset: str, fingerprint: str) -> Optional[CachedAnalysis]:
+        """Return cached findings for an unchanged asset, counting the hit or miss."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, pii_findings, misconfigurations, column_findings, "
+                "pii_aggregates "
+                "FROM asset_results "
+                "WHERE provider = ? AND asset = ?",
+                (provider, asset),
+            ).fetchone()
+            if row is None or row[0] != fingerprint:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        return CachedAnalysis(
+            pii_findings=[PiiFinding(**item) for item in json.loads(row[1])],
+            misconfigurations=[MisconfigurationFinding(**item) for item in json.loads(row[2])],
+            column_findings=[ColumnFinding(**item) for item in json.loads(row[3])],
+            pii_aggregates=[PiiAggregate(**item) for item in json.loads(row[4])],
+        )
+
+    def store(self, provider: str, entries: Iterable[Tuple[str, str, CachedAnalysis]]) -> None:
+        """Record ``(asset, fingerprint, analysis)`` entries in a single transaction."""
+
+        now = time.time()
+        rows = [
+            (
+                provider,
+                asset,
+                fingerprint,
+                _masked_findings(analysis.pii_findings),
+                json.dumps([asdict(finding) for finding in analysis.misconfigurations]),
+                now,
+                json.dumps([asdict(finding) for finding in analysis.column_findings]),
+                json.dumps([asdict(aggregate) for aggregate in analysis.pii_aggregates]),
+            )
+            for asset, fingerprint, analysis in entries
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO asset_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+
+        with self._lock:
+            self._conn.execute("DELETE FROM asset_results")
+            self._conn.commit()
+        logger.info("Cleared result cache at %s", self.path)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        with self._lock:
+            self._conn.close()
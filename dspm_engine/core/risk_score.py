@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Sequence, Union
 
+from .aggregation import PiiAggregate
 from .misconfig import SEVERITY_ORDER, MisconfigurationFinding
-from .pii_detector import PiiFinding
+from .pii_detector import ColumnFinding, PiiFinding
+
+_SEVERITY_WEIGHTS = {value: (index + 1) * 10 for index, value in enumerate(SEVERITY_ORDER)}
 
 
 @dataclass
@@ -17,26 +20,61 @@ class RiskBreakdown:
     data_score: int
 
 
+@dataclass
+class RiskTally:
+    """Running totals that risk is scored from, so findings can be discarded as counted."""
+
+    data_findings: int = 0
+    misconfiguration_weight: int = 0
+
+    def add(
+        self,
+        pii_findings: Sequence[Union[PiiFinding, PiiAggregate]] = (),
+        misconfigurations: Sequence[MisconfigurationFinding] = (),
+        column_findings: Sequence[ColumnFinding] = (),
+    ) -> "RiskTally":
+        """Count more findings into the tally.
+
+        An aggregate counts as many data findings as the matches it summarises;
+        each sensitive column counts as one, like a single PII match.
+        """
+
+        self.data_findings += sum(
+            finding.count if isinstance(finding, PiiAggregate) else 1 for finding in pii_findings
+        )
+        self.data_findings += len(column_findings)
+        self.misconfiguration_weight += sum(
+            _SEVERITY_WEIGHTS.get(finding.severity, 0) for finding in misconfigurations
+        )
+        return self
+
+
 class RiskAssessor:
     """Combine findings into a simple numeric risk score."""
 
     def calculate(
-        self, pii_findings: List[PiiFinding], misconfigurations: List[MisconfigurationFinding]
+        self,
+        pii_findings: Sequence[Union[PiiFinding, PiiAggregate]],
+        misconfigurations: List[MisconfigurationFinding],
+        column_findings: Optional[List[ColumnFinding]] = None,
     ) -> RiskBreakdown:
-        """Compute combined risk given PII and misconfiguration findings."""
+        """Compute combined risk given PII, misconfiguration and column findings.
+
+        ``pii_findings`` may mix individual matches with :class:`PiiAggregate` roll-ups;
+        see :meth:`RiskTally.add` for how each is counted, so both modes score the same.
+        """
+
+        return self.score(RiskTally().add(pii_findings, misconfigurations, column_findings or ()))
 
-        misconfig_score = self._score_misconfigurations(misconfigurations)
-        data_score = min(40, 10 + 5 * len(pii_findings)) if pii_findings else 0
+    def score(self, tally: RiskTally) -> RiskBreakdown:
+        """Turn accumulated totals into a capped risk breakdown."""
+
+        misconfig_score = min(60, tally.misconfiguration_weight)
+        data_findings = tally.data_findings
+        data_score = min(40, 10 + 5 * data_findings) if data_findings else 0
         total = min(100, misconfig_score + data_score)
         return RiskBreakdown(
             score=total,
             misconfiguration_score=misconfig_score,
             data_score=data_score,
         )
-
-    def _score_misconfigurations(self, misconfigurations: List[MisconfigurationFinding]) -> int:
-        """Translate misconfiguration severities into a capped score."""
-
-        severity_to_weight = {value: (index + 1) * 10 for index, value in enumerate(SEVERITY_ORDER)}
-        weight = sum(severity_to_weight.get(finding.severity, 0) for finding in misconfigurations)
-        return min(60, weight)
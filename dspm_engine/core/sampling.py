@@ -0,0 +1,439 @@
+"""Bounded object sampling between discovery and PII classification."""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import io
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import accumulate, islice
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from .discovery import DEFAULT_DISCOVERY_WORKERS, bounded_map
+from .logging_utils import get_logger
+from .models import StorageAsset
+
+logger = get_logger(__name__)
+
+SAMPLING_STRATEGIES = {"random", "newest", "stratified", "budget"}
+STRATIFY_KEYS = {"prefix", "extension"}
+SAMPLE_OBJECT_KEY = "sample.txt"
+
+
+@dataclass(slots=True)
+class ObjectRef:
+    """An object listed inside a bucket or container."""
+
+    key: str
+    size: int
+    last_modified: float = 0.0
+    etag: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class ObjectStore(Protocol):
+    """Lists the objects of an asset and reads byte ranges from them."""
+
+    def list_objects(self, asset: StorageAsset) -> Iterable[ObjectRef]: ...
+
+    def read_range(self, asset: StorageAsset, key: str, start: int, length: int) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    """How many objects to sample per asset and how much of each to read.
+
+    Attributes:
+        strategy: ``"random"`` (reservoir sample), ``"newest"`` (most recently
+            modified), ``"stratified"`` (reservoir per prefix or extension, merged
+            round-robin) or ``"budget"`` (listing order until ``max_bytes``).
+        max_objects: Objects sampled per asset.
+        head_bytes: Bytes read from the start of each object.
+        tail_bytes: Bytes read from the end of each object.
+        max_bytes: Byte budget per asset across all ranged reads.
+        max_seconds: Latency budget per asset; no reads start after it elapses.
+        max_listed: Objects enumerated per asset before listing stops.
+        stratify_by: ``"prefix"`` (first path segment) or ``"extension"``.
+        max_strata: Distinct strata tracked; later ones share a single overflow stratum.
+        seed: Seed combined with the asset name so repeated scans pick the same sample.
+    """
+
+    strategy: str = "random"
+    max_objects: int = 20
+    head_bytes: int = 4096
+    tail_bytes: int = 1024
+    max_bytes: int = 1024 * 1024
+    max_seconds: float = 30.0
+    max_listed: int = 100_000
+    stratify_by: str = "prefix"
+    max_strata: int = 64
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unsupported sampling strategy: {self.strategy}")
+        if self.stratify_by not in STRATIFY_KEYS:
+            raise ValueError(f"Unsupported stratification key: {self.stratify_by}")
+        if self.max_objects < 1 or self.max_bytes < 1 or self.max_listed < 1:
+            raise ValueError("max_objects, max_bytes and max_listed must be positive")
+        if self.head_bytes < 0 or self.tail_bytes < 0 or self.head_bytes + self.tail_bytes == 0:
+            raise ValueError("head_bytes and tail_bytes must be non-negative and not both zero")
+
+    def fingerprint(self) -> str:
+        """Hash of the policy, so policy changes invalidate cached results."""
+
+        payload = json.dumps(sorted(vars(self).items()))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def read_cost(self, ref: ObjectRef) -> int:
+        """Bytes that sampling ``ref`` will read."""
+
+        return min(ref.size, self.head_bytes + self.tail_bytes)
+
+    def ranges(self, ref: ObjectRef) -> List[Tuple[int, int]]:
+        """Return the ``(start, length)`` ranges read from ``ref``."""
+
+        if ref.size <= self.head_bytes + self.tail_bytes:
+            return [(0, ref.size)] if ref.size else []
+        ranges = [(0, self.head_bytes)] if self.head_bytes else []
+        if self.tail_bytes:
+            ranges.append((ref.size - self.tail_bytes, self.tail_bytes))
+        return ranges
+
+
+@dataclass
+class SampleStats:
+    """Counters for one asset's sampling run."""
+
+    listed: int = 0
+    sampled: int = 0
+    bytes_read: int = 0
+    seconds: float = 0.0
+    truncated: Optional[str] = None
+
+
+@dataclass
+class SamplePlan:
+    """Objects chosen for an asset before any content is read."""
+
+    asset: StorageAsset
+    objects: List[ObjectRef]
+    stats: SampleStats = field(default_factory=SampleStats)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the chosen objects' identities, used to key cached results."""
+
+        payload = json.dumps(
+            [[ref.key, ref.size, ref.last_modified, ref.etag] for ref in self.objects]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ObjectSample:
+    """Byte ranges read from one sampled object."""
+
+    location: str
+    segments: List[bytes]
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    # Opens the whole object for random access through ranged reads (e.g. Parquet).
+    source: Optional[Callable[[], BinaryIO]] = None
+    # Byte offset of each segment in the object; None when the segments run on
+    # from each other starting at offset 0.
+    offsets: Optional[List[int]] = None
+
+    def segment_offsets(self) -> List[int]:
+        """Return the byte offset in the object at which each segment starts."""
+
+        if self.offsets is not None:
+            return list(self.offsets)
+        if not self.segments:
+            return []
+        return list(accumulate((len(segment) for segment in self.segments[:-1]), initial=0))
+
+    @property
+    def complete(self) -> bool:
+        """Whether the first segment holds the entire object."""
+
+        return self.size is not None and bool(self.segments) and len(self.segments[0]) >= self.size
+
+
+class ReadBudget:
+    """Bytes and time left for one asset's reads, shared by all of its ranged readers.
+
+    Every charge is added to ``stats.bytes_read``, so reads made after sampling
+    (such as Parquet footers) count against the same ``max_bytes`` as the head and
+    tail ranges.
+    """
+
+    def __init__(self, stats: SampleStats, max_bytes: int, deadline: float) -> None:
+        self.stats = stats
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self._lock = threading.Lock()
+
+    def charge(self, key: str, length: int) -> None:
+        """Reserve ``length`` bytes for a read of ``key``, or raise ``OSError``."""
+
+        with self._lock:
+            if time.perf_counter() >= self.deadline:
+                self.stats.truncated = "latency"
+                raise OSError(f"Latency budget exhausted before reading {key}")
+            if self.stats.bytes_read + length > self.max_bytes:
+                self.stats.truncated = "bytes"
+                raise OSError(f"Read budget of {self.max_bytes} bytes exhausted for {key}")
+            self.stats.bytes_read += length
+
+
+class RangedReader(io.RawIOBase):
+    """Seekable, read-only file over an object, fetched through ranged reads.
+
+    Each read is charged to the asset's :class:`ReadBudget` first, so formats that
+    seek to a footer (such as Parquet) only pull the parts they need and stop once
+    the asset's bytes or time run out.
+    """
+
+    def __init__(
+        self, store: ObjectStore, asset: StorageAsset, key: str, size: int, budget: ReadBudget
+    ) -> None:
+        self.store = store
+        self.asset = asset
+        self.key = key
+        self.size = size
+        self.budget = budget
+        self.bytes_read = 0
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self.size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer: bytearray) -> int:  # type: ignore[override]
+        length = min(len(buffer), self.size - self._position)
+        if length <= 0:
+            return 0
+        self.budget.charge(self.key, length)
+        data = self.store.read_range(self.asset, self.key, self._position, length)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def _stratum(key: str, stratify_by: str) -> str:
+    """Return the prefix or extension stratum of an object key."""
+
+    if stratify_by == "prefix":
+        return key.split("/", 1)[0] if "/" in key else ""
+    name = key.rsplit("/", 1)[-1]
+    return name.rsplit(".", 1)[-1].lower() if "." in name else ""
+
+
+def _reservoir(refs: Iterable[ObjectRef], size: int, rng: random.Random) -> List[ObjectRef]:
+    """Uniformly sample ``size`` refs in one pass (Algorithm R)."""
+
+    chosen: List[ObjectRef] = []
+    for seen, ref in enumerate(refs):
+        if seen < size:
+            chosen.append(ref)
+            continue
+        slot = rng.randrange(seen + 1)
+        if slot < size:
+            chosen[slot] = ref
+    return chosen
+
+
+def select_objects(
+    refs: Iterable[ObjectRef], policy: SamplingPolicy, rng: random.Random
+) -> List[ObjectRef]:
+    """Choose objects to sample from a listing, using memory bounded by the policy."""
+
+    candidates = (ref for ref in refs if ref.size > 0)
+    if policy.strategy == "random":
+        chosen = _reservoir(candidates, policy.max_objects, rng)
+    elif policy.strategy == "newest":
+        chosen = heapq.nlargest(policy.max_objects, candidates, key=lambda ref: ref.last_modified)
+    elif policy.strategy == "stratified":
+        strata: Dict[str, List[ObjectRef]] = {}
+        seen: Dict[str, int] = {}
+        for ref in candidates:
+            name = _stratum(ref.key, policy.stratify_by)
+            if name not in strata and len(strata) >= policy.max_strata:
+                name = "\0overflow"
+            bucket = strata.setdefault(name, [])
+            count = seen[name] = seen.get(name, 0) + 1
+            if len(bucket) < policy.max_objects:
+                bucket.append(ref)
+            else:
+                slot = rng.randrange(count)
+                if slot < policy.max_objects:
+                    bucket[slot] = ref
+        for bucket in strata.values():
+            rng.shuffle(bucket)
+        chosen = []
+        queues = [iter(strata[name]) for name in sorted(strata)]
+        while queues and len(chosen) < policy.max_objects:
+            for queue in list(queues):
+                ref = next(queue, None)
+                if ref is None:
+                    queues.remove(queue)
+                elif len(chosen) < policy.max_objects:
+                    chosen.append(ref)
+    else:
+        chosen, spent = [], 0
+        for ref in candidates:
+            if spent + policy.read_cost(ref) > policy.max_bytes:
+                continue
+            chosen.append(ref)
+            spent += policy.read_cost(ref)
+            if len(chosen) == policy.max_objects or spent == policy.max_bytes:
+                break
+    budgeted, spent = [], 0
+    for ref in chosen:
+        cost = policy.read_cost(ref)
+        if spent + cost <= policy.max_bytes:
+            budgeted.append(ref)
+            spent += cost
+    return budgeted
+
+
+class AssetSampleStore:
+    """Serves each asset's ``sample_content`` as a single ``sample.txt`` object.
+
+    Used with offline sample discovery, where no object store is reachable.
+    """
+
+    def list_objects(self, asset: StorageAsset) -> Iterator[ObjectRef]:
+        if asset.sample_content:
+            size = len(asset.sample_content.encode("utf-8"))
+            yield ObjectRef(key=SAMPLE_OBJECT_KEY, size=size, etag=asset.etag)
+
+    def read_range(self, asset: StorageAsset, key: str, start: int, length: int) -> bytes:
+        if key != SAMPLE_OBJECT_KEY or not asset.sample_content:
+            raise KeyError(key)
+        return asset.sample_content.encode("utf-8")[start : start + length]
+
+
+class ObjectSampler:
+    """Plan and read bounded object samples for assets.
+
+    :meth:`plan` lists an asset's objects and selects a sample without reading any
+    content. :meth:`read` fetches only the head and tail byte ranges of the chosen
+    objects, concurrently over the store's shared client, stopping once the
+    asset's latency budget is spent.
+    """
+
+    def __init__(
+        self,
+        store: ObjectStore,
+        policy: Optional[SamplingPolicy] = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+    ) -> None:
+        """Create a sampler reading from ``store``."""
+
+        self.store = store
+        self.policy = policy or SamplingPolicy()
+        self.max_workers = max_workers
+
+    def plan(self, provider: str, asset: StorageAsset) -> SamplePlan:
+        """List ``asset`` and choose the objects to sample."""
+
+        policy = self.policy
+        stats = SampleStats()
+        started = time.perf_counter()
+
+        def listed() -> Iterator[ObjectRef]:
+            for ref in islice(self.store.list_objects(asset), policy.max_listed):
+                stats.listed += 1
+                yield ref
+
+        rng = random.Random(f"{policy.seed}:{provider}:{asset.name}")
+        objects = select_objects(listed(), policy, rng)
+        if stats.listed == policy.max_listed:
+            stats.truncated = "listing"
+        stats.seconds = time.perf_counter() - started
+        return SamplePlan(asset=asset, objects=objects, stats=stats)
+
+    def open(
+        self, asset: StorageAsset, ref: ObjectRef, budget: Optional[ReadBudget] = None
+    ) -> BinaryIO:
+        """Open an object for buffered random access within the asset's read budget.
+
+        Without ``budget``, the object gets a fresh budget of ``max_bytes`` and
+        ``max_seconds``.
+        """
+
+        if budget is None:
+            deadline = time.perf_counter() + self.policy.max_seconds
+            budget = ReadBudget(SampleStats(), self.policy.max_bytes, deadline)
+        raw = RangedReader(self.store, asset, ref.key, ref.size, budget)
+        return io.BufferedReader(raw, buffer_size=64 * 1024)  # type: ignore[return-value]
+
+    def read(self, provider: str, plan: SamplePlan) -> List[ObjectSample]:
+        """Fetch the byte ranges of a plan's objects within the latency budget.
+
+        Each sample's ``source`` draws on what is left of the plan's byte and
+        latency budgets, and adds what it reads to ``plan.stats.bytes_read``.
+        """
+
+        policy = self.policy
+        deadline = time.perf_counter() + max(0.0, policy.max_seconds - plan.stats.seconds)
+        asset = plan.asset
+        budget = ReadBudget(plan.stats, policy.max_bytes, deadline)
+
+        def fetch(ref: ObjectRef) -> Optional[ObjectSample]:
+            if time.perf_counter() >= deadline:
+                return None
+            ranges = policy.ranges(ref)
+            segments = [
+                self.store.read_range(asset, ref.key, start, length) for start, length in ranges
+            ]
+            return ObjectSample(
+                location=f"{provider}://{asset.name}/{ref.key}",
+                segments=segments,
+                content_type=ref.content_type,
+                size=ref.size,
+                source=partial(self.open, asset, ref, budget),
+                offsets=[start for start, _ in ranges],
+            )
+
+        started = time.perf_counter()
+        samples: List[ObjectSample] = []
+        for sample in bounded_map(fetch, plan.objects, self.max_workers):
+            if sample is None:
+                plan.stats.truncated = "latency"
+                continue
+            samples.append(sample)
+            plan.stats.sampled += 1
+            plan.stats.bytes_read += sum(len(segment) for segment in sample.segments)
+        plan.stats.seconds += time.perf_counter() - started
+        if plan.stats.truncated:
+            logger.info(
+                "Sampling of %s://%s truncated by %s budget",
+                provider,
+                asset.name,
+                plan.stats.truncated,
+            )
+        return samples
+
+    def sample(self, provider: str, assets: Iterable[StorageAsset]) -> Iterator[ObjectSample]:
+        """Plan and read samples for every asset."""
+
+        for asset in assets:
+            yield from self.read(provider, self.plan(provider, asset))
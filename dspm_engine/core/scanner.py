@@ -1,32 +1,164 @@
 """Orchestration layer for DSPM scans."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from . import metrics
+from .aggregation import PiiAggregate, mask_sample
 from .lineage import LineageGraph
 from .logging_utils import get_logger
 from .misconfig import MisconfigurationDetector, MisconfigurationFinding
-from .models import AssetInventory, StorageAsset
-from .pii_detector import PiiDetector, PiiFinding
+from .models import AssetInventory, StorageAsset, posture_errors
+from .pii_detector import ColumnFinding, PiiDetector, PiiFinding
+from .pii_parallel import ProcessPoolPiiDetector
+from .prefilter import ContentRouter
+from .providers import PROVIDERS, StorageProvider, get_provider
+from .result_cache import CachedAnalysis, CacheStats, ResultCache, asset_fingerprint
 from .risk_score import RiskAssessor, RiskBreakdown
-from .storage_aws import AwsStorageScanner
-from .storage_azure import AzureStorageScanner
-from .storage_gcp import GcpStorageScanner
+from .sampling import (
+    AssetSampleStore,
+    ObjectSample,
+    ObjectSampler,
+    SamplePlan,
+    SamplingPolicy,
+)
+from .shards import Shard, ShardGroup, ShardStatus, ShardTimeout, load_shards
+from .structured import TabularClassifier
+
+if TYPE_CHECKING:
+    from .history import ScanHistory
+    from .pipeline import ScanPipeline
 
 logger = get_logger(__name__)
-SUPPORTED_PROVIDERS = {"aws", "azure", "gcp"}
+PII_BACKENDS = {"inline", "process"}
+LINEAGE_MODES = {"per_scan", "incremental"}
+DISCOVERY_MODES = {"sample", "live"}
+# Longest a sharded scan waits before checking shards against their timeouts.
+SHARD_POLL_SECONDS = 0.1
+
+# Called with (provider, stage, asset_count) as each provider moves through the
+# "started", "discovered" and "classified" stages. Raising ScanCancelled aborts the scan.
+ProgressCallback = Callable[[str, str, int], None]
+# Per-match findings, column findings and per-location aggregates from one classification.
+Classified = Tuple[List[PiiFinding], List[ColumnFinding], List[PiiAggregate]]
+
+
+def _asset_name(provider: str, location: str) -> str:
+    """Return the asset (bucket or container) name in a ``provider://asset/key`` location."""
+
+    return location[len(provider) + 3 :].split("/", 1)[0]
+
+
+def _normalize_providers(providers: Iterable[str]) -> List[str]:
+    """Lower-case and de-duplicate providers in order, rejecting unsupported ones."""
+
+    ordered = list(dict.fromkeys(provider.lower() for provider in providers))
+    unsupported = [provider for provider in ordered if provider not in PROVIDERS]
+    if unsupported:
+        raise ValueError(f"Unsupported providers requested: {sorted(unsupported)}")
+    return ordered
+
+
+class ScanCancelled(Exception):
+    """Raised from a progress callback to stop a scan at the next checkpoint."""
 
 
 @dataclass
 class ScanResult:
-    """Aggregated results from a DSPM scan."""
+    """Aggregated results from a DSPM scan.
+
+    ``errors`` is keyed by failed provider or shard, and by ``provider/asset`` for
+    assets whose posture could not be fully read (see
+    :attr:`~dspm_engine.core.models.StorageAsset.posture_unknown`).
+    """
 
     assets: AssetInventory
     pii_findings: List[PiiFinding]
     misconfigurations: List[MisconfigurationFinding]
     lineage: LineageGraph
     risk: RiskBreakdown
+    errors: Dict[str, str] = field(default_factory=dict)
+    cache_stats: CacheStats = field(default_factory=CacheStats)
+    column_findings: List[ColumnFinding] = field(default_factory=list)
+    pii_aggregates: List[PiiAggregate] = field(default_factory=list)
+    shards: List[ShardStatus] = field(default_factory=list)
+
+
+@dataclass
+class ProviderScan:
+    """Assets and findings collected for a single provider."""
+
+    provider: str
+    assets: List[StorageAsset]
+    misconfigurations: List[MisconfigurationFinding]
+    pii_findings: List[PiiFinding]
+    cache_stats: CacheStats = field(default_factory=CacheStats)
+    column_findings: List[ColumnFinding] = field(default_factory=list)
+    pii_aggregates: List[PiiAggregate] = field(default_factory=list)
+
+
+@dataclass
+class _ShardRun:
+    """A shard in flight: its timeout, stop flag and timing."""
+
+    shard: Shard
+    timeout: float
+    stop: threading.Event = field(default_factory=threading.Event)
+    started: Optional[float] = None
+    seconds: float = 0.0
+
+    def check(self) -> None:
+        """Raise :class:`ShardTimeout` once the scan has given up on this shard."""
+
+        if self.stop.is_set():
+            raise ShardTimeout(f"{self.shard.key} timed out after {self.timeout:g}s")
+
+
+def _combine_shards(
+    provider: str, scans: List[Tuple[Optional[str], ProviderScan]]
+) -> ProviderScan:
+    """Merge a provider's shard outcomes, keeping each asset and its findings once.
+
+    Asset names are unique within one account of a provider (Azure container
+    names, for example, repeat across storage accounts), and offline sample
+    discovery returns the same assets for every shard. ``scans`` pairs each shard
+    outcome with its account, and an asset already merged from an earlier shard
+    of the same account is dropped together with its findings.
+    """
+
+    combined = ProviderScan(provider=provider, assets=[], misconfigurations=[], pii_findings=[])
+    seen: Dict[Optional[str], Set[str]] = {}
+    for account, scan in scans:
+        merged_names = seen.setdefault(account, set())
+        fresh = {asset.name for asset in scan.assets} - merged_names
+        combined.assets.extend(asset for asset in scan.assets if asset.name in fresh)
+        combined.misconfigurations.extend(
+            finding for finding in scan.misconfigurations if finding.resource in fresh
+        )
+        for merged, items in (
+            (combined.pii_findings, scan.pii_findings),
+            (combined.column_findings, scan.column_findings),
+            (combined.pii_aggregates, scan.pii_aggregates),
+        ):
+            merged.extend(item for item in items if _asset_name(provider, item.location) in fresh)
+        combined.cache_stats += scan.cache_stats
+        merged_names |= fresh
+    return combined
 
 
 class Scanner:
@@ -37,54 +169,620 @@ class Scanner:
         pii_detector: Optional[PiiDetector] = None,
         misconfig_detector: Optional[MisconfigurationDetector] = None,
         risk_assessor: Optional[RiskAssessor] = None,
+        max_workers: int = 1,
+        pii_backend: str = "inline",
+        pii_workers: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
+        lineage_mode: str = "per_scan",
+        discovery: str = "sample",
+        sampling: Optional[SamplingPolicy] = None,
+        prefilter: Optional[ContentRouter] = None,
+        tabular: Optional[TabularClassifier] = None,
+        aggregate_pii: bool = False,
+        history: Optional[ScanHistory] = None,
     ) -> None:
-        """Create a scanner with optional dependency overrides."""
+        """Create a scanner with optional dependency overrides.
+
+        Args:
+            pii_detector: Detector used to classify sampled content.
+            misconfig_detector: Detector used to evaluate asset posture.
+            risk_assessor: Scorer that blends findings into a risk breakdown.
+            max_workers: Number of providers scanned concurrently; ``1`` scans serially.
+            pii_backend: ``"inline"`` classifies content on the scanning thread;
+                ``"process"`` shards classification across a process pool.
+            pii_workers: Process count for the ``"process"`` backend (CPU count if unset).
+            result_cache: Optional persistent cache; unchanged assets reuse their
+                previous findings instead of being reclassified.
+            lineage_mode: ``"per_scan"`` builds a fresh lineage graph for every scan;
+                ``"incremental"`` keeps one graph and updates each scanned provider in
+                place, removing assets that disappeared since the previous scan.
+            discovery: ``"sample"`` uses the bundled offline sample assets; ``"live"``
+                pages through the provider APIs using the SDKs' default credentials
+                (``AZURE_STORAGE_CONNECTION_STRING`` for Azure).
+            sampling: When set, PII classification reads a bounded sample of each
+                asset's objects (head and tail byte ranges) instead of the single
+                ``sample_content`` string. Offline sample assets expose their
+                ``sample_content`` as one ``sample.txt`` object.
+            prefilter: Content router installed on the PII detector so binary
+                objects are skipped and gzip/zip objects inflated before the regex
+                engine runs. Its counters accumulate across scans.
+            tabular: With sampling enabled, classify sampled CSV, JSON Lines and
+                Parquet objects per column, reported in
+                :attr:`ScanResult.column_findings` instead of one PII finding per match.
+            aggregate_pii: Roll text matches up per (provider, location, rule) into
+                :attr:`ScanResult.pii_aggregates`, keeping counts, offsets and a few
+                masked examples, instead of one PII finding per match.
+            history: Optional scan history; every completed scan is recorded in it
+                for later diffs and risk trends.
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if pii_backend not in PII_BACKENDS:
+            raise ValueError(f"Unsupported PII backend: {pii_backend}")
+        if lineage_mode not in LINEAGE_MODES:
+            raise ValueError(f"Unsupported lineage mode: {lineage_mode}")
+        if discovery not in DISCOVERY_MODES:
+            raise ValueError(f"Unsupported discovery mode: {discovery}")
 
         self.pii_detector = pii_detector or PiiDetector.from_default_rules()
+        if prefilter is not None:
+            self.pii_detector.prefilter = prefilter
+        if pii_backend == "process" and not isinstance(
+            self.pii_detector, ProcessPoolPiiDetector
+        ):
+            self.pii_detector = ProcessPoolPiiDetector.from_detector(
+                self.pii_detector, max_workers=pii_workers
+            )
         self.misconfig_detector = misconfig_detector or MisconfigurationDetector()
         self.risk_assessor = risk_assessor or RiskAssessor()
+        self.lineage_mode = lineage_mode
         self.lineage_graph = LineageGraph()
+        self._lineage_lock = threading.Lock()
+        self.max_workers = max_workers
+        self.result_cache = result_cache
+        self.discovery = discovery
+        self.sampling = sampling
+        self.tabular = tabular
+        self.aggregate_pii = aggregate_pii
+        self.history = history
+
+    def close(self) -> None:
+        """Release worker pools held by the configured detectors."""
+
+        if isinstance(self.pii_detector, ProcessPoolPiiDetector):
+            self.pii_detector.close()
+        if self.result_cache is not None:
+            self.result_cache.close()
+        if self.history is not None:
+            self.history.close()
 
     def _scan_provider(self, provider: str) -> Iterable[StorageAsset]:
-        """Route provider-specific discovery to the correct scanner."""
+        """Discover a provider's assets through its registered scanner."""
 
-        if provider == "aws":
-            return AwsStorageScanner().list_buckets()
-        if provider == "azure":
-            return AzureStorageScanner().list_containers()
-        if provider == "gcp":
-            return GcpStorageScanner().list_buckets()
-        raise ValueError(f"Unsupported provider: {provider}")
+        if self.discovery == "live":
+            return self._live_scanner(provider).iter_assets()
+        return get_provider(provider)().iter_assets()
 
-    def scan(self, providers: Iterable[str]) -> ScanResult:
-        """Run DSPM scans across the given providers."""
+    def _live_scanner(self, provider: str) -> StorageProvider:
+        """Connect a provider scanner to its cloud API."""
 
-        provider_set = {provider.lower() for provider in providers}
-        unsupported = provider_set - SUPPORTED_PROVIDERS
-        if unsupported:
-            raise ValueError(f"Unsupported providers requested: {sorted(unsupported)}")
+        return get_provider(provider).from_environment()
 
-        assets = AssetInventory()
-        pii_findings: List[PiiFinding] = []
-        misconfigurations: List[MisconfigurationFinding] = []
+    def _sampler(
+        self, provider: str, source: Optional[StorageProvider] = None
+    ) -> Optional[ObjectSampler]:
+        """Build the object sampler for a provider, if sampling is enabled.
+
+        In live mode objects are read through ``source``, or through a newly
+        connected scanner for the provider.
+        """
+
+        if self.sampling is None:
+            return None
+        if self.discovery == "live":
+            store = (source or self._live_scanner(provider)).object_store()
+        else:
+            store = AssetSampleStore()
+        return ObjectSampler(store, self.sampling)
+
+    def _classify(
+        self, provider: str, assets: List[StorageAsset], sampler: Optional[ObjectSampler]
+    ) -> Classified:
+        """Run PII detection over sampled objects, or over each asset's sample content."""
+
+        if sampler is None:
+            if self.aggregate_pii:
+                return [], [], self.pii_detector.aggregate_content_samples(provider, assets)
+            return self.pii_detector.scan_content_samples(provider, assets), [], []
+        samples = metrics.timed_iter(sampler.sample(provider, assets), "sample", provider)
+        return self._classify_samples(provider, samples)
+
+    def _classify_samples(self, provider: str, samples: Iterable[ObjectSample]) -> Classified:
+        """Classify tabular samples per column and scan the rest as text."""
+
+        tabular = self.tabular
+        columns: List[ColumnFinding] = []
 
-        for provider in providers:
-            logger.info("Scanning provider %s", provider)
+        def text_samples() -> Iterator[ObjectSample]:
+            for sample in samples:
+                if tabular.accepts(sample):
+                    columns.extend(tabular.scan_sample(self.pii_detector, provider, sample))
+                else:
+                    yield sample
+
+        texts = samples if tabular is None else text_samples()
+        if self.aggregate_pii:
+            return [], columns, self.pii_detector.aggregate_object_samples(provider, texts)
+        return self.pii_detector.scan_object_samples(provider, texts), columns, []
+
+    def _analyze_provider(
+        self, provider: str, progress: Optional[ProgressCallback] = None
+    ) -> ProviderScan:
+        """Discover a provider's assets and run posture and PII analysis on them."""
+
+        logger.info("Scanning provider %s", provider)
+        if progress:
+            progress(provider, "started", 0)
+        with metrics.timed("discover", provider):
             discovered_assets = list(self._scan_provider(provider))
-            assets.add(discovered_assets)
-            misconfigurations.extend(
-                self.misconfig_detector.evaluate_assets(provider, discovered_assets)
+        metrics.ASSETS_PROCESSED.inc(provider, amount=len(discovered_assets))
+        if progress:
+            progress(provider, "discovered", len(discovered_assets))
+        outcome = self._analyze_assets(provider, discovered_assets, self._sampler(provider))
+        if progress:
+            progress(provider, "classified", len(discovered_assets))
+        return outcome
+
+    def _analyze_assets(
+        self,
+        provider: str,
+        assets: List[StorageAsset],
+        sampler: Optional[ObjectSampler],
+        account: Optional[str] = None,
+    ) -> ProviderScan:
+        """Run posture and PII analysis on discovered assets, through the cache if set."""
+
+        if self.result_cache is not None:
+            return self._analyze_incrementally(
+                provider, assets, self.result_cache, sampler, account
+            )
+        pii_findings, column_findings, pii_aggregates = self._classify(provider, assets, sampler)
+        return ProviderScan(
+            provider=provider,
+            assets=assets,
+            misconfigurations=self.misconfig_detector.evaluate_assets(provider, assets),
+            pii_findings=pii_findings,
+            column_findings=column_findings,
+            pii_aggregates=pii_aggregates,
+        )
+
+    def _ruleset_fingerprint(self) -> str:
+        """Combine detector fingerprints so rule changes invalidate cached results."""
+
+        fingerprint = f"{self.pii_detector.fingerprint()}:{self.misconfig_detector.fingerprint()}"
+        if self.sampling is not None:
+            fingerprint += f":{self.sampling.fingerprint()}"
+            if self.tabular is not None:
+                fingerprint += f":{self.tabular.fingerprint()}"
+        if self.aggregate_pii:
+            fingerprint += ":aggregate"
+        return fingerprint
+
+    def _analyze_incrementally(
+        self,
+        provider: str,
+        assets: List[StorageAsset],
+        cache: ResultCache,
+        sampler: Optional[ObjectSampler],
+        account: Optional[str] = None,
+    ) -> ProviderScan:
+        """Reuse cached findings for unchanged assets and analyze only the rest.
+
+        With sampling enabled, each asset's sample is planned first (listing only)
+        and its object identities are folded into the fingerprint, so only assets
+        whose sampled objects changed have their byte ranges read. Assets of a
+        shard ``account`` are cached as ``account/name``, because names such as
+        Azure containers are only unique within one account.
+        Fresh PII samples are masked as the cache stores them, so a hit and a
+        miss on the same object report the same finding.
+        """
+
+        ruleset = self._ruleset_fingerprint()
+        stats = CacheStats()
+        plans: List[Optional[SamplePlan]] = [
+            sampler.plan(provider, asset) if sampler else None for asset in assets
+        ]
+        fingerprints = [
+            asset_fingerprint(asset, f"{ruleset}:{plan.digest}" if plan else ruleset)
+            for asset, plan in zip(assets, plans, strict=True)
+        ]
+        keys = [f"{account}/{asset.name}" if account else asset.name for asset in assets]
+        cached: Dict[int, CachedAnalysis] = {}
+        for index, (key, fingerprint) in enumerate(zip(keys, fingerprints, strict=True)):
+            hit = cache.lookup(provider, key, fingerprint)
+            if hit is None:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+                cached[index] = hit
+        metrics.CACHE_LOOKUPS.inc("hit", amount=stats.hits)
+        metrics.CACHE_LOOKUPS.inc("miss", amount=stats.misses)
+
+        stale = [asset for index, asset in enumerate(assets) if index not in cached]
+        fresh_misconfigs: Dict[str, List[MisconfigurationFinding]] = {}
+        for finding in self.misconfig_detector.evaluate_assets(provider, stale):
+            fresh_misconfigs.setdefault(finding.resource, []).append(finding)
+        if sampler is None:
+            classified = self._classify(provider, stale, None)
+        else:
+            samples = (
+                sample
+                for index, plan in enumerate(plans)
+                if plan is not None and index not in cached
+                for sample in sampler.read(provider, plan)
             )
-            pii_findings.extend(
-                self.pii_detector.scan_content_samples(provider, discovered_assets)
+            classified = self._classify_samples(
+                provider, metrics.timed_iter(samples, "sample", provider)
             )
-            self.lineage_graph.add_provider_assets(provider, discovered_assets)
+        fresh_pii: Dict[str, List[PiiFinding]] = {}
+        fresh_columns: Dict[str, List[ColumnFinding]] = {}
+        fresh_aggregates: Dict[str, List[PiiAggregate]] = {}
+        for grouped, items in zip(
+            (fresh_pii, fresh_columns, fresh_aggregates), classified, strict=True
+        ):
+            for item in items:
+                grouped.setdefault(_asset_name(provider, item.location), []).append(item)
+
+        misconfigurations: List[MisconfigurationFinding] = []
+        pii_findings: List[PiiFinding] = []
+        column_findings: List[ColumnFinding] = []
+        pii_aggregates: List[PiiAggregate] = []
+        updates = []
+        for index, asset in enumerate(assets):
+            analysis = cached.get(index)
+            if analysis is None:
+                analysis = CachedAnalysis(
+                    pii_findings=[
+                        replace(finding, sample=mask_sample(finding.sample))
+                        for finding in fresh_pii.get(asset.name, [])
+                    ],
+                    misconfigurations=fresh_misconfigs.get(asset.name, []),
+                    column_findings=fresh_columns.get(asset.name, []),
+                    pii_aggregates=fresh_aggregates.get(asset.name, []),
+                )
+                updates.append((keys[index], fingerprints[index], analysis))
+            misconfigurations.extend(analysis.misconfigurations)
+            pii_findings.extend(analysis.pii_findings)
+            column_findings.extend(analysis.column_findings)
+            pii_aggregates.extend(analysis.pii_aggregates)
+        cache.store(provider, updates)
+        logger.info(
+            "Result cache for provider %s: %s hits, %s misses", provider, stats.hits, stats.misses
+        )
+        return ProviderScan(
+            provider=provider,
+            assets=assets,
+            misconfigurations=misconfigurations,
+            pii_findings=pii_findings,
+            cache_stats=stats,
+            column_findings=column_findings,
+            pii_aggregates=pii_aggregates,
+        )
+
+    def _run_providers(
+        self, providers: List[str], progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, ProviderScan | BaseException]:
+        """Scan providers serially or on a thread pool, capturing per-provider failures."""
+
+        outcomes: Dict[str, ProviderScan | BaseException] = {}
+        if self.max_workers == 1 or len(providers) < 2:
+            for provider in providers:
+                try:
+                    outcomes[provider] = self._analyze_provider(provider, progress)
+                except ScanCancelled:
+                    raise
+                except Exception as exc:
+                    outcomes[provider] = exc
+            return outcomes
 
-        risk = self.risk_assessor.calculate(pii_findings, misconfigurations)
+        workers = min(self.max_workers, len(providers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dspm-scan") as pool:
+            futures = {
+                provider: pool.submit(self._analyze_provider, provider, progress)
+                for provider in providers
+            }
+            for provider, future in futures.items():
+                try:
+                    outcomes[provider] = future.result()
+                except ScanCancelled:
+                    for pending in futures.values():
+                        pending.cancel()
+                    raise
+                except Exception as exc:
+                    outcomes[provider] = exc
+        return outcomes
+
+    def stream(
+        self,
+        providers: Iterable[str],
+        progress: Optional[ProgressCallback] = None,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ) -> ScanPipeline:
+        """Return a streaming pipeline over the providers instead of a full result.
+
+        Assets flow in batches through discover, sample, classify and evaluate stages
+        connected by bounded queues, and each batch reaches the caller as soon as it
+        is evaluated. See :class:`~dspm_engine.core.pipeline.ScanPipeline`.
+        """
+
+        from .pipeline import DEFAULT_BATCH_SIZE, DEFAULT_QUEUE_SIZE, ScanPipeline
+
+        return ScanPipeline(
+            self,
+            providers,
+            progress,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
+            queue_size=queue_size or DEFAULT_QUEUE_SIZE,
+        )
+
+    def scan(
+        self, providers: Iterable[str], progress: Optional[ProgressCallback] = None
+    ) -> ScanResult:
+        """Run DSPM scans across the given providers.
+
+        Providers are merged into the result in the order requested, whether they
+        were scanned serially or concurrently. A provider that fails is recorded in
+        :attr:`ScanResult.errors` and does not abort the remaining providers.
+
+        Args:
+            providers: Provider identifiers to scan.
+            progress: Optional callback notified as each provider is discovered and
+                classified; it may raise :class:`ScanCancelled` to abort the scan.
+        """
+
+        ordered = _normalize_providers(providers)
+        with metrics.track_scan(cancelled=(ScanCancelled,)):
+            result = self._scan(ordered, progress)
+            if self.history is not None:
+                self.history.record(result, ordered)
+        return result
+
+    def _scan(self, ordered: List[str], progress: Optional[ProgressCallback]) -> ScanResult:
+        """Scan normalized providers and merge their outcomes into one result."""
+
+        outcomes: List[ProviderScan] = []
+        errors: Dict[str, str] = {}
+        for provider, outcome in self._run_providers(ordered, progress).items():
+            if isinstance(outcome, BaseException):
+                logger.error("Provider %s scan failed", provider, exc_info=outcome)
+                errors[provider] = f"{type(outcome).__name__}: {outcome}"
+                continue
+            outcomes.append(outcome)
+        return self._merge(outcomes, errors)
+
+    def _merge(
+        self,
+        outcomes: List[ProviderScan],
+        errors: Dict[str, str],
+        partial: AbstractSet[str] = frozenset(),
+    ) -> ScanResult:
+        """Merge provider outcomes, in order, into one scored result.
+
+        Providers in ``partial`` were only partly scanned, so in incremental
+        lineage mode their assets are added to the graph without removing the
+        ones that were not seen this time.
+        """
+
+        assets = AssetInventory()
+        pii_findings: List[PiiFinding] = []
+        column_findings: List[ColumnFinding] = []
+        pii_aggregates: List[PiiAggregate] = []
+        misconfigurations: List[MisconfigurationFinding] = []
+        cache_stats = CacheStats()
+        lineage = self.lineage_graph if self.lineage_mode == "incremental" else LineageGraph()
+
+        for outcome in outcomes:
+            assets.add(outcome.assets)
+            misconfigurations.extend(outcome.misconfigurations)
+            pii_findings.extend(outcome.pii_findings)
+            column_findings.extend(outcome.column_findings)
+            pii_aggregates.extend(outcome.pii_aggregates)
+            cache_stats += outcome.cache_stats
+            with self._lineage_lock:
+                if outcome.provider in partial:
+                    lineage.add_provider_assets(outcome.provider, outcome.assets)
+                else:
+                    lineage.replace_provider_assets(outcome.provider, outcome.assets)
+
+        errors.update(posture_errors(assets.buckets))
+        self.lineage_graph = lineage
+        if self.lineage_mode == "incremental":
+            # The result keeps its own graph, so later scans do not rewrite it.
+            with self._lineage_lock:
+                lineage = lineage.copy()
+        metrics.record_findings(pii_findings, misconfigurations, column_findings, pii_aggregates)
+        with metrics.timed("risk"):
+            risk = self.risk_assessor.calculate(
+                [*pii_findings, *pii_aggregates], misconfigurations, column_findings
+            )
         return ScanResult(
             assets=assets,
             pii_findings=pii_findings,
             misconfigurations=misconfigurations,
-            lineage=self.lineage_graph,
+            lineage=lineage,
             risk=risk,
+            errors=errors,
+            cache_stats=cache_stats,
+            column_findings=column_findings,
+            pii_aggregates=pii_aggregates,
+        )
+
+    def scan_shards(
+        self,
+        plan: Optional[Iterable[ShardGroup]] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> ScanResult:
+        """Scan every shard of a providers config and merge them into one result.
+
+        Each provider's shards run on a thread pool of its ``max_concurrency``
+        threads. A shard still running after its ``timeout`` is recorded as timed
+        out and stops at its next checkpoint, without holding up the other shards.
+        Failed and timed-out shards are listed in :attr:`ScanResult.errors` under
+        their shard key. :attr:`ScanResult.shards` holds every shard's status.
+
+        Args:
+            plan: Shard groups, e.g. from :func:`~dspm_engine.core.shards.load_shards`.
+                Defaults to the bundled ``config/providers.yaml``.
+            progress: As for :meth:`scan`, but called with shard keys rather than
+                provider names.
+        """
+
+        groups = list(plan) if plan is not None else load_shards()
+        _normalize_providers(group.provider for group in groups)
+        with metrics.track_scan(cancelled=(ScanCancelled,)):
+            result = self._scan_shards(groups, progress)
+            if self.history is not None:
+                incomplete = {
+                    status.provider for status in result.shards if status.status != "completed"
+                }
+                self.history.record(
+                    result, [group.provider for group in groups if group.provider not in incomplete]
+                )
+        return result
+
+    def _scan_shards(
+        self, groups: List[ShardGroup], progress: Optional[ProgressCallback]
+    ) -> ScanResult:
+        """Run shard groups and merge their outcomes per provider, in config order."""
+
+        scans: Dict[str, List[Tuple[Optional[str], ProviderScan]]] = {}
+        statuses: List[ShardStatus] = []
+        errors: Dict[str, str] = {}
+        for run, outcome in self._run_shards(groups, progress):
+            shard = run.shard
+            scans.setdefault(shard.provider, [])
+            if isinstance(outcome, BaseException):
+                logger.error("Shard %s scan failed", shard.key, exc_info=outcome)
+                errors[shard.key] = f"{type(outcome).__name__}: {outcome}"
+                status = "timeout" if isinstance(outcome, ShardTimeout) else "failed"
+                statuses.append(
+                    ShardStatus(
+                        shard.key,
+                        shard.provider,
+                        status,
+                        seconds=run.seconds,
+                        error=errors[shard.key],
+                    )
+                )
+                continue
+            scans[shard.provider].append((self._shard_account(shard), outcome))
+            statuses.append(
+                ShardStatus(
+                    shard.key, shard.provider, "completed", len(outcome.assets), run.seconds
+                )
+            )
+        partial = {status.provider for status in statuses if status.status != "completed"}
+        result = self._merge(
+            [_combine_shards(provider, outcomes) for provider, outcomes in scans.items()],
+            errors,
+            partial,
+        )
+        result.shards = statuses
+        return result
+
+    def _run_shards(
+        self, groups: List[ShardGroup], progress: Optional[ProgressCallback]
+    ) -> List[Tuple[_ShardRun, ProviderScan | BaseException]]:
+        """Run shards on one thread pool per provider, enforcing per-shard timeouts."""
+
+        runs: Dict[Future, _ShardRun] = {}
+        outcomes: Dict[Future, ProviderScan | BaseException] = {}
+        pools = [
+            ThreadPoolExecutor(
+                max_workers=max(1, min(group.max_concurrency, len(group.shards))),
+                thread_name_prefix=f"dspm-shard-{group.provider}",
+            )
+            for group in groups
+        ]
+        try:
+            for group, pool in zip(groups, pools, strict=True):
+                for shard in group.shards:
+                    run = _ShardRun(shard, group.timeout)
+                    runs[pool.submit(self._analyze_shard, run, progress)] = run
+            pending = set(runs)
+            while pending:
+                done, pending = wait(
+                    pending, timeout=SHARD_POLL_SECONDS, return_when=FIRST_COMPLETED
+                )
+                now = time.monotonic()
+                for future in done:
+                    run = runs[future]
+                    run.seconds = now - (run.started or now)
+                    try:
+                        outcomes[future] = future.result()
+                    except ScanCancelled:
+                        raise
+                    except Exception as exc:
+                        outcomes[future] = exc
+                for future in list(pending):
+                    run = runs[future]
+                    if run.started is not None and now - run.started >= run.timeout:
+                        run.stop.set()
+                        run.seconds = now - run.started
+                        pending.discard(future)
+                        outcomes[future] = ShardTimeout(
+                            f"{run.shard.key} timed out after {run.timeout:g}s"
+                        )
+        except ScanCancelled:
+            for run in runs.values():
+                run.stop.set()
+            raise
+        finally:
+            for pool in pools:
+                pool.shutdown(wait=False, cancel_futures=True)
+        return [(run, outcomes[future]) for future, run in runs.items()]
+
+    def _shard_account(self, shard: Shard) -> Optional[str]:
+        """Account a shard's assets belong to; sample discovery ignores accounts."""
+
+        return shard.account if self.discovery == "live" else None
+
+    def _shard_source(self, shard: Shard) -> StorageProvider:
+        """Build the provider scanner for a shard: sample data, or connected to its scope."""
+
+        provider_cls = get_provider(shard.provider)
+        if self.discovery == "live":
+            return provider_cls.from_environment(**shard.options())
+        return provider_cls()
+
+    def _analyze_shard(
+        self, run: _ShardRun, progress: Optional[ProgressCallback] = None
+    ) -> ProviderScan:
+        """Discover one shard's assets and analyze them, stopping once it times out."""
+
+        run.started = time.monotonic()
+        shard = run.shard
+        provider = shard.provider
+        logger.info("Scanning shard %s", shard.key)
+        if progress:
+            progress(shard.key, "started", 0)
+        source = self._shard_source(shard)
+        assets: List[StorageAsset] = []
+        with metrics.timed("discover", provider):
+            for asset in source.iter_assets():
+                run.check()
+                if shard.matches(asset):
+                    assets.append(asset)
+        metrics.ASSETS_PROCESSED.inc(provider, amount=len(assets))
+        run.check()
+        if progress:
+            progress(shard.key, "discovered", len(assets))
+        outcome = self._analyze_assets(
+            provider, assets, self._sampler(provider, source), self._shard_account(shard)
         )
+        run.check()
+        if progress:
+            progress(shard.key, "classified", len(assets))
+        return outcome
@@ -0,0 +1,169 @@
+"""Config-driven fan-out of scans into provider, account and scope shards.
+
+``config/providers.yaml`` lists each provider's accounts and scopes: regions for
+AWS and projects for GCP. Azure has no scope below its storage accounts.
+:func:`load_shards` expands every enabled provider into one :class:`Shard` per
+account and scope. Each provider's shards are grouped with that provider's
+concurrency limit and per-shard timeout, and :meth:`Scanner.scan_shards` runs
+the groups.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from .models import StorageAsset
+from .providers import PROVIDERS, get_provider
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "providers.yaml"
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 300.0
+SHARD_STATUSES = ("completed", "failed", "timeout")
+PROVIDER_SETTINGS = ("enabled", "accounts", "max_concurrency", "timeout")
+
+
+class ShardTimeout(Exception):
+    """Raised inside a shard that ran past its timeout, at its next checkpoint."""
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One unit of scan work: a provider, an optional account and an optional scope.
+
+    Attributes:
+        provider: Registered provider name.
+        account: Account the shard authenticates as: an AWS profile, an Azure
+            storage account or a GCP service account. ``None`` uses the default
+            credentials.
+        scope: Region or project that the shard covers.
+        scope_kind: What ``scope`` names. It is passed to the provider's
+            ``from_environment`` as a keyword, e.g. ``region="ap-southeast-2"``.
+    """
+
+    provider: str
+    account: Optional[str] = None
+    scope: Optional[str] = None
+    scope_kind: str = "scope"
+
+    @property
+    def key(self) -> str:
+        """Stable ``provider/account/scope`` label, with ``*`` for the defaults."""
+
+        return f"{self.provider}/{self.account or '*'}/{self.scope or '*'}"
+
+    def options(self) -> Dict[str, str]:
+        """Keyword arguments for the provider's ``from_environment``."""
+
+        options = {}
+        if self.account is not None:
+            options["account"] = self.account
+        if self.scope is not None:
+            options[self.scope_kind] = self.scope
+        return options
+
+    def matches(self, asset: StorageAsset) -> bool:
+        """Whether an asset belongs to this shard.
+
+        Assets that record the scope (such as a bucket's ``region``) must match it.
+        Other assets belong to every shard of their provider.
+        """
+
+        value = getattr(asset, self.scope_kind, None)
+        return self.scope is None or value is None or value == self.scope
+
+
+@dataclass(frozen=True)
+class ShardGroup:
+    """A provider's shards with the limits they run under."""
+
+    provider: str
+    shards: Tuple[Shard, ...]
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    timeout: float = DEFAULT_TIMEOUT
+
+
+@dataclass
+class ShardStatus:
+    """Outcome of one shard in a sharded scan."""
+
+    shard: str
+    provider: str
+    status: str
+    assets: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _names(settings: Mapping[str, Any], key: str, provider: str) -> List[Optional[str]]:
+    """Return a list of names from ``settings[key]``, or ``[None]`` when it is empty."""
+
+    values = settings.get(key) or []
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"{provider}.{key} must be a list of strings")
+    return list(dict.fromkeys(values)) or [None]
+
+
+def _limits(settings: Mapping[str, Any], defaults: Mapping[str, Any]) -> Tuple[int, float]:
+    """Return ``(max_concurrency, timeout)`` from provider settings, then defaults."""
+
+    max_concurrency = int(
+        settings.get("max_concurrency", defaults.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+    )
+    timeout = float(settings.get("timeout", defaults.get("timeout", DEFAULT_TIMEOUT)))
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    return max_concurrency, timeout
+
+
+def expand_shards(config: Mapping[str, Any]) -> List[ShardGroup]:
+    """Expand a parsed providers config into one shard group per enabled provider.
+
+    A provider's scopes are read from the plural of its scanner's ``shard_scope``
+    (``regions``, ``projects``; ``scopes`` for providers that do not declare
+    one). A scanner whose ``shard_scope`` is ``None`` cannot narrow a scan below
+    an account, so it gets one shard per account. Raises ``ValueError`` for
+    unknown providers, invalid settings and keys that an enabled provider does
+    not read, such as ``regions`` under a provider without that scope.
+    """
+
+    defaults = config.get("defaults") or {}
+    groups = []
+    for name, settings in (config.get("providers") or {}).items():
+        settings = settings or {}
+        if not settings.get("enabled", True):
+            continue
+        provider = str(name).lower()
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unsupported provider in config: {name}")
+        scope_kind = getattr(get_provider(provider), "shard_scope", "scope")
+        allowed = PROVIDER_SETTINGS + ((f"{scope_kind}s",) if scope_kind else ())
+        unknown = sorted(str(key) for key in settings if key not in allowed)
+        if unknown:
+            raise ValueError(
+                f"Unsupported {provider} settings: {', '.join(unknown)}"
+                f" (expected {', '.join(allowed)})"
+            )
+        max_concurrency, timeout = _limits(settings, defaults)
+        scopes = _names(settings, f"{scope_kind}s", provider) if scope_kind else [None]
+        shards = tuple(
+            Shard(provider, account, scope, scope_kind or "scope")
+            for account in _names(settings, "accounts", provider)
+            for scope in scopes
+        )
+        groups.append(ShardGroup(provider, shards, max_concurrency, timeout))
+    return groups
+
+
+def load_shards(path: Union[str, Path, None] = None) -> List[ShardGroup]:
+    """Load and expand ``providers.yaml`` (the bundled one unless ``path`` is given)."""
+
+    import yaml
+
+    with Path(path or DEFAULT_CONFIG_PATH).open(encoding="utf-8") as handle:
+        config = yaml.safe_load(handle) or {}
+    if not isinstance(config, dict):
+        raise ValueError("Provider config must be a mapping")
+    return expand_shards(config)
@@ -1,25 +1,136 @@
 """Lightweight AWS storage scanner abstraction."""
 from __future__ import annotations
 
-from typing import Iterable, List
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from .discovery import (
+    DEFAULT_DISCOVERY_WORKERS,
+    DEFAULT_PAGE_SIZE,
+    AdaptiveBackoff,
+    bounded_map,
+    paginate,
+)
 from .logging_utils import get_logger
-from .models import StorageAsset
+from .models import UNKNOWN_ENCRYPTION, UNKNOWN_POLICY, StorageAsset
+from .sampling import ObjectRef
 
 logger = get_logger(__name__)
 
+THROTTLE_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "SlowDown",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+}
+PUBLIC_GRANTEES = {
+    "http://acs.amazonaws.com/groups/global/AllUsers",
+    "http://acs.amazonaws.com/groups/global/AuthenticatedUsers",
+}
+# Asset field each posture lookup feeds, reported as unknown when it fails.
+LOOKUP_FIELDS = {
+    "get_bucket_location": "region",
+    "get_bucket_encryption": "encryption",
+    "get_bucket_versioning": "versioning",
+    "get_bucket_policy_status": "public",
+    "get_public_access_block": "public",
+    "get_bucket_acl": "public",
+    "get_bucket_policy": "policy",
+    "get_bucket_tagging": "tags",
+}
+
+
+def _error_code(exc: BaseException) -> Optional[str]:
+    """Return the AWS error code of a botocore ``ClientError``, if any."""
+
+    response = getattr(exc, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Whether an S3 error signals throttling and should be retried."""
+
+    return _error_code(exc) in THROTTLE_CODES
+
 
 class AwsStorageScanner:
     """Discovers S3 buckets and posture metadata.
 
-    This implementation returns curated sample data suitable for offline testing.
-    Replace :meth:`_sample_buckets` with boto3-backed discovery for production use.
+    Without a ``client`` the scanner returns curated sample data suitable for
+    offline testing. With a boto3 S3 client (see :meth:`connect`) it pages through
+    ``ListBuckets`` lazily and looks up each bucket's posture concurrently on
+    ``max_workers`` threads that share the client and its connection pool.
+    With ``bucket_region`` set, the listing asks S3 for that region's buckets only
+    (on botocore releases that support ``BucketRegion``).
     """
 
-    def __init__(self, buckets: Iterable[StorageAsset] | None = None) -> None:
-        """Initialize the scanner with provided or sample buckets."""
+    # Config-driven scans shard AWS by region (see dspm_engine.core.shards).
+    shard_scope = "region"
+
+    def __init__(
+        self,
+        buckets: Iterable[StorageAsset] | None = None,
+        client: Any = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        backoff: Optional[AdaptiveBackoff] = None,
+        bucket_region: Optional[str] = None,
+    ) -> None:
+        """Initialize the scanner with provided or sample buckets, or a live client."""
+
+        self.client = client
+        self.bucket_region = bucket_region
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.backoff = backoff or AdaptiveBackoff(is_throttle)
+        if client is not None:
+            self._buckets: List[StorageAsset] = []
+        else:
+            self._buckets = list(buckets) if buckets else self._sample_buckets()
+
+    @classmethod
+    def connect(
+        cls,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        profile: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "AwsStorageScanner":
+        """Create a live scanner from a named profile or the default boto3 credential chain.
+
+        The client's connection pool is sized to ``max_workers`` and botocore's own
+        retries are disabled so throttling is handled by :class:`AdaptiveBackoff`.
+        """
 
-        self._buckets = list(buckets) if buckets else self._sample_buckets()
+        import boto3
+        from botocore.config import Config
+
+        client = boto3.Session(profile_name=profile).client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            config=Config(
+                max_pool_connections=max(10, max_workers),
+                retries={"mode": "standard", "max_attempts": 1},
+            ),
+        )
+        return cls(client=client, max_workers=max_workers, **kwargs)
+
+    @classmethod
+    def from_environment(
+        cls, account: Optional[str] = None, region: Optional[str] = None
+    ) -> "AwsStorageScanner":
+        """Create a live scanner for the profile ``account`` (default credentials if unset).
+
+        With ``region`` the client is pinned to that region and lists only its buckets.
+        """
+
+        return cls.connect(region=region, profile=account, bucket_region=region)
 
     def _sample_buckets(self) -> List[StorageAsset]:
         """Return representative sample buckets with content for demos."""
@@ -50,8 +161,205 @@ class AwsStorageScanner:
             ),
         ]
 
+    def _fetch_page(self, token: Optional[str]) -> Tuple[List[str], Optional[str]]:
+        """Fetch one page of bucket names."""
+
+        operation = self.client.meta.service_model.operation_model("ListBuckets")
+        if operation.input_shape is None or "MaxBuckets" not in operation.input_shape.members:
+            # Older botocore releases only expose the unpaginated ListBuckets call.
+            response = self.client.list_buckets()
+            return [bucket["Name"] for bucket in response.get("Buckets", [])], None
+        params: Dict[str, Any] = {"MaxBuckets": self.page_size}
+        if self.bucket_region and "BucketRegion" in operation.input_shape.members:
+            params["BucketRegion"] = self.bucket_region
+        if token:
+            params["ContinuationToken"] = token
+        response = self.client.list_buckets(**params)
+        names = [bucket["Name"] for bucket in response.get("Buckets", [])]
+        return names, response.get("ContinuationToken")
+
+    def _lookup(
+        self, operation: str, bucket: str, missing: Iterable[str], failed: Set[str]
+    ) -> Optional[dict]:
+        """Call a per-bucket posture API, returning ``None`` for expected absences.
+
+        Other S3 errors, such as ``AccessDenied``, also return ``None`` but add
+        ``operation`` to ``failed`` so the setting is treated as unknown.
+        """
+
+        try:
+            return self.backoff.call(getattr(self.client, operation), Bucket=bucket)
+        except Exception as exc:
+            code = _error_code(exc)
+            if code is None:
+                raise
+            if code not in missing:
+                logger.warning("S3 %s failed for bucket %s: %s", operation, bucket, code)
+                failed.add(operation)
+            return None
+
+    def describe_bucket(self, name: str) -> StorageAsset:
+        """Look up the posture of one bucket.
+
+        A setting that could not be read is reported as unknown rather than as
+        either default, so it raises no finding and claims no secure posture:
+        region, ``public`` and ``versioning`` are ``None``, encryption is
+        :data:`~dspm_engine.core.models.UNKNOWN_ENCRYPTION` and policy is
+        :data:`~dspm_engine.core.models.UNKNOWN_POLICY`. The affected fields are
+        listed in ``posture_unknown``. Exposure that was observed (a public ACL or
+        policy) or ruled out (a public access block) is reported even when another
+        exposure lookup failed.
+        """
+
+        failed: Set[str] = set()
+        location = self._lookup("get_bucket_location", name, (), failed)
+        encryption = self._lookup(
+            "get_bucket_encryption",
+            name,
+            {"ServerSideEncryptionConfigurationNotFoundError"},
+            failed,
+        )
+        versioning = self._lookup("get_bucket_versioning", name, (), failed)
+        status = self._lookup("get_bucket_policy_status", name, {"NoSuchBucketPolicy"}, failed)
+        block = self._lookup(
+            "get_public_access_block", name, {"NoSuchPublicAccessBlockConfiguration"}, failed
+        )
+        acl = self._lookup("get_bucket_acl", name, (), failed) or {}
+        policy = self._lookup("get_bucket_policy", name, {"NoSuchBucketPolicy"}, failed)
+        tagging = self._lookup("get_bucket_tagging", name, {"NoSuchTagSet"}, failed) or {}
+
+        region = None
+        if location is not None:
+            # S3 reports buckets in us-east-1 with an empty location constraint.
+            region = location.get("LocationConstraint") or "us-east-1"
+        versioned = None
+        if "get_bucket_versioning" not in failed:
+            versioned = (versioning or {}).get("Status") == "Enabled"
+        algorithm = UNKNOWN_ENCRYPTION if "get_bucket_encryption" in failed else None
+        if encryption:
+            rules = encryption.get("ServerSideEncryptionConfiguration", {}).get("Rules", [])
+            for rule in rules:
+                default = rule.get("ApplyServerSideEncryptionByDefault", {})
+                algorithm = default.get("SSEAlgorithm") or algorithm
+
+        blocked = bool(block) and all(
+            block.get("PublicAccessBlockConfiguration", {}).get(flag, False)
+            for flag in ("IgnorePublicAcls", "RestrictPublicBuckets")
+        )
+        acl_public = any(
+            grant.get("Grantee", {}).get("URI") in PUBLIC_GRANTEES
+            for grant in acl.get("Grants", [])
+        )
+        policy_public = bool(status and status.get("PolicyStatus", {}).get("IsPublic"))
+        public: Optional[bool] = (acl_public or policy_public) and not blocked
+        unknown = {LOOKUP_FIELDS[operation] for operation in failed}
+        if "public" in unknown:
+            if public or blocked:
+                unknown.discard("public")
+            else:
+                public = None
+        if "get_bucket_policy" in failed:
+            policy_label = UNKNOWN_POLICY
+        else:
+            policy_label = "allow-all" if _allows_everyone(policy) else "restricted"
+        return StorageAsset(
+            name=name,
+            provider="aws",
+            public=public,
+            encryption=algorithm,
+            versioning=versioned,
+            policy=policy_label,
+            region=region,
+            tags={tag["Key"]: tag["Value"] for tag in tagging.get("TagSet", [])},
+            posture_unknown=tuple(sorted(unknown)),
+        )
+
+    def object_store(self) -> "S3ObjectStore":
+        """Return an object store sharing this scanner's client and backoff."""
+
+        if self.client is None:
+            raise ValueError("Object sampling requires a live S3 client")
+        return S3ObjectStore(self.client, self.backoff, self.page_size)
+
+    def iter_buckets(self) -> Iterator[StorageAsset]:
+        """Yield buckets lazily, paging the listing and fanning out posture lookups."""
+
+        if self.client is None:
+            yield from self._buckets
+            return
+        names = paginate(self._fetch_page, self.backoff)
+        yield from bounded_map(self.describe_bucket, names, self.max_workers)
+
+    def iter_assets(self) -> Iterator[StorageAsset]:
+        """Yield buckets lazily; the provider-registry name for :meth:`iter_buckets`."""
+
+        return self.iter_buckets()
+
     def list_buckets(self) -> List[StorageAsset]:
         """Return discovered buckets with posture metadata."""
 
-        logger.info("Discovered %s AWS buckets", len(self._buckets))
-        return self._buckets
+        buckets = list(self.iter_buckets())
+        logger.info("Discovered %s AWS buckets", len(buckets))
+        return buckets
+
+
+class S3ObjectStore:
+    """Lists S3 objects and reads byte ranges through a shared client."""
+
+    def __init__(
+        self, client: Any, backoff: AdaptiveBackoff, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> None:
+        self.client = client
+        self.backoff = backoff
+        self.page_size = page_size
+
+    def list_objects(self, asset: StorageAsset) -> Iterator[ObjectRef]:
+        def fetch(token: Optional[str]) -> Tuple[List[ObjectRef], Optional[str]]:
+            params: Dict[str, Any] = {"Bucket": asset.name, "MaxKeys": self.page_size}
+            if token:
+                params["ContinuationToken"] = token
+            response = self.client.list_objects_v2(**params)
+            refs = [
+                ObjectRef(
+                    key=item["Key"],
+                    size=item.get("Size", 0),
+                    last_modified=item["LastModified"].timestamp(),
+                    etag=item.get("ETag"),
+                )
+                for item in response.get("Contents", [])
+            ]
+            return refs, response.get("NextContinuationToken")
+
+        return paginate(fetch, self.backoff)
+
+    def read_range(self, asset: StorageAsset, key: str, start: int, length: int) -> bytes:
+        response = self.backoff.call(
+            self.client.get_object,
+            Bucket=asset.name,
+            Key=key,
+            Range=f"bytes={start}-{start + length - 1}",
+        )
+        return response["Body"].read()
+
+
+def _allows_everyone(policy: Optional[dict]) -> bool:
+    """Whether a bucket policy document has an ``Allow`` statement for any principal."""
+
+    if not policy or not policy.get("Policy"):
+        return False
+    try:
+        document = json.loads(policy["Policy"])
+    except ValueError:
+        return False
+    statements = document.get("Statement", [])
+    if isinstance(statements, dict):
+        statements = [statements]
+    for statement in statements:
+        principal = statement.get("Principal")
+        if isinstance(principal, dict):
+            principal = principal.get("AWS")
+        if statement.get("Effect") == "Allow" and (
+            principal == "*" or (isinstance(principal, list) and "*" in principal)
+        ):
+            return True
+    return False
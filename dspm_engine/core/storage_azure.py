@@ -1,21 +1,112 @@
 """Azure Blob Storage scanner abstraction."""
 from __future__ import annotations
 
-from typing import Iterable, List
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 
+from .discovery import (
+    DEFAULT_DISCOVERY_WORKERS,
+    DEFAULT_PAGE_SIZE,
+    AdaptiveBackoff,
+    bounded_map,
+    paginate,
+)
 from .logging_utils import get_logger
-from .models import StorageAsset
+from .models import UNKNOWN_POLICY, StorageAsset
+from .sampling import ObjectRef
 
 logger = get_logger(__name__)
 
+THROTTLE_STATUS = {429, 503}
+ACCOUNT_KEY_SCOPE = "$account-encryption-key"
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Whether a Blob service error signals throttling and should be retried."""
+
+    return getattr(exc, "status_code", None) in THROTTLE_STATUS
+
 
 class AzureStorageScanner:
-    """Enumerates Blob containers with posture metadata."""
+    """Enumerates Blob containers with posture metadata.
+
+    Without a ``client`` the scanner returns sample containers. With a
+    ``BlobServiceClient`` (see :meth:`connect`) it pages through the container
+    listing lazily and fetches each container's access policy concurrently.
+    Storage accounts always encrypt at rest, so containers report either
+    ``MICROSOFT_MANAGED`` or their custom default encryption scope.
+    """
+
+    # Config-driven scans shard Azure by storage account only: a connection string
+    # already pins one account, so there is no narrower scope (see
+    # dspm_engine.core.shards).
+    shard_scope = None
+
+    def __init__(
+        self,
+        containers: Iterable[StorageAsset] | None = None,
+        client: Any = None,
+        region: Optional[str] = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        backoff: Optional[AdaptiveBackoff] = None,
+    ) -> None:
+        """Initialize the scanner with provided or sample containers, or a live client."""
+
+        self.client = client
+        self.region = region
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.backoff = backoff or AdaptiveBackoff(is_throttle)
+        if client is not None:
+            self._containers: List[StorageAsset] = []
+        else:
+            self._containers = list(containers) if containers else self._sample_containers()
 
-    def __init__(self, containers: Iterable[StorageAsset] | None = None) -> None:
-        """Initialize the scanner with provided or sample containers."""
+    @classmethod
+    def connect(
+        cls,
+        connection_string: str,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        **kwargs: Any,
+    ) -> "AzureStorageScanner":
+        """Create a live scanner for the account in ``connection_string``.
 
-        self._containers = list(containers) if containers else self._sample_containers()
+        Works against Azurite as well as real accounts. The HTTP connection pool is
+        sized to ``max_workers`` and SDK retries are disabled in favour of
+        :class:`AdaptiveBackoff`.
+        """
+
+        import requests
+        from azure.core.pipeline.transport import RequestsTransport
+        from azure.storage.blob import BlobServiceClient
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, max_workers))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        client = BlobServiceClient.from_connection_string(
+            connection_string,
+            transport=RequestsTransport(session=session, session_owner=False),
+            retry_total=0,
+        )
+        return cls(client=client, max_workers=max_workers, **kwargs)
+
+    @classmethod
+    def from_environment(cls, account: Optional[str] = None) -> "AzureStorageScanner":
+        """Create a live scanner from ``AZURE_STORAGE_CONNECTION_STRING``.
+
+        For a storage ``account`` the connection string is read from
+        ``AZURE_STORAGE_CONNECTION_STRING_<ACCOUNT>`` instead.
+        """
+
+        variable = "AZURE_STORAGE_CONNECTION_STRING"
+        if account:
+            variable += "_" + account.upper().replace("-", "_")
+        connection_string = os.getenv(variable)
+        if not connection_string:
+            raise ValueError(f"{variable} is required for live discovery")
+        return cls.connect(connection_string)
 
     def _sample_containers(self) -> List[StorageAsset]:
         """Return representative containers with demo content."""
@@ -44,6 +135,121 @@ class AzureStorageScanner:
             ),
         ]
 
+    def _fetch_page(self, token: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+        """Fetch one page of container properties."""
+
+        pages = self.client.list_containers(
+            include_metadata=True, results_per_page=self.page_size
+        ).by_page(continuation_token=token)
+        page = list(next(pages, []))
+        return page, pages.continuation_token
+
+    def describe_container(self, properties: Any) -> StorageAsset:
+        """Look up the access policy of one listed container.
+
+        A service error other than throttling (for example a 403) leaves the
+        container's exposure unknown instead of failing the whole listing:
+        ``public`` is ``None``, policy is
+        :data:`~dspm_engine.core.models.UNKNOWN_POLICY` and both fields are listed
+        in ``posture_unknown``.
+        """
+
+        container = self.client.get_container_client(properties.name)
+        public: Optional[bool] = None
+        policy = UNKNOWN_POLICY
+        unknown: Tuple[str, ...] = ()
+        try:
+            access = self.backoff.call(container.get_container_access_policy)
+        except Exception as exc:
+            status = getattr(exc, "status_code", None)
+            if status is None or is_throttle(exc):
+                raise
+            logger.warning(
+                "Access policy lookup failed for container %s: %s", properties.name, status
+            )
+            unknown = ("policy", "public")
+        else:
+            public_access = access.get("public_access")
+            public = public_access in {"blob", "container"}
+            policy = {"container": "allow-all", "blob": "public"}.get(
+                public_access or "", "restricted"
+            )
+        scope = getattr(properties.encryption_scope, "default_encryption_scope", None)
+        return StorageAsset(
+            name=properties.name,
+            provider="azure",
+            public=public,
+            encryption=(
+                scope if scope and scope != ACCOUNT_KEY_SCOPE else "MICROSOFT_MANAGED"
+            ),
+            versioning=bool(properties.immutable_storage_with_versioning_enabled),
+            policy=policy,
+            region=self.region,
+            tags=dict(properties.metadata or {}),
+            posture_unknown=unknown,
+        )
+
+    def object_store(self) -> "BlobObjectStore":
+        """Return an object store sharing this scanner's client and backoff."""
+
+        if self.client is None:
+            raise ValueError("Object sampling requires a live BlobServiceClient")
+        return BlobObjectStore(self.client, self.backoff, self.page_size)
+
+    def iter_containers(self) -> Iterator[StorageAsset]:
+        """Yield containers lazily, paging the listing and fanning out policy lookups."""
+
+        if self.client is None:
+            yield from self._containers
+            return
+        listed = paginate(self._fetch_page, self.backoff)
+        yield from bounded_map(self.describe_container, listed, self.max_workers)
+
+    def iter_assets(self) -> Iterator[StorageAsset]:
+        """Yield containers lazily; the provider-registry name for :meth:`iter_containers`."""
+
+        return self.iter_containers()
+
     def list_containers(self) -> List[StorageAsset]:
-        logger.info("Discovered %s Azure containers", len(self._containers))
-        return self._containers
+        containers = list(self.iter_containers())
+        logger.info("Discovered %s Azure containers", len(containers))
+        return containers
+
+
+class BlobObjectStore:
+    """Lists blobs and reads byte ranges through a shared ``BlobServiceClient``."""
+
+    def __init__(
+        self, client: Any, backoff: AdaptiveBackoff, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> None:
+        self.client = client
+        self.backoff = backoff
+        self.page_size = page_size
+
+    def list_objects(self, asset: StorageAsset) -> Iterator[ObjectRef]:
+        container = self.client.get_container_client(asset.name)
+
+        def fetch(token: Optional[str]) -> Tuple[List[ObjectRef], Optional[str]]:
+            pages = container.list_blobs(results_per_page=self.page_size).by_page(
+                continuation_token=token
+            )
+            refs = [
+                ObjectRef(
+                    key=blob.name,
+                    size=blob.size or 0,
+                    last_modified=blob.last_modified.timestamp() if blob.last_modified else 0.0,
+                    etag=blob.etag,
+                    content_type=getattr(blob.content_settings, "content_type", None),
+                )
+                for blob in next(pages, [])
+            ]
+            return refs, pages.continuation_token
+
+        return paginate(fetch, self.backoff)
+
+    def read_range(self, asset: StorageAsset, key: str, start: int, length: int) -> bytes:
+        container = self.client.get_container_client(asset.name)
+        downloader = self.backoff.call(
+            container.download_blob, key, offset=start, length=length
+        )
+        return downloader.readall()
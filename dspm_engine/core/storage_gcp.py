@@ -1,21 +1,108 @@
 """GCP Cloud Storage scanner abstraction."""
 from __future__ import annotations
 
-from typing import Iterable, List
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 
+from .discovery import (
+    DEFAULT_DISCOVERY_WORKERS,
+    DEFAULT_PAGE_SIZE,
+    AdaptiveBackoff,
+    bounded_map,
+    paginate,
+)
 from .logging_utils import get_logger
-from .models import StorageAsset
+from .models import UNKNOWN_POLICY, StorageAsset
+from .sampling import ObjectRef
 
 logger = get_logger(__name__)
 
+THROTTLE_STATUS = {429, 503}
+PUBLIC_MEMBERS = {"allUsers", "allAuthenticatedUsers"}
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Whether a Cloud Storage error signals throttling and should be retried."""
+
+    return getattr(exc, "code", None) in THROTTLE_STATUS
+
 
 class GcpStorageScanner:
-    """Enumerates Cloud Storage buckets with metadata."""
+    """Enumerates Cloud Storage buckets with metadata.
+
+    Without a ``client`` the scanner returns sample buckets. With a
+    ``google.cloud.storage.Client`` (see :meth:`connect`) it pages through the
+    bucket listing lazily and fetches each bucket's IAM policy concurrently.
+    Buckets without a default KMS key report ``GOOGLE_MANAGED`` encryption.
+    """
+
+    # Config-driven scans shard GCP by project (see dspm_engine.core.shards).
+    shard_scope = "project"
+
+    def __init__(
+        self,
+        buckets: Iterable[StorageAsset] | None = None,
+        client: Any = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        backoff: Optional[AdaptiveBackoff] = None,
+    ) -> None:
+        """Initialize the scanner with provided or sample buckets, or a live client."""
+
+        self.client = client
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.backoff = backoff or AdaptiveBackoff(is_throttle)
+        if client is not None:
+            self._buckets: List[StorageAsset] = []
+        else:
+            self._buckets = list(buckets) if buckets else self._sample_buckets()
 
-    def __init__(self, buckets: Iterable[StorageAsset] | None = None) -> None:
-        """Initialize the scanner with provided or sample buckets."""
+    @classmethod
+    def connect(
+        cls,
+        project: Optional[str] = None,
+        max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+        credentials_file: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "GcpStorageScanner":
+        """Create a live scanner from a service account key or default credentials.
 
-        self._buckets = list(buckets) if buckets else self._sample_buckets()
+        Without ``credentials_file`` the client uses application default
+        credentials. Honours ``STORAGE_EMULATOR_HOST`` for fake GCS servers. The
+        HTTP connection pool is sized to ``max_workers``.
+        """
+
+        import requests
+        from google.cloud import storage
+
+        if credentials_file:
+            client = storage.Client.from_service_account_json(credentials_file, project=project)
+        else:
+            client = storage.Client(project=project)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, max_workers))
+        client._http.mount("https://", adapter)
+        client._http.mount("http://", adapter)
+        return cls(client=client, max_workers=max_workers, **kwargs)
+
+    @classmethod
+    def from_environment(
+        cls, account: Optional[str] = None, project: Optional[str] = None
+    ) -> "GcpStorageScanner":
+        """Create a live scanner for ``project``.
+
+        For a service ``account`` the key file is read from the path in
+        ``GOOGLE_APPLICATION_CREDENTIALS_<ACCOUNT>``; otherwise application
+        default credentials are used.
+        """
+
+        credentials_file = None
+        if account:
+            variable = "GOOGLE_APPLICATION_CREDENTIALS_" + account.upper().replace("-", "_")
+            credentials_file = os.getenv(variable)
+            if not credentials_file:
+                raise ValueError(f"{variable} is required for live discovery")
+        return cls.connect(project=project, credentials_file=credentials_file)
 
     def _sample_buckets(self) -> List[StorageAsset]:
         """Return representative buckets with demo content."""
@@ -44,6 +131,119 @@ class GcpStorageScanner:
             ),
         ]
 
+    def _fetch_page(self, token: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+        """Fetch one page of bucket metadata."""
+
+        iterator = self.client.list_buckets(
+            page_size=self.page_size, page_token=token, retry=None
+        )
+        page = next(iterator.pages, None)
+        return (list(page) if page is not None else []), iterator.next_page_token
+
+    def describe_bucket(self, bucket: Any) -> StorageAsset:
+        """Look up the IAM policy of one listed bucket.
+
+        A service error other than throttling (for example a 403) leaves the
+        bucket's exposure unknown instead of failing the whole listing: ``public``
+        is ``None``, policy is :data:`~dspm_engine.core.models.UNKNOWN_POLICY` and
+        both fields are listed in ``posture_unknown``.
+        """
+
+        prevention = bucket.iam_configuration.public_access_prevention
+        public: Optional[bool] = False
+        unknown: Tuple[str, ...] = ()
+        if prevention != "enforced":
+            try:
+                policy = self.backoff.call(
+                    bucket.get_iam_policy, requested_policy_version=3, retry=None
+                )
+            except Exception as exc:
+                code = getattr(exc, "code", None)
+                if code is None or is_throttle(exc):
+                    raise
+                logger.warning("IAM policy lookup failed for bucket %s: %s", bucket.name, code)
+                public, unknown = None, ("policy", "public")
+            else:
+                public = any(
+                    member in PUBLIC_MEMBERS
+                    for binding in policy.bindings
+                    for member in binding.get("members", ())
+                )
+        if unknown:
+            label = UNKNOWN_POLICY
+        else:
+            label = "allUsers" if public else "restricted"
+        return StorageAsset(
+            name=bucket.name,
+            provider="gcp",
+            public=public,
+            encryption="CMEK" if bucket.default_kms_key_name else "GOOGLE_MANAGED",
+            versioning=bool(bucket.versioning_enabled),
+            policy=label,
+            region=(bucket.location or "").lower() or None,
+            tags=dict(bucket.labels or {}),
+            posture_unknown=unknown,
+        )
+
+    def object_store(self) -> "GcsObjectStore":
+        """Return an object store sharing this scanner's client and backoff."""
+
+        if self.client is None:
+            raise ValueError("Object sampling requires a live Cloud Storage client")
+        return GcsObjectStore(self.client, self.backoff, self.page_size)
+
+    def iter_buckets(self) -> Iterator[StorageAsset]:
+        """Yield buckets lazily, paging the listing and fanning out IAM lookups."""
+
+        if self.client is None:
+            yield from self._buckets
+            return
+        listed = paginate(self._fetch_page, self.backoff)
+        yield from bounded_map(self.describe_bucket, listed, self.max_workers)
+
+    def iter_assets(self) -> Iterator[StorageAsset]:
+        """Yield buckets lazily; the provider-registry name for :meth:`iter_buckets`."""
+
+        return self.iter_buckets()
+
     def list_buckets(self) -> List[StorageAsset]:
-        logger.info("Discovered %s GCP buckets", len(self._buckets))
-        return self._buckets
+        buckets = list(self.iter_buckets())
+        logger.info("Discovered %s GCP buckets", len(buckets))
+        return buckets
+
+
+class GcsObjectStore:
+    """Lists Cloud Storage objects and reads byte ranges through a shared client."""
+
+    def __init__(
+        self, client: Any, backoff: AdaptiveBackoff, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> None:
+        self.client = client
+        self.backoff = backoff
+        self.page_size = page_size
+
+    def list_objects(self, asset: StorageAsset) -> Iterator[ObjectRef]:
+        def fetch(token: Optional[str]) -> Tuple[List[ObjectRef], Optional[str]]:
+            iterator = self.client.list_blobs(
+                asset.name, page_size=self.page_size, page_token=token, retry=None
+            )
+            page = next(iterator.pages, None)
+            refs = [
+                ObjectRef(
+                    key=blob.name,
+                    size=blob.size or 0,
+                    last_modified=blob.updated.timestamp() if blob.updated else 0.0,
+                    etag=blob.etag,
+                    content_type=blob.content_type,
+                )
+                for blob in (page or [])
+            ]
+            return refs, iterator.next_page_token
+
+        return paginate(fetch, self.backoff)
+
+    def read_range(self, asset: StorageAsset, key: str, start: int, length: int) -> bytes:
+        blob = self.client.bucket(asset.name).blob(key)
+        return self.backoff.call(
+            blob.download_as_bytes, start=start, end=start + length - 1, retry=None
+        )
@@ -0,0 +1,273 @@
+"""Format-aware readers that classify tabular objects column by column."""
+from __future__ import annotations
+
+import codecs
+import csv
+import hashlib
+import io
+import json
+from dataclasses import dataclass, field
+from typing import IO, Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from .logging_utils import get_logger
+from .pii_detector import ColumnFinding, PiiDetector
+from .sampling import ObjectSample
+
+logger = get_logger(__name__)
+
+TABULAR_FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_MAX_VALUES = 100
+DEFAULT_MAX_ROWS = 10_000
+
+_EXTENSION_FORMATS = {
+    "csv": "csv",
+    "tsv": "csv",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+    "parquet": "parquet",
+}
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "text/tab-separated-values": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.parquet": "parquet",
+}
+
+Row = Dict[str, Any]
+
+
+def tabular_format(name: str, content_type: Optional[str] = None) -> Optional[str]:
+    """Return ``"csv"``, ``"jsonl"`` or ``"parquet"`` for a tabular object, else ``None``."""
+
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type in _CONTENT_TYPE_FORMATS:
+        return _CONTENT_TYPE_FORMATS[media_type]
+    leaf = name.rsplit("/", 1)[-1]
+    extension = leaf.rsplit(".", 1)[-1].lower() if "." in leaf else ""
+    return _EXTENSION_FORMATS.get(extension)
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[Row]:
+    """Yield rows of delimited text keyed by the header row.
+
+    The delimiter (comma, tab, semicolon or pipe) is sniffed from the header.
+    """
+
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        return
+    try:
+        dialect: Any = csv.Sniffer().sniff(header, delimiters=",\t;|")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(_chain_first(header, lines), dialect)
+    columns = next(reader)
+    for values in reader:
+        yield dict(zip(columns, values, strict=False))
+
+
+def _chain_first(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Iterator[tuple[str, Any]]:
+    """Yield ``(dotted.path, value)`` for every leaf of a nested JSON object."""
+
+    for key, value in record.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}.")
+        else:
+            yield path, value
+
+
+def iter_jsonl_rows(lines: Iterable[str]) -> Iterator[Row]:
+    """Yield JSON Lines records with nested objects flattened to dotted column names.
+
+    Blank lines, malformed lines and non-object records are skipped.
+    """
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            logger.debug("Skipping malformed JSON line")
+            continue
+        if isinstance(record, dict):
+            yield dict(_flatten(record))
+
+
+def iter_parquet_rows(source: BinaryIO, batch_size: int = 1024) -> Iterator[Row]:
+    """Yield Parquet rows one record batch at a time (requires ``pyarrow``).
+
+    Only the footer and the row groups actually consumed are read from ``source``.
+    """
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError("Parquet support requires the 'pyarrow' package") from exc
+    # Without pre-buffering, row groups are fetched only as batches are consumed.
+    parquet = pq.ParquetFile(source, pre_buffer=False)
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+@dataclass
+class ColumnSample:
+    """Up to ``max_values`` non-empty values per column, with the rows read."""
+
+    columns: Dict[str, List[str]] = field(default_factory=dict)
+    rows: int = 0
+
+
+def sample_columns(
+    rows: Iterable[Row],
+    max_values: int = DEFAULT_MAX_VALUES,
+    max_rows: int = DEFAULT_MAX_ROWS,
+) -> ColumnSample:
+    """Collect the first ``max_values`` non-empty values of every column.
+
+    Reading stops after ``max_rows`` rows, or as soon as every column seen so far
+    is full, so large objects are never read further than needed.
+    """
+
+    sample = ColumnSample()
+    columns = sample.columns
+    full = 0
+    for row in rows:
+        sample.rows += 1
+        for column, value in row.items():
+            if value is None or value == "" or isinstance(value, (list, dict)):
+                continue
+            values = columns.setdefault(str(column), [])
+            if len(values) < max_values:
+                values.append(str(value))
+                if len(values) == max_values:
+                    full += 1
+        if sample.rows >= max_rows or (columns and full == len(columns)):
+            break
+    return sample
+
+
+def _until_error(rows: Iterator[Row], location: str) -> Iterator[Row]:
+    """Yield rows until the reader fails, keeping whatever was read before the error."""
+
+    try:
+        yield from rows
+    except Exception as exc:
+        logger.warning("Stopped reading %s: %s", location, exc)
+
+
+def _text_lines(data: bytes, complete: bool, encoding: str) -> List[str]:
+    """Decode a byte range into lines, dropping a trailing partial line if truncated."""
+
+    text = data.decode(encoding, errors="replace")
+    if not complete:
+        text = text[: text.rfind("\n") + 1]
+    return text.splitlines()
+
+
+class TabularClassifier:
+    """Classify CSV, JSON Lines and Parquet objects per column instead of per match.
+
+    Rows are streamed and only ``max_values`` values per column (from at most
+    ``max_rows`` rows) are kept; each column is then matched once against the
+    detector's rules, producing one :class:`ColumnFinding` per column and rule.
+    """
+
+    def __init__(
+        self,
+        max_values: int = DEFAULT_MAX_VALUES,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        min_hit_ratio: float = 0.0,
+    ) -> None:
+        """Create a classifier with per-object sampling limits."""
+
+        if max_values < 1 or max_rows < 1:
+            raise ValueError("max_values and max_rows must be positive")
+        self.max_values = max_values
+        self.max_rows = max_rows
+        self.min_hit_ratio = min_hit_ratio
+
+    def fingerprint(self) -> str:
+        """Hash of the limits, so changing them invalidates cached results."""
+
+        payload = json.dumps([self.max_values, self.max_rows, self.min_hit_ratio])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def accepts(sample: ObjectSample) -> bool:
+        """Whether ``sample`` is a tabular object this classifier can read."""
+
+        return tabular_format(sample.location, sample.content_type) is not None
+
+    def rows(self, fmt: str, source: Any, encoding: str = "utf-8") -> Iterator[Row]:
+        """Stream rows from ``source``: lines of text, or a binary file for Parquet."""
+
+        if fmt == "parquet":
+            return iter_parquet_rows(source)
+        if hasattr(source, "read"):
+            source = codecs.getreader(encoding)(source, errors="replace")
+        if fmt == "csv":
+            return iter_csv_rows(source)
+        if fmt == "jsonl":
+            return iter_jsonl_rows(source)
+        raise ValueError(f"Unsupported tabular format: {fmt}")
+
+    def scan_file(
+        self,
+        detector: PiiDetector,
+        provider: str,
+        location: str,
+        source: IO[Any],
+        fmt: Optional[str] = None,
+        encoding: str = "utf-8",
+    ) -> List[ColumnFinding]:
+        """Classify a whole tabular object read from a binary file object."""
+
+        fmt = fmt or tabular_format(location)
+        if fmt is None:
+            raise ValueError(f"Cannot infer tabular format of {location}")
+        sample = sample_columns(self.rows(fmt, source, encoding), self.max_values, self.max_rows)
+        return detector.classify_columns(provider, location, sample.columns, self.min_hit_ratio)
+
+    def scan_sample(
+        self, detector: PiiDetector, provider: str, sample: ObjectSample, encoding: str = "utf-8"
+    ) -> List[ColumnFinding]:
+        """Classify a sampled tabular object.
+
+        CSV and JSON Lines are parsed from the head range, ignoring a trailing
+        partial line. Parquet is read through ``sample.source`` (footer first),
+        or from the sampled bytes when they hold the entire object.
+        """
+
+        fmt = tabular_format(sample.location, sample.content_type)
+        if fmt is None or not sample.segments:
+            return []
+        if fmt == "parquet":
+            if sample.complete:
+                source: Any = io.BytesIO(sample.segments[0])
+            elif sample.source is not None:
+                source = sample.source()
+            else:
+                logger.info("Skipping truncated Parquet sample %s", sample.location)
+                return []
+        else:
+            source = _text_lines(sample.segments[0], sample.complete, encoding)
+        try:
+            rows = _until_error(self.rows(fmt, source, encoding), sample.location)
+            columns = sample_columns(rows, self.max_values, self.max_rows)
+        finally:
+            if hasattr(source, "close"):
+                source.close()
+        return detector.classify_columns(
+            provider, sample.location, columns.columns, self.min_hit_ratio
+        )
@@ -0,0 +1,91 @@
+"""Checksum validators that confirm regex hits for structured identifiers."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict
+
+# Takes the digits of a match (separators removed) and says whether they are valid.
+Validator = Callable[[str], bool]
+
+_NON_DIGITS = re.compile(r"\D")
+_TFN_WEIGHTS = (1, 4, 3, 7, 5, 8, 6, 9, 10)
+_TFN_LEGACY_WEIGHTS = (10, 7, 8, 4, 6, 3, 5, 1)
+_ABN_WEIGHTS = (10, 1, 3, 5, 7, 9, 11, 13, 15, 17, 19)
+_MEDICARE_WEIGHTS = (1, 3, 7, 9, 1, 3, 7, 9)
+
+
+def luhn(digits: str) -> bool:
+    """Luhn (mod 10) check used by payment card numbers."""
+
+    if not 12 <= len(digits) <= 19:
+        return False
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if index % 2:
+            value = value * 2 - 9 if value > 4 else value * 2
+        total += value
+    return total % 10 == 0
+
+
+def tfn(digits: str) -> bool:
+    """Tax File Number weighted checksum (mod 11), including legacy 8-digit TFNs."""
+
+    weights = {9: _TFN_WEIGHTS, 8: _TFN_LEGACY_WEIGHTS}.get(len(digits))
+    if weights is None:
+        return False
+    return sum(int(d) * w for d, w in zip(digits, weights, strict=True)) % 11 == 0
+
+
+def abn(digits: str) -> bool:
+    """Australian Business Number modulus-89 check."""
+
+    if len(digits) != 11 or digits[0] == "0":
+        return False
+    values = [int(digits[0]) - 1] + [int(d) for d in digits[1:]]
+    return sum(v * w for v, w in zip(values, _ABN_WEIGHTS, strict=True)) % 89 == 0
+
+
+def medicare(digits: str) -> bool:
+    """Medicare card check digit (9th digit), with an optional issue number and IRN."""
+
+    if len(digits) not in (10, 11) or digits[0] not in "23456":
+        return False
+    total = sum(int(d) * w for d, w in zip(digits[:8], _MEDICARE_WEIGHTS, strict=True))
+    return total % 10 == int(digits[8])
+
+
+VALIDATORS: Dict[str, Validator] = {
+    "luhn": luhn,
+    "tfn": tfn,
+    "abn": abn,
+    "medicare": medicare,
+}
+
+
+def register_validator(name: str, validator: Validator) -> None:
+    """Make ``validator`` available to rules as ``"validator": name``."""
+
+    VALIDATORS[name] = validator
+    _compiled_validator.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _compiled_validator(name: str) -> Callable[[str], bool]:
+    check = VALIDATORS[name]
+
+    # Repeated values (the same card on every row) are only checked once.
+    @lru_cache(maxsize=4096)
+    def validate(sample: str) -> bool:
+        return check(_NON_DIGITS.sub("", sample))
+
+    return validate
+
+
+def get_validator(name: str) -> Callable[[str], bool]:
+    """Return a memoized check that takes a raw match, separators included."""
+
+    if name not in VALIDATORS:
+        raise ValueError(f"Unknown PII validator: {name}")
+    return _compiled_validator(name)
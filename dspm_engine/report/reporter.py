@@ -1,52 +1,219 @@
 """Reporting utilities for DSPM findings."""
 from __future__ import annotations
 
+import gzip
 import json
+import os
+import threading
 from dataclasses import asdict
 from pathlib import Path
-from typing import Literal
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
+from dspm_engine.core import metrics
 from dspm_engine.core.misconfig import MisconfigurationDetector
 from dspm_engine.core.scanner import ScanResult
 
 TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+STREAM_CHUNK_CHARS = 64 * 1024
 
+ReportFormat = Literal["markdown", "json"]
 
-def _jinja_env() -> Environment:
-    """Construct a Jinja environment rooted at the templates directory."""
 
-    return Environment(
-        loader=FileSystemLoader(TEMPLATE_DIR),
-        autoescape=select_autoescape(),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+# One environment per template search path, shared by every Reporter in the process.
+_ENVIRONMENTS: Dict[Tuple[str, ...], Environment] = {}
+_BYTECODE_CACHE: Optional[FileSystemBytecodeCache] = None
+_ENVIRONMENT_LOCK = threading.Lock()
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    """Return the process-wide bytecode cache, in ``DSPM_TEMPLATE_CACHE`` if set.
+
+    Compiled templates survive restarts, so new processes skip Jinja's compiler.
+    Without the variable, Jinja picks a per-user temporary directory.
+    """
+
+    global _BYTECODE_CACHE
+    if _BYTECODE_CACHE is None:
+        directory = os.getenv("DSPM_TEMPLATE_CACHE")
+        if directory:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        _BYTECODE_CACHE = FileSystemBytecodeCache(directory)
+    return _BYTECODE_CACHE
+
+
+def precompile_templates(env: Environment) -> List[str]:
+    """Load and compile every template the environment can see; return their names."""
+
+    names = env.list_templates(extensions=["j2"])
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+def shared_environment(template_dir: Optional[Union[str, Path]] = None) -> Environment:
+    """Return the shared Jinja environment for an optional override directory.
+
+    Templates in ``template_dir`` (for example one tenant's branding) shadow the
+    bundled ones of the same name, and anything missing falls back to the bundled
+    templates. Each search path gets one environment, created and precompiled on
+    first use. All environments share one bytecode cache, which keys entries by
+    template file, so overrides never evict or collide with the bundled templates.
+    """
+
+    search_path = (str(Path(template_dir).resolve()),) if template_dir else ()
+    search_path += (str(TEMPLATE_DIR),)
+    with _ENVIRONMENT_LOCK:
+        env = _ENVIRONMENTS.get(search_path)
+        if env is None:
+            env = Environment(
+                loader=FileSystemLoader(list(search_path)),
+                autoescape=select_autoescape(),
+                trim_blocks=True,
+                lstrip_blocks=True,
+                bytecode_cache=_bytecode_cache(),
+            )
+            precompile_templates(env)
+            _ENVIRONMENTS[search_path] = env
+    return env
+
+
+def clear_environments() -> None:
+    """Drop the shared environments so the next reporter reloads its settings."""
+
+    global _BYTECODE_CACHE
+    with _ENVIRONMENT_LOCK:
+        _ENVIRONMENTS.clear()
+        _BYTECODE_CACHE = None
 
 
 class Reporter:
     """Generate Markdown or JSON reports from scan results."""
 
-    def __init__(self) -> None:
-        """Create a reporter with preconfigured Jinja environment."""
+    def __init__(self, template_dir: Optional[Union[str, Path]] = None) -> None:
+        """Create a reporter on the shared Jinja environment.
 
-        self.env = _jinja_env()
+        Args:
+            template_dir: Optional directory whose templates override the bundled
+                ones, such as a per-tenant ``report.md.j2``.
+        """
 
-    def render(self, result: ScanResult, fmt: Literal["markdown", "json"]) -> str:
+        self.env = shared_environment(template_dir)
+
+    def render(self, result: ScanResult, fmt: ReportFormat) -> str:
         """Render a scan result to the requested format."""
 
+        with metrics.timed("report"):
+            return "".join(self.iter_render(result, fmt))
+
+    def iter_render(self, result: ScanResult, fmt: ReportFormat) -> Iterator[str]:
+        """Yield the report in pieces without materializing the whole document.
+
+        Markdown comes from the template's ``generate()``; JSON is encoded one
+        section, and one list item, at a time. Joined, the pieces equal
+        :meth:`render`.
+        """
+
         if fmt == "json":
-            return json.dumps(
-                {
-                    "assets": result.assets.to_dict()["buckets"],
-                    "pii_findings": [asdict(finding) for finding in result.pii_findings],
-                    "misconfigurations": [asdict(finding) for finding in result.misconfigurations],
-                    "lineage": result.lineage.to_json(),
-                    "risk": asdict(result.risk),
-                },
-                indent=2,
-            )
+            return _iter_json_object(_json_sections(result))
         template = self.env.get_template("report.md.j2")
         sorted_findings = MisconfigurationDetector.sort_findings(result.misconfigurations)
-        return template.render(result=result, misconfigurations=sorted_findings)
+        return template.generate(result=result, misconfigurations=sorted_findings)
+
+    def stream(
+        self,
+        result: ScanResult,
+        fmt: ReportFormat,
+        destination: Union[str, Path, BinaryIO],
+        compress: bool = False,
+    ) -> int:
+        """Write the report to a path or binary file object (such as a socket file).
+
+        Pieces are written in chunks of about ``STREAM_CHUNK_CHARS`` characters.
+        With ``compress`` the output is gzip-encoded. Returns the number of
+        uncompressed bytes written. File objects are left open.
+        """
+
+        with metrics.timed("report"):
+            written = self._write(result, fmt, destination, compress)
+        metrics.REPORT_BYTES.inc(fmt, amount=written)
+        return written
+
+    def _write(
+        self,
+        result: ScanResult,
+        fmt: ReportFormat,
+        destination: Union[str, Path, BinaryIO],
+        compress: bool,
+    ) -> int:
+        """Open or wrap ``destination`` as needed and write the report pieces to it."""
+
+        if isinstance(destination, (str, Path)):
+            with open(destination, "wb") as handle:
+                return self._write(result, fmt, handle, compress)
+        if compress:
+            with gzip.GzipFile(fileobj=destination, mode="wb") as compressed:
+                return self._write(result, fmt, compressed, False)  # type: ignore[arg-type]
+        written = 0
+        for chunk in _batched(self.iter_render(result, fmt), STREAM_CHUNK_CHARS):
+            data = chunk.encode("utf-8")
+            destination.write(data)
+            written += len(data)
+        return written
+
+
+def _json_sections(result: ScanResult) -> Iterator[Tuple[str, Any]]:
+    """Yield the top-level JSON report keys; list sections are lazy iterators."""
+
+    yield "assets", (bucket.to_dict() for bucket in result.assets.buckets)
+    yield "pii_findings", (asdict(finding) for finding in result.pii_findings)
+    yield "column_findings", (asdict(finding) for finding in result.column_findings)
+    yield "pii_aggregates", (asdict(aggregate) for aggregate in result.pii_aggregates)
+    yield "misconfigurations", (asdict(finding) for finding in result.misconfigurations)
+    yield "lineage", result.lineage.to_json()
+    yield "risk", asdict(result.risk)
+    yield "errors", result.errors
+    yield "shards", (asdict(status) for status in result.shards)
+
+
+def _iter_json_object(sections: Iterable[Tuple[str, Any]]) -> Iterator[str]:
+    """Encode ``(key, value)`` pairs exactly like ``json.dumps(..., indent=2)``.
+
+    Iterator values are encoded as arrays one element at a time.
+    """
+
+    yield "{"
+    for index, (key, value) in enumerate(sections):
+        yield f"{',' if index else ''}\n  {json.dumps(key)}: "
+        if isinstance(value, Iterator):
+            yield from _iter_json_array(value)
+        else:
+            yield json.dumps(value, indent=2).replace("\n", "\n  ")
+    yield "\n}"
+
+
+def _iter_json_array(items: Iterator[Any]) -> Iterator[str]:
+    """Encode an array nested one level deep, one element at a time."""
+
+    separator = "[\n    "
+    for item in items:
+        yield separator + json.dumps(item, indent=2).replace("\n", "\n    ")
+        separator = ",\n    "
+    yield "[]" if separator.startswith("[") else "\n  ]"
+
+
+def _batched(pieces: Iterable[str], size: int) -> Iterator[str]:
+    """Join small pieces into chunks of roughly ``size`` characters."""
+
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
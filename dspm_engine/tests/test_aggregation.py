@@ -0,0 +1,66 @@
+import pytest
+
+from dspm_engine.core.aggregation import FindingAggregator, mask_sample
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.risk_score import RiskAssessor
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.report.reporter import Reporter
+
+
+def test_mask_sample_keeps_separators_and_last_digits():
+    assert mask_sample("4111 1111 1111 1234") == "**** **** **** 1234"
+    assert mask_sample("123") == "123"
+    with pytest.raises(ValueError):
+        FindingAggregator(max_examples=-1)
+
+
+def test_aggregates_count_every_match_with_a_bounded_reservoir():
+    rows = "\n".join(f"customer {i}: TFN 123 456 {i % 1000:03d}" for i in range(5000))
+    asset = StorageAsset(name="crm", provider="aws", sample_content=rows)
+    detector = PiiDetector.from_default_rules()
+
+    findings = detector.scan_content_samples("aws", [asset])
+    aggregates = detector.aggregate_content_samples("aws", [asset], max_examples=3)
+
+    tfn = [aggregate for aggregate in aggregates if aggregate.type == "TFN"]
+    assert len(tfn) == 1
+    assert tfn[0].count == sum(finding.type == "TFN" for finding in findings) == 5000
+    assert tfn[0].first_offset == rows.index("123 456 000")
+    assert tfn[0].last_offset == rows.rindex("123 456 999")
+    assert len(tfn[0].examples) == 3
+    assert all(example.startswith("*** **") for example in tfn[0].examples)
+    assert RiskAssessor().calculate(aggregates, []) == RiskAssessor().calculate(findings, [])
+
+
+def test_sampled_tail_offsets_are_object_offsets():
+    from dspm_engine.core.prefilter import ContentRouter
+    from dspm_engine.core.sampling import ObjectSample
+
+    head, tail = b"TFN 123 456 789\n", b"TFN 987 654 321\n"
+    sample = ObjectSample(
+        "aws://crm/export.txt", [head, tail], size=1_000_000, offsets=[0, 1_000_000 - len(tail)]
+    )
+    for prefilter in (None, ContentRouter()):
+        detector = PiiDetector.from_default_rules(prefilter=prefilter)
+        (tfn,) = detector.aggregate_object_samples("aws", [sample])
+        assert (tfn.first_offset, tfn.last_offset) == (4, 1_000_000 - len(tail) + 4)
+
+def test_scanner_aggregates_are_scored_reported_and_cached():
+    expected = Scanner().scan(["aws", "azure"])
+    cache = ResultCache()
+    scanner = Scanner(aggregate_pii=True, result_cache=cache)
+
+    first = scanner.scan(["aws", "azure"])
+    second = scanner.scan(["aws", "azure"])
+
+    assert first.pii_findings == [] and first.pii_aggregates
+    assert sum(aggregate.count for aggregate in first.pii_aggregates) == len(
+        expected.pii_findings
+    )
+    assert first.risk == expected.risk
+    assert second.cache_stats.hits == len(second.assets.buckets)
+    assert second.pii_aggregates == first.pii_aggregates
+    assert "| Matches |" in Reporter().render(first, fmt="markdown")
+    assert '"pii_aggregates"' in Reporter().render(first, fmt="json")
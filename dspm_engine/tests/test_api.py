@@ -0,0 +1,90 @@
+from fastapi.testclient import TestClient
+
+from dspm_engine.api.server import app
+
+
+def test_scan_and_misconfigurations_serialize_findings():
+    client = TestClient(app)
+    response = client.post("/scan", json=["aws"])
+    assert response.status_code == 200
+    scanned = response.json()["misconfigurations"]
+    assert scanned and {"resource", "issue", "severity"} <= set(scanned[0])
+
+    listed = client.get(
+        "/misconfigurations", params={"snapshot_id": response.headers["X-Snapshot-Id"]}
+    )
+    assert listed.status_code == 200
+    assert listed.json() == scanned
+
+
+def test_aggregated_scans_serve_pii_aggregates(monkeypatch):
+    from dspm_engine.api import server
+    from dspm_engine.core.scanner import Scanner
+
+    monkeypatch.setattr(server, "get_scanner", lambda: Scanner(aggregate_pii=True))
+    client = TestClient(app)
+    snapshot_id = client.post("/scan", json=["aws"]).headers["X-Snapshot-Id"]
+
+    params = {"snapshot_id": snapshot_id}
+    assert client.get("/sensitive-data", params=params).json() == []
+    aggregates = client.get("/sensitive-data/aggregates", params=params).json()
+    assert aggregates and all(item["count"] >= 1 for item in aggregates)
+    tfn = client.get("/sensitive-data/aggregates", params={**params, "type": "TFN"}).json()
+    assert tfn and {item["type"] for item in tfn} == {"TFN"}
+
+
+def test_default_reads_ignore_snapshots_of_a_provider_subset(monkeypatch):
+    from dspm_engine.api import server
+    from dspm_engine.api.snapshots import SnapshotStore
+    from dspm_engine.core.providers import provider_names
+
+    monkeypatch.setattr(server, "snapshots", SnapshotStore())
+    client = TestClient(app)
+    subset = client.post("/scan", json=["AWS"]).headers["X-Snapshot-Id"]
+
+    response = client.get("/risk-score")
+    assert response.headers["X-Snapshot-Id"] != subset
+    assert server.snapshots.get(response.headers["X-Snapshot-Id"]).providers == tuple(
+        provider_names()
+    )
+
+
+def test_scan_response_and_json_report_include_shard_statuses():
+    import json
+
+    from dspm_engine.api.server import ScanResponse
+    from dspm_engine.core.scanner import Scanner
+    from dspm_engine.core.shards import expand_shards
+    from dspm_engine.report.reporter import Reporter
+
+    plan = expand_shards({"providers": {"gcp": {"projects": ["one", "two"]}}})
+    result = Scanner().scan_shards(plan)
+
+    shards = [status.model_dump() for status in ScanResponse.from_result(result).shards]
+    assert [(item["shard"], item["status"]) for item in shards] == [
+        ("gcp/*/one", "completed"),
+        ("gcp/*/two", "completed"),
+    ]
+    assert json.loads(Reporter().render(result, "json"))["shards"] == shards
+
+
+def test_lifespan_stops_jobs_and_closes_the_scanner(monkeypatch):
+    from dspm_engine.api import server
+    from dspm_engine.core.scanner import Scanner
+
+    closed = []
+
+    class ClosingScanner(Scanner):
+        def close(self):
+            closed.append("scanner")
+
+    class Jobs:
+        def shutdown(self):
+            closed.append("jobs")
+
+    monkeypatch.setattr(server, "jobs", Jobs())
+    monkeypatch.setattr(server, "_scanner", ClosingScanner())
+    with TestClient(app):
+        assert closed == []
+    assert closed == ["jobs", "scanner"]
+    assert server._scanner is None
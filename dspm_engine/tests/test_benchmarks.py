@@ -0,0 +1,61 @@
+import pytest
+
+from dspm_engine.benchmarks import suite
+from dspm_engine.benchmarks.estate import (
+    EstateProfile,
+    EstateScanner,
+    by_provider,
+    generate_assets,
+    payload_pool,
+)
+
+
+def test_estate_is_reproducible_and_follows_its_profile():
+    profile = EstateProfile(assets=3000, public_ratio=0.2, pii_density=0.5, variants=16)
+    assets = list(generate_assets(profile))
+    assert assets == list(generate_assets(profile))
+    assert assets != list(generate_assets(EstateProfile(assets=3000, seed=1)))
+    assert {len(group) for group in by_provider(assets).values()} == {1000}
+    assert sum(asset.public for asset in assets) == pytest.approx(600, rel=0.15)
+
+    _, sensitive = payload_pool(profile)
+    assert sum(asset.sample_content in sensitive for asset in assets) == pytest.approx(
+        1500, rel=0.1
+    )
+    assert any(payload.startswith("id,region") for payload in sensitive)
+
+    result = EstateScanner(by_provider(assets[:300])).scan(["aws", "azure", "gcp"])
+    assert {finding.validated for finding in result.pii_findings} == {True, False}
+    assert result.misconfigurations
+    with pytest.raises(ValueError):
+        EstateProfile(public_ratio=1.5)
+
+
+def test_suite_runs_every_case_and_flags_regressions(tmp_path, monkeypatch):
+    monkeypatch.setattr(suite, "MIN_SAMPLE_SECONDS", 0.0)
+    profile = EstateProfile(variants=8)
+    results = suite.run(["60"], profile=profile)
+    assert [(r.case, r.scale, r.items > 0) for r in results] == [
+        (case, "60", True) for case in suite.CASES
+    ]
+    assert all(r.peak_mb is not None for r in results)
+    assert suite.parse_scale("1M") == ("1M", 1_000_000)
+    with pytest.raises(ValueError):
+        suite.parse_scale("lots")
+
+    path = tmp_path / "baseline.json"
+    suite.save_baseline(results, path, profile)
+    baseline = suite.load_baseline(path)
+    assert suite.compare(results, baseline, profile) == []
+
+    slower = suite.BenchmarkResult("scan", "60", 60, 1.0, 1.0, peak_mb=1e6)
+    regressions = suite.compare([slower], baseline, profile)
+    assert [r.metric for r in regressions] == ["throughput", "peak_mb"]
+    assert regressions[0].change < -0.25
+    with pytest.raises(ValueError):
+        suite.compare(results, baseline, EstateProfile(seed=5))
+
+    suite.save_baseline([slower], path, profile)
+    merged = suite.load_baseline(path)["results"]
+    assert len(merged) == len(suite.CASES)
+    assert next(entry for entry in merged if entry["case"] == "scan")["throughput"] == 1.0
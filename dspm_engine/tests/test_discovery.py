@@ -0,0 +1,344 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from dspm_engine.core.discovery import AdaptiveBackoff, bounded_map, paginate
+
+
+class Throttled(Exception):
+    pass
+
+
+def _backoff(sleeps, **kwargs):
+    return AdaptiveBackoff(
+        lambda exc: isinstance(exc, Throttled), sleep=sleeps.append, jitter=lambda: 1.0, **kwargs
+    )
+
+
+def test_backoff_retries_throttles_and_adapts_delay():
+    sleeps = []
+    backoff = _backoff(sleeps, base_delay=0.1)
+    outcomes = iter([Throttled(), Throttled(), "ok"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert backoff.call(flaky) == "ok"
+    assert sleeps == [0.1, 0.2]
+    assert backoff.throttled == 2
+    assert backoff.delay == pytest.approx(0.1)
+    backoff.call(lambda: None)
+    assert backoff.delay == 0.0
+
+
+def test_backoff_gives_up_and_passes_other_errors_through():
+    backoff = _backoff([], max_attempts=3)
+    calls = []
+
+    def always_throttled():
+        calls.append(1)
+        raise Throttled()
+
+    with pytest.raises(Throttled):
+        backoff.call(always_throttled)
+    assert len(calls) == 3
+    with pytest.raises(KeyError):
+        backoff.call(lambda: {}["missing"])
+
+
+def test_paginate_retries_a_throttled_page_from_its_token():
+    pages = {None: ([1, 2], "a"), "a": ([3], "b"), "b": ([4, 5], None)}
+    requested = []
+    failed = set()
+
+    def fetch(token):
+        requested.append(token)
+        if token == "a" and token not in failed:
+            failed.add(token)
+            raise Throttled()
+        return pages[token]
+
+    items = paginate(fetch, _backoff([]))
+    assert next(items) == 1
+    assert requested == [None]
+    assert list(items) == [2, 3, 4, 5]
+    assert requested == [None, "a", "a", "b"]
+
+
+def test_bounded_map_preserves_order_and_limits_in_flight():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def lookup(item):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.001 * (item % 3))
+        with lock:
+            state["active"] -= 1
+        return item * 2
+
+    assert list(bounded_map(lookup, range(40), max_workers=4)) == [i * 2 for i in range(40)]
+    assert state["peak"] <= 4
+
+
+def test_s3_discovery_reads_posture_from_moto(monkeypatch):
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    from dspm_engine.core.storage_aws import AwsStorageScanner
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        for name in ("open", "plain", "secure"):
+            client.create_bucket(
+                Bucket=name, CreateBucketConfiguration={"LocationConstraint": "ap-southeast-2"}
+            )
+        client.put_bucket_acl(Bucket="open", ACL="public-read")
+        client.put_bucket_policy(
+            Bucket="plain",
+            Policy=json.dumps(
+                {
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Principal": "*",
+                            "Action": "s3:GetObject",
+                            "Resource": "arn:aws:s3:::plain/*",
+                        }
+                    ]
+                }
+            ),
+        )
+        client.put_bucket_versioning(
+            Bucket="secure", VersioningConfiguration={"Status": "Enabled"}
+        )
+        client.put_bucket_encryption(
+            Bucket="secure",
+            ServerSideEncryptionConfiguration={
+                "Rules": [{"ApplyServerSideEncryptionByDefault": {"SSEAlgorithm": "aws:kms"}}]
+            },
+        )
+        client.put_bucket_tagging(
+            Bucket="secure", Tagging={"TagSet": [{"Key": "backup", "Value": "true"}]}
+        )
+
+        scanner = AwsStorageScanner.connect(region="us-east-1", max_workers=2)
+        assets = {asset.name: asset for asset in scanner.iter_buckets()}
+
+    assert set(assets) == {"open", "plain", "secure"}
+    assert assets["open"].public and assets["open"].policy == "restricted"
+    assert assets["plain"].public and assets["plain"].policy == "allow-all"
+    secure = assets["secure"]
+    assert not secure.public
+    assert secure.encryption == "AWS:KMS"
+    assert secure.versioning
+    assert secure.region == "ap-southeast-2"
+    assert secure.tags == {"backup": "true"}
+
+
+def test_s3_unreadable_posture_is_unknown_not_insecure():
+    from dspm_engine.core.misconfig import MisconfigurationDetector
+    from dspm_engine.core.models import UNKNOWN_ENCRYPTION, UNKNOWN_POLICY
+    from dspm_engine.core.storage_aws import AwsStorageScanner
+
+    class AccessDenied(Exception):
+        response = {"Error": {"Code": "AccessDenied"}}
+
+    class DeniedClient:
+        def __getattr__(self, operation):
+            def call(**kwargs):
+                raise AccessDenied(operation)
+
+            return call
+
+    asset = AwsStorageScanner(client=DeniedClient()).describe_bucket("locked")
+
+    assert asset.region is None
+    assert asset.encryption == UNKNOWN_ENCRYPTION
+    assert asset.policy == UNKNOWN_POLICY
+    assert asset.public is None and asset.versioning is None
+    assert asset.posture_unknown == (
+        "encryption",
+        "policy",
+        "public",
+        "region",
+        "tags",
+        "versioning",
+    )
+    assert MisconfigurationDetector().evaluate_assets("aws", [asset]) == []
+
+
+def test_s3_observed_exposure_survives_other_failed_lookups():
+    from dspm_engine.core.storage_aws import PUBLIC_GRANTEES, AwsStorageScanner
+
+    class AccessDenied(Exception):
+        response = {"Error": {"Code": "AccessDenied"}}
+
+    class PartlyDeniedClient:
+        def get_bucket_acl(self, **kwargs):
+            return {"Grants": [{"Grantee": {"URI": next(iter(PUBLIC_GRANTEES))}}]}
+
+        def __getattr__(self, operation):
+            def call(**kwargs):
+                raise AccessDenied(operation)
+
+            return call
+
+    asset = AwsStorageScanner(client=PartlyDeniedClient()).describe_bucket("open")
+    assert asset.public is True
+    assert "public" not in asset.posture_unknown
+
+
+class Forbidden(Exception):
+    status_code = 403
+    code = 403
+
+
+def test_azure_denied_access_policy_marks_only_that_container_unknown():
+    from types import SimpleNamespace
+
+    from dspm_engine.core.models import UNKNOWN_POLICY
+    from dspm_engine.core.storage_azure import AzureStorageScanner
+
+    class Container:
+        def __init__(self, name):
+            self.name = name
+
+        def get_container_access_policy(self):
+            if self.name == "locked":
+                raise Forbidden()
+            return {"public_access": "container"}
+
+    class Client:
+        def get_container_client(self, name):
+            return Container(name)
+
+    scanner = AzureStorageScanner(client=Client())
+    listed = [
+        SimpleNamespace(
+            name=name,
+            encryption_scope=None,
+            immutable_storage_with_versioning_enabled=True,
+            metadata={},
+        )
+        for name in ("locked", "open")
+    ]
+    locked, open_ = bounded_map(scanner.describe_container, listed, 2)
+
+    assert locked.public is None and locked.policy == UNKNOWN_POLICY
+    assert locked.posture_unknown == ("policy", "public")
+    assert locked.versioning and locked.encryption == "MICROSOFT_MANAGED"
+    assert open_.public and open_.policy == "allow-all" and not open_.posture_unknown
+
+
+def test_gcs_denied_iam_policy_marks_only_that_bucket_unknown():
+    from types import SimpleNamespace
+
+    from dspm_engine.core.models import UNKNOWN_POLICY
+    from dspm_engine.core.storage_gcp import GcpStorageScanner
+
+    def bucket(name, get_iam_policy):
+        return SimpleNamespace(
+            name=name,
+            iam_configuration=SimpleNamespace(public_access_prevention="inherited"),
+            get_iam_policy=get_iam_policy,
+            default_kms_key_name=None,
+            versioning_enabled=False,
+            location="US",
+            labels={},
+        )
+
+    def denied(**kwargs):
+        raise Forbidden()
+
+    def open_policy(**kwargs):
+        return SimpleNamespace(bindings=[{"members": ["allUsers"]}])
+
+    scanner = GcpStorageScanner(client=object())
+    locked, open_ = bounded_map(
+        scanner.describe_bucket, [bucket("locked", denied), bucket("open", open_policy)], 2
+    )
+
+    assert locked.public is None and locked.policy == UNKNOWN_POLICY
+    assert locked.posture_unknown == ("policy", "public")
+    assert locked.versioning is False and locked.region == "us"
+    assert open_.public and open_.policy == "allUsers" and not open_.posture_unknown
+
+
+def test_unknown_posture_is_reported_in_scan_errors(monkeypatch):
+    from dspm_engine.core.models import StorageAsset
+    from dspm_engine.core.scanner import Scanner
+
+    scanner = Scanner()
+    original = scanner._scan_provider
+
+    def with_locked(provider):
+        yield from original(provider)
+        yield StorageAsset(
+            name="locked", provider="aws", public=None, posture_unknown=("public",)
+        )
+
+    monkeypatch.setattr(scanner, "_scan_provider", with_locked)
+    result = scanner.scan(["aws"])
+    assert result.errors == {"aws/locked": "PostureUnknown: could not read public"}
+    summary = scanner.stream(["aws"]).run(lambda batch: None)
+    assert summary.errors == result.errors
+
+
+@pytest.mark.skipif(
+    not os.getenv("AZURITE_CONNECTION_STRING"), reason="requires a running Azurite emulator"
+)
+def test_azure_discovery_against_azurite():
+    from dspm_engine.core.storage_azure import AzureStorageScanner
+
+    scanner = AzureStorageScanner.connect(os.environ["AZURITE_CONNECTION_STRING"], page_size=2)
+    prefix = f"dspm{uuid.uuid4().hex[:8]}"
+    created = [f"{prefix}-{index}" for index in range(3)]
+    for index, name in enumerate(created):
+        scanner.client.create_container(
+            name, public_access="container" if index == 0 else None, metadata={"owner": "qa"}
+        )
+    try:
+        assets = {a.name: a for a in scanner.iter_containers() if a.name.startswith(prefix)}
+    finally:
+        for name in created:
+            scanner.client.delete_container(name)
+
+    assert set(assets) == set(created)
+    assert assets[created[0]].public and assets[created[0]].policy == "allow-all"
+    assert not assets[created[1]].public
+    assert assets[created[1]].encryption == "MICROSOFT_MANAGED"
+    assert assets[created[1]].tags == {"owner": "qa"}
+
+
+@pytest.mark.skipif(
+    not os.getenv("STORAGE_EMULATOR_HOST"), reason="requires a running fake GCS server"
+)
+def test_gcs_discovery_against_fake_server():
+    from dspm_engine.core.storage_gcp import GcpStorageScanner
+
+    scanner = GcpStorageScanner.connect(project="test-project", page_size=2)
+    prefix = f"dspm-{uuid.uuid4().hex[:8]}"
+    created = [f"{prefix}-{index}" for index in range(3)]
+    for name in created:
+        bucket = scanner.client.bucket(name)
+        bucket.labels = {"backup": "true"}
+        scanner.client.create_bucket(bucket, location="australia-southeast1")
+    try:
+        assets = {a.name: a for a in scanner.iter_buckets() if a.name.startswith(prefix)}
+    finally:
+        for name in created:
+            scanner.client.bucket(name).delete()
+
+    assert set(assets) == set(created)
+    assert all(asset.encryption == "GOOGLE_MANAGED" for asset in assets.values())
+    assert all(asset.tags == {"backup": "true"} for asset in assets.values())
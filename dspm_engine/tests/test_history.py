@@ -0,0 +1,89 @@
+import pytest
+
+from dspm_engine.core.history import ScanHistory
+from dspm_engine.core.pii_detector import PiiDetector, PiiRule
+from dspm_engine.core.scanner import Scanner
+
+
+def _detector(drop=(), extra=()):
+    rules = [rule for rule in PiiDetector.from_default_rules().rules if rule.name not in drop]
+    return PiiDetector([*rules, *extra])
+
+
+def test_diff_reports_new_resolved_and_persistent_findings(tmp_path):
+    history = ScanHistory(tmp_path / "history.sqlite")
+    first = Scanner(history=history).scan(["aws"])
+    bsb = PiiRule(name="BSB", pattern=r"\b\d{3}-\d{3}\b", description="Bank state branch")
+    Scanner(pii_detector=_detector(drop={"TFN"}, extra=[bsb]), history=history).scan(["aws"])
+
+    base, head = history.latest_pair()
+    diff = history.diff(base, head)
+    assert {(f.kind, f.rule) for f in diff.resolved} == {("pii", "TFN")}
+    assert {f.rule for f in diff.new} == {"BSB"}
+    assert len(diff.persistent) == len(first.misconfigurations) + len(
+        {(f.type, f.location) for f in first.pii_findings if f.type != "TFN"}
+    )
+    assert history.diff(base, head, rule="TFN", kind="pii").persistent == []
+    assert history.diff(base, head, provider="gcp").resolved == []
+    with pytest.raises(KeyError):
+        history.diff(base, 999)
+    with pytest.raises(ValueError):
+        history.diff(base, head, kind="lineage")
+
+    samples = {finding.sample for finding in first.pii_findings}
+    stored = history._query("SELECT location, rule, resource FROM scan_findings")
+    assert not any(sample in value for row in stored for value in row for sample in samples)
+
+
+def test_providers_missing_from_either_scan_are_not_diffed():
+    history = ScanHistory()
+    Scanner(history=history).scan(["aws", "azure"])
+    Scanner(history=history).scan(["aws"])
+    diff = history.diff(*history.latest_pair())
+    assert diff.new == diff.resolved == []
+    assert {finding.provider for finding in diff.persistent} == {"aws"}
+
+
+def test_trend_tracks_scores_and_filtered_counts_and_aggregates_match_findings():
+    history = ScanHistory()
+    for created_at, aggregate in ((100.0, False), (200.0, True), (300.0, False)):
+        result = Scanner(aggregate_pii=aggregate).scan(["aws", "gcp"])
+        history.record(result, ["aws", "gcp"], created_at=created_at)
+
+    points = history.trend()
+    assert [point.created_at for point in points] == [100.0, 200.0, 300.0]
+    assert len({(p.score, p.findings, p.matches) for p in points}) == 1
+    assert [p.scan_id for p in history.trend(limit=2)] == [2, 3]
+    assert [p.scan_id for p in history.trend(since=150.0, until=250.0)] == [2]
+    assert {p.findings for p in history.trend(rule="TFN")} == {1}
+    assert {p.findings for p in history.trend(provider="azure")} == {0}
+    assert [record.id for record in history.scans(limit=2)] == [3, 2]
+    diff = history.diff(1, 2)
+    assert diff.new == diff.resolved == [] and diff.persistent
+
+
+def test_legacy_history_accepts_unknown_posture_flags(tmp_path):
+    import sqlite3
+
+    from dspm_engine.core import history as history_module
+    from dspm_engine.core.models import StorageAsset
+
+    path = tmp_path / "history.sqlite"
+    legacy = history_module._SCHEMA.replace("public INTEGER,", "public INTEGER NOT NULL,")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(legacy.replace("versioning INTEGER,", "versioning INTEGER NOT NULL,"))
+
+    history = ScanHistory(path)
+    scanner = Scanner(history=history)
+    original = scanner._scan_provider
+
+    def with_locked(provider):
+        yield from original(provider)
+        yield StorageAsset(name="locked", provider="aws", public=None, versioning=None)
+
+    scanner._scan_provider = with_locked
+    scanner.scan(["aws"])
+    stored = history._query(
+        "SELECT public, versioning FROM scan_assets WHERE resource = 'locked'"
+    )
+    assert stored == [(None, None)]
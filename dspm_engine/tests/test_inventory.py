@@ -0,0 +1,62 @@
+import json
+
+from dspm_engine.core.inventory import CompactInventory
+from dspm_engine.core.models import AssetInventory, StorageAsset
+from dspm_engine.core.scanner import Scanner
+
+
+def test_compact_inventory_round_trips_rows_and_filters():
+    inventory = Scanner().scan(["aws", "azure", "gcp"]).assets
+    compact = inventory.compact()
+    assert list(compact) == inventory.buckets
+    assert [compact[row].name for row in compact.public_assets()] == [
+        asset.name for asset in inventory.buckets if asset.public
+    ]
+    assert [compact[row].name for row in compact.unencrypted_assets()] == [
+        asset.name for asset in inventory.buckets if not asset.encryption
+    ]
+    assert [asset.name for asset in compact.select(region="ap-southeast-2", public=False)] == [
+        "finance-uploads"
+    ]
+    expected = inventory.buckets[0].to_dict()
+    del expected["sample_content"]
+    assert json.loads(compact.to_json())[0] == expected
+
+
+def test_category_columns_widen_past_256_values():
+    assets = [StorageAsset(name=f"b{i}", provider="aws", region=f"r{i}") for i in range(300)]
+    compact = CompactInventory.from_assets(assets)
+    assert compact.where(region="r299") == [299]
+    assert compact[257].region == "r257"
+
+
+def test_asset_to_dict_copies_tags():
+    asset = StorageAsset(name="b", provider="aws", tags={"backup": "true"})
+    record = AssetInventory([asset]).to_dict()["buckets"][0]
+    record["tags"]["backup"] = "false"
+    assert asset.tags == {"backup": "true"}
+
+
+def test_unknown_flags_round_trip_and_match_no_filter():
+    from dspm_engine.core.misconfig import MisconfigurationDetector
+
+    unknown = StorageAsset(
+        name="locked",
+        provider="aws",
+        public=None,
+        encryption="AES256",
+        versioning=None,
+        posture_unknown=("public", "versioning"),
+    )
+    known = StorageAsset(name="open", provider="aws", public=True, versioning=False)
+    compact = CompactInventory.from_assets([unknown, known])
+
+    assert list(compact) == [unknown, known]
+    assert compact.where(public=True) == [1]
+    assert compact.where(public=False) == compact.where(versioning=True) == []
+    assert json.loads(compact.to_json())[0]["posture_unknown"] == ["public", "versioning"]
+    assert compact.to_columns()["public"] == [None, True]
+    detector = MisconfigurationDetector()
+    findings = detector.evaluate_assets("aws", [unknown, known])
+    assert detector.evaluate_inventory("aws", compact) == findings
+    assert {finding.resource for finding in findings} == {"open"}
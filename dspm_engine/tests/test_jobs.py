@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from dspm_engine.api.jobs import CANCELLED, SUCCEEDED, JobManager, JobQueueFull
+from dspm_engine.api.snapshots import SnapshotStore
+from dspm_engine.core.scanner import Scanner
+
+
+def _wait(manager, job_id):
+    for _ in range(200):
+        job = manager.get(job_id)
+        if job.finished_at is not None:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_reports_per_provider_progress_and_snapshot():
+    store = SnapshotStore()
+    scanner = Scanner()
+
+    def runner(providers, progress):
+        return store.add(scanner.scan(providers, progress=progress), providers)
+
+    manager = JobManager(runner)
+    try:
+        job = _wait(manager, manager.submit(["aws", "gcp"]).id)
+    finally:
+        manager.shutdown()
+    assert job.status == SUCCEEDED
+    assert store.get(job.snapshot_id) is not None
+    assert {name: (p.stage, p.discovered, p.classified) for name, p in job.progress.items()} == {
+        "aws": ("classified", 2, 2),
+        "gcp": ("classified", 2, 2),
+    }
+
+
+def test_running_job_can_be_cancelled_and_queue_is_bounded():
+    release = threading.Event()
+    scanner = Scanner()
+
+    def runner(providers, progress):
+        progress(providers[0], "started", 0)
+        release.wait(5)
+        return scanner.scan(providers, progress=progress)
+
+    manager = JobManager(runner, max_concurrent=1, max_queue=1)
+    try:
+        running = manager.submit(["aws"])
+        queued = manager.submit(["gcp"])
+        with pytest.raises(JobQueueFull):
+            manager.submit(["azure"])
+        manager.cancel(queued.id)
+        manager.cancel(running.id)
+        release.set()
+        assert _wait(manager, running.id).status == CANCELLED
+        assert _wait(manager, queued.id).status == CANCELLED
+    finally:
+        manager.shutdown()
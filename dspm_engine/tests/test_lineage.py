@@ -0,0 +1,49 @@
+from dspm_engine.core.lineage import LineageGraph
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.scanner import Scanner
+
+
+def _assets(provider, *names):
+    return [StorageAsset(name=name, provider=provider) for name in names]
+
+
+def test_providers_sharing_a_prefix_are_not_linked():
+    lineage = LineageGraph()
+    lineage.add_provider_assets("aws", _assets("aws", "a", "b"))
+    lineage.add_provider_assets("aws-gov", _assets("aws-gov", "c"))
+    lineage.add_provider_assets("aws", _assets("aws", "d"))
+    assert sorted(lineage.graph.edges) == [("aws:a", "aws:b"), ("aws:b", "aws:d")]
+
+
+def test_replace_provider_assets_removes_vanished_nodes():
+    lineage = LineageGraph()
+    lineage.replace_provider_assets("gcp", _assets("gcp", "a", "b", "c"))
+    lineage.replace_provider_assets("azure", _assets("azure", "x", "y"))
+    lineage.replace_provider_assets("gcp", _assets("gcp", "a", "c"))
+    assert set(lineage.graph.nodes) == {"gcp:a", "gcp:c", "azure:x", "azure:y"}
+    assert sorted(lineage.graph.edges) == [("azure:x", "azure:y"), ("gcp:a", "gcp:c")]
+
+
+def test_repeated_scans_do_not_grow_lineage():
+    for mode in ("per_scan", "incremental"):
+        scanner = Scanner(lineage_mode=mode)
+        first = scanner.scan(["aws", "gcp"]).lineage.to_json()
+        for _ in range(3):
+            latest = scanner.scan(["aws", "gcp"]).lineage.to_json()
+        assert sorted(latest["nodes"]) == sorted(first["nodes"])
+        assert sorted(latest["edges"]) == sorted(first["edges"])
+
+
+def test_inserted_assets_relink_their_neighbours():
+    lineage = LineageGraph()
+    lineage.add_provider_assets("aws", _assets("aws", "a", "c"))
+    lineage.add_provider_assets("aws", _assets("aws", "b"))
+    assert sorted(lineage.graph.edges) == [("aws:a", "aws:b"), ("aws:b", "aws:c")]
+
+
+def test_incremental_results_keep_their_own_lineage():
+    scanner = Scanner(lineage_mode="incremental")
+    first = scanner.scan(["aws"])
+    before = first.lineage.to_json()
+    scanner.scan(["gcp"])
+    assert first.lineage.to_json() == before
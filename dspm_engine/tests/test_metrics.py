@@ -0,0 +1,91 @@
+import io
+
+import pytest
+
+from dspm_engine.core import metrics
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.scanner import ScanCancelled, Scanner
+from dspm_engine.report.reporter import Reporter
+
+
+@pytest.fixture
+def recording():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.enable(False)
+    metrics.REGISTRY.reset()
+
+
+def _values(name):
+    return {
+        tuple(entry["labels"].values()): entry
+        for entry in metrics.REGISTRY.summary()[name]["values"]
+    }
+
+
+def test_disabled_instrumentation_records_nothing():
+    assert not metrics.is_enabled()
+    assert metrics.timed("pii", "aws") is metrics.timed("scan")
+    items = [1, 2]
+    assert metrics.timed_iter(items, "discover") is items
+    Scanner().scan(["aws"])
+    assert all(not family["values"] for family in metrics.REGISTRY.summary().values())
+
+
+def test_scan_and_report_record_stage_timings_and_counters(recording):
+    scanner = Scanner(result_cache=ResultCache())
+    result = scanner.scan(["aws", "azure", "gcp"])
+    scanner.scan(["aws", "azure", "gcp"])
+    written = Reporter().stream(result, "json", io.BytesIO())
+
+    stages = _values("dspm_stage_duration_seconds")
+    for stage in ("discover", "pii", "misconfig", "lineage"):
+        assert stages[(stage, "aws")]["count"] >= 1
+    assert stages[("scan", "")]["count"] == 2
+    assert stages[("report", "")]["count"] == 1
+    assert _values("dspm_assets_processed_total")[("aws",)]["value"] == 4
+    assert _values("dspm_bytes_processed_total")[("aws",)]["value"] > 0
+    assert _values("dspm_cache_lookups_total") == {
+        ("hit",): {"labels": {"result": "hit"}, "value": 6},
+        ("miss",): {"labels": {"result": "miss"}, "value": 6},
+    }
+    findings = _values("dspm_findings_total")
+    assert findings[("pii", "TFN")]["value"] == 2 * sum(
+        finding.type == "TFN" for finding in result.pii_findings
+    )
+    assert _values("dspm_scans_total")[("completed",)]["value"] == 2
+    assert _values("dspm_scans_in_flight")[()]["value"] == 0
+    assert _values("dspm_report_bytes_total")[("json",)]["value"] == written
+
+
+def test_cancelled_and_streamed_scans_are_counted(recording):
+    def cancel(provider, stage, count):
+        assert _values("dspm_scans_in_flight")[()]["value"] == 1
+        raise ScanCancelled()
+
+    with pytest.raises(ScanCancelled):
+        Scanner().scan(["aws"], progress=cancel)
+    summary = Scanner(aggregate_pii=True).stream(["aws"]).run(lambda batch: None)
+
+    assert _values("dspm_scans_total")[("cancelled",)]["value"] == 1
+    assert _values("dspm_scans_total")[("completed",)]["value"] == 1
+    assert _values("dspm_assets_processed_total")[("aws",)]["value"] == summary.assets
+    assert ("discover", "aws") in _values("dspm_stage_duration_seconds")
+
+
+def test_prometheus_text_exposition(recording):
+    histogram = metrics.STAGE_SECONDS
+    histogram.observe(0.002, "pii", 'odd"name\\')
+    histogram.observe(400.0, "pii", 'odd"name\\')
+    with pytest.raises(ValueError):
+        metrics.FINDINGS.inc("pii")
+
+    lines = recording.render().splitlines()
+    assert "# TYPE dspm_stage_duration_seconds histogram" in lines
+    labels = 'stage="pii",provider="odd\\"name\\\\"'
+    assert f'dspm_stage_duration_seconds_bucket{{{labels},le="0.001"}} 0' in lines
+    assert f'dspm_stage_duration_seconds_bucket{{{labels},le="0.005"}} 1' in lines
+    assert f'dspm_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"dspm_stage_duration_seconds_count{{{labels}}} 2" in lines
+    assert f"dspm_stage_duration_seconds_sum{{{labels}}} 400.002" in lines
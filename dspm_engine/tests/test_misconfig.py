@@ -1,4 +1,10 @@
-from dspm_engine.core.misconfig import MisconfigurationDetector
+import json
+
+import pytest
+
+from dspm_engine.core.inventory import CompactInventory
+from dspm_engine.core.misconfig import MisconfigRule, MisconfigurationDetector
+from dspm_engine.core.models import StorageAsset
 from dspm_engine.core.storage_gcp import GcpStorageScanner
 
 
@@ -9,3 +15,71 @@ def test_misconfiguration_detector_flags_public_and_unencrypted():
     severities = {finding.severity for finding in findings}
     assert "CRITICAL" in severities  # public bucket
     assert "HIGH" in severities  # missing encryption
+
+
+def _assets():
+    return [
+        StorageAsset(name="open", provider="aws", public=True, encryption="kms"),
+        StorageAsset(name="plain", provider="aws", encryption=None, policy="AllUsers"),
+        StorageAsset(
+            name="backup", provider="aws", encryption="kms", versioning=False,
+            tags={"backup": "true"},
+        ),
+        StorageAsset(name="clean", provider="aws", encryption="kms"),
+    ]
+
+
+def test_bundled_rules_reproduce_builtin_checks():
+    findings = MisconfigurationDetector().evaluate_assets("aws", _assets())
+    assert [(f.resource, f.issue) for f in findings] == [
+        ("open", "Public access enabled"),
+        ("plain", "Missing encryption at rest"),
+        ("plain", "Overly permissive policy"),
+        ("backup", "Versioning disabled"),
+        ("backup", "Backups without immutability"),
+    ]
+
+
+def test_columnar_evaluation_matches_row_batches():
+    assets = _assets() * 50
+    detector = MisconfigurationDetector()
+    compact = CompactInventory.from_assets(assets)
+    assert detector.evaluate_inventory("aws", compact) == detector.evaluate_assets("aws", assets)
+
+
+def test_custom_rules_extend_and_override_defaults(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([
+        {
+            "name": "public-access",
+            "issue": "Public access enabled",
+            "severity": "HIGH",
+            "detail": "Downgraded for this organization.",
+            "when": {"field": "public", "equals": True},
+        },
+        {
+            "name": "untagged-owner",
+            "issue": "Missing owner tag",
+            "severity": "LOW",
+            "detail": "Tag every bucket with its owning team.",
+            "when": {"not": {"tag": "owner", "matches": "."}},
+        },
+    ]))
+    detector = MisconfigurationDetector.from_file(path)
+    findings = detector.evaluate_assets("aws", _assets())
+    public = [f for f in findings if f.issue == "Public access enabled"]
+    assert [f.severity for f in public] == ["HIGH"]
+    assert sum(f.issue == "Missing owner tag" for f in findings) == 4
+    assert detector.fingerprint() != MisconfigurationDetector().fingerprint()
+    stats = detector.rule_stats()
+    assert stats["untagged-owner"].evaluations == 4
+    assert stats["untagged-owner"].matches == 4
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError, match="unknown severity"):
+        MisconfigurationDetector([MisconfigRule("r", "i", "SEVERE", "d", {"field": "public"})])
+    with pytest.raises(ValueError, match="Unknown condition field"):
+        MisconfigurationDetector(
+            [MisconfigRule("r", "i", "LOW", "d", {"field": "owner", "equals": "x"})]
+        )
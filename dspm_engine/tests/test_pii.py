@@ -9,3 +9,126 @@ def test_pii_detection_matches_default_rules():
     types = {f.type for f in findings}
     assert "Medicare" in types
     assert "TFN" in types
+
+
+def _per_rule_findings(detector, provider, assets):
+    """Reference implementation: scan every rule over every sample independently."""
+
+    findings = []
+    for asset in assets:
+        content = asset.sample_content or ""
+        for rule in detector.rules:
+            for match in rule.compiled().finditer(content):
+                findings.append((rule.name, match.group(0), f"{provider}://{asset.name}/sample.txt"))
+    return findings
+
+
+def test_combined_engine_matches_per_rule_output():
+    from dspm_engine.core.models import StorageAsset
+
+    detector = PiiDetector.from_default_rules()
+    assert detector.engine.combined
+    assets = AwsStorageScanner().list_buckets() + [
+        StorageAsset(
+            name="overlaps",
+            provider="aws",
+            sample_content="ABN 12 345 678 901; TFN 123 456 789 123 456 789; 1234 56789 1",
+        )
+    ]
+    findings = detector.scan_content_samples("aws", assets)
+    actual = [(f.type, f.sample, f.location) for f in findings]
+    assert actual == _per_rule_findings(detector, "aws", assets)
+
+
+def test_rules_with_backreferences_fall_back_to_per_rule_matching():
+    from dspm_engine.core.models import StorageAsset
+    from dspm_engine.core.pii_detector import PiiRule
+
+    detector = PiiDetector(
+        [
+            PiiRule(name="Repeat", pattern=r"(\d)\1{3}", description="Repeated digits"),
+            PiiRule(name="TFN", pattern=r"\b\d{3} \d{3} \d{3}\b", description="TFN"),
+        ]
+    )
+    assert not detector.engine.combined
+    assets = [StorageAsset(name="b", provider="aws", sample_content="1111 123 456 789")]
+    findings = detector.scan_content_samples("aws", assets)
+    assert [(f.type, f.sample) for f in findings] == [("Repeat", "1111"), ("TFN", "123 456 789")]
+
+
+def test_stream_scan_finds_boundary_matches_exactly_once():
+    import io
+
+    from dspm_engine.core.models import StorageAsset
+
+    detector = PiiDetector.from_default_rules()
+    text = "Medicare: 1234 56789 1, TFN: 123 456 789, ABN 12 345 678 901 " * 40
+    expected = detector.scan_content_samples(
+        "aws", [StorageAsset(name="big", provider="aws", sample_content=text)]
+    )
+    payload = text.encode("utf-8")
+    chunks = [payload[index : index + 7] for index in range(0, len(payload), 7)]
+
+    for source in (chunks, io.BytesIO(payload), io.StringIO(text)):
+        findings = list(
+            detector.scan_stream(
+                "aws", "aws://big/sample.txt", source, chunk_size=11, overlap=32
+            )
+        )
+        assert sorted((f.type, f.sample) for f in findings) == sorted(
+            (f.type, f.sample) for f in expected
+        )
+        assert len(findings) == len(expected)
+
+
+def test_stream_scan_keeps_word_boundaries_at_window_starts():
+    from dspm_engine.core.models import StorageAsset
+
+    detector = PiiDetector.from_default_rules()
+    for text in ("x123 456 789 " * 5000, "x123 456 789 TFN 987 654 321. " * 2000):
+        expected = detector.scan_content_samples(
+            "aws", [StorageAsset(name="big", provider="aws", sample_content=text)]
+        )
+        for chunk_size, overlap in ((1000, 256), (7, 16), (13, 32)):
+            findings = list(
+                detector.scan_stream(
+                    "aws", "aws://big/sample.txt", [text.encode()], chunk_size, overlap
+                )
+            )
+            assert [(f.type, f.sample) for f in findings] == [
+                (f.type, f.sample) for f in expected
+            ]
+
+
+def test_process_pool_backend_matches_inline_findings():
+    from dspm_engine.core.pii_parallel import ProcessPoolPiiDetector
+
+    inline = PiiDetector.from_default_rules()
+    assets = AwsStorageScanner().list_buckets() * 3
+    with ProcessPoolPiiDetector.from_detector(inline, max_workers=2, batch_size=1) as pooled:
+        assert pooled.scan_content_samples("aws", assets) == inline.scan_content_samples(
+            "aws", assets
+        )
+
+
+def test_process_pool_backend_scans_object_samples_on_its_workers():
+    from dspm_engine.core.pii_parallel import ProcessPoolPiiDetector
+    from dspm_engine.core.sampling import ObjectSample
+
+    inline = PiiDetector.from_default_rules()
+    samples = [
+        ObjectSample(
+            f"aws://crm/export-{index}.txt",
+            [b"TFN 123 456 789\n", b"Card 4111 1111 1111 1111\n"],
+            size=1_000_000,
+            offsets=[0, 999_975],
+        )
+        for index in range(5)
+    ]
+    with ProcessPoolPiiDetector.from_detector(inline, max_workers=2, batch_size=2) as pooled:
+        scanned = pooled.scan_object_samples("aws", samples)
+        assert pooled._executor is not None
+        assert scanned == inline.scan_object_samples("aws", samples)
+        assert pooled.aggregate_object_samples("aws", samples) == inline.aggregate_object_samples(
+            "aws", samples
+        )
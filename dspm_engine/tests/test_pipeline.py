@@ -0,0 +1,95 @@
+import asyncio
+from dataclasses import asdict
+
+import pytest
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.sampling import SamplingPolicy
+from dspm_engine.core.scanner import ScanCancelled, Scanner
+
+PROVIDERS = ["aws", "azure", "gcp"]
+
+
+def _collect(scanner, **options):
+    batches = []
+    summary = scanner.stream(PROVIDERS, **options).run(batches.append)
+    return batches, summary
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"sampling": SamplingPolicy()}, {"aggregate_pii": True}, {"result_cache": ResultCache()}],
+)
+def test_streamed_batches_match_a_full_scan(options):
+    fresh_cache = ResultCache() if "result_cache" in options else None
+    expected = Scanner(**dict(options, result_cache=fresh_cache)).scan(PROVIDERS)
+    scanner = Scanner(**options)
+    batches, summary = _collect(scanner, batch_size=1)
+
+    assert [asset.name for batch in batches for asset in batch.assets] == [
+        asset.name for asset in expected.assets.buckets
+    ]
+    streamed = [asdict(f) for batch in batches for f in batch.pii_findings + batch.pii_aggregates]
+    assert streamed == [asdict(f) for f in expected.pii_findings + expected.pii_aggregates]
+    assert summary.risk == expected.risk
+    assert summary.misconfigurations == len(expected.misconfigurations)
+    if "result_cache" in options:
+        assert _collect(scanner)[1].cache_stats.hits == len(expected.assets.buckets)
+
+
+def test_discovery_is_throttled_by_the_slowest_stage(monkeypatch):
+    produced = []
+
+    def discover(provider):
+        for index in range(5000):
+            produced.append(index)
+            yield StorageAsset(name=f"{provider}-{index}", provider=provider)
+
+    scanner = Scanner()
+    monkeypatch.setattr(scanner, "_scan_provider", discover)
+    consumed = 0
+    lag = []
+    for batch in scanner.stream(["aws"], batch_size=10, queue_size=2):
+        consumed += len(batch.assets)
+        lag.append(len(produced) - consumed)
+    assert consumed == 5000
+    # Four queues of two batches, one batch per stage and one being discovered.
+    assert max(lag) <= 10 * (4 * 2 + 4 + 1)
+    assert lag[0] < 5000
+
+
+def test_failures_and_cancellation(monkeypatch):
+    scanner = Scanner()
+    original = scanner._scan_provider
+
+    def flaky(provider):
+        if provider == "azure":
+            raise RuntimeError("throttled")
+        return original(provider)
+
+    monkeypatch.setattr(scanner, "_scan_provider", flaky)
+    batches, summary = _collect(scanner)
+    assert set(summary.errors) == {"azure"} and "throttled" in summary.errors["azure"]
+    assert {batch.provider for batch in batches} == {"aws", "gcp"}
+
+    def cancel(batch):
+        raise ScanCancelled("stop")
+
+    pipeline = Scanner().stream(PROVIDERS, batch_size=1)
+    with pytest.raises(ScanCancelled):
+        pipeline.run(cancel)
+    assert not any(thread.is_alive() for thread in pipeline._threads)
+    with pytest.raises(ValueError):
+        Scanner().stream(["ibm"])
+
+
+def test_async_iteration_yields_batches_and_summary():
+    async def consume():
+        pipeline = Scanner().stream(PROVIDERS)
+        providers = [batch.provider async for batch in pipeline]
+        return providers, pipeline.summary
+
+    providers, summary = asyncio.run(consume())
+    assert providers == PROVIDERS
+    assert summary.record()["event"] == "summary" and summary.assets == 6
@@ -0,0 +1,112 @@
+import gzip
+import io
+import os
+import zipfile
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.prefilter import (
+    GZIP,
+    MIN_PRINTABLE_RATIO,
+    SKIP,
+    TEXT,
+    ZIP,
+    ContentRouter,
+    printable_ratio,
+)
+from dspm_engine.core.sampling import ObjectSample
+from dspm_engine.core.scanner import Scanner
+
+RECORD = b"name,tfn\nAlice,123 456 789\n"
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, body, method in members:
+            archive.writestr(name, body, compress_type=method)
+    return buffer.getvalue()
+
+
+def test_router_uses_magic_type_extension_and_heuristics():
+    router = ContentRouter()
+    assert router.route("a.bin", gzip.compress(RECORD)).action == GZIP
+    assert router.route("a", _zip([("x.csv", RECORD, zipfile.ZIP_STORED)])).action == ZIP
+    assert router.route("photo", b"\x89PNG\r\n\x1a\n....").reason == "magic:png"
+    assert router.route("clip", b"plain", "video/mp4").reason == "content-type"
+    assert router.route("scan.jpeg", b"plain").reason == "extension"
+    assert router.route("blob", bytes(range(256)) * 8).action == SKIP
+    assert router.route("blob", os.urandom(4096)).action == SKIP
+    assert router.route("notes.txt", RECORD) == router.route("x", RECORD, "text/csv")
+    assert router.route("blob", RECORD).action == TEXT
+
+
+def test_text_check_decodes_utf8_and_textual_magic_needs_binary_content():
+    router = ContentRouter()
+    for _ in range(20):
+        noise = os.urandom(200)
+        assert printable_ratio(noise) < MIN_PRINTABLE_RATIO
+        assert router.route("blob", noise).action == SKIP
+    assert printable_ratio("Grüße, Zoë: 123 456 789 €\n".encode()) == 1.0
+
+    for prefix in (b"MZ", b"ORC", b"BZh", b"GIF8", b"PAR1", b"%PDF-"):
+        text = prefix + b"ARTINEZ, Ana, 123 456 789\n"
+        assert router.route("export", text).action == TEXT
+        assert router.route("export", prefix + bytes(range(256))).reason.startswith("magic:")
+    assert router.filter_text("people", "MZ: 123 456 789") is not None
+
+def test_detector_inflates_archives_and_counts_skipped_bytes():
+    router = ContentRouter()
+    detector = PiiDetector.from_default_rules(prefilter=router)
+    archive = _zip(
+        [
+            ("deflated.csv", RECORD, zipfile.ZIP_DEFLATED),
+            ("stored.txt", RECORD, zipfile.ZIP_STORED),
+            ("logo.png", b"\x89PNG\r\n\x1a\n" + bytes(64), zipfile.ZIP_STORED),
+        ]
+    )
+    samples = [
+        ObjectSample("aws://b/export.csv.gz", [gzip.compress(RECORD), b"tail"]),
+        ObjectSample("aws://b/export.zip", [archive]),
+        ObjectSample("aws://b/photo.jpg", [RECORD]),
+        ObjectSample("aws://b/random", [os.urandom(2048)]),
+        ObjectSample("aws://b/plain", [RECORD], content_type="text/csv"),
+    ]
+
+    findings = detector.scan_object_samples("aws", samples)
+
+    tfn = sorted(f.location for f in findings if f.type == "TFN")
+    assert tfn == [
+        "aws://b/export.csv.gz",
+        "aws://b/export.zip!deflated.csv",
+        "aws://b/export.zip!stored.txt",
+        "aws://b/plain",
+    ]
+    stats = router.stats
+    assert stats.objects == {GZIP: 1, ZIP: 1, SKIP: 2, TEXT: 1}
+    assert stats.skipped_bytes["extension"] == len(RECORD)
+    assert stats.skipped_bytes.get("binary", 0) + stats.skipped_bytes.get("entropy", 0) == 2048
+    assert stats.skipped_bytes["compressed-tail"] == 4
+    assert stats.skipped_bytes["archive-member:magic:png"] == 72
+    assert stats.decompressed_bytes == 3 * len(RECORD) + 72
+
+
+def test_truncated_gzip_head_is_scanned_up_to_the_limit():
+    body = RECORD * 2000
+    router = ContentRouter(max_decompressed=1000)
+    texts = list(router.texts("a.gz", (gzip.compress(body)[:200],)))
+    assert len(texts) == 1 and texts[0][1].startswith("name,tfn")
+    assert router.stats.decompressed_bytes <= 1000
+
+
+def test_scanner_prefilter_keeps_text_findings_and_changes_fingerprint():
+    baseline = Scanner().scan(["aws", "azure", "gcp"])
+    router = ContentRouter()
+    scanner = Scanner(prefilter=router)
+    filtered = scanner.scan(["aws", "azure", "gcp"])
+    key = lambda finding: (finding.type, finding.sample, finding.location)  # noqa: E731
+    assert sorted(map(key, filtered.pii_findings)) == sorted(map(key, baseline.pii_findings))
+    assert router.stats.objects.get(SKIP, 0) == 0
+    assert scanner.pii_detector.fingerprint() != PiiDetector.from_default_rules().fingerprint()
+    asset = StorageAsset(name="b", provider="aws", sample_content="\x00\x01\x02" * 100)
+    assert PiiDetector.from_default_rules(prefilter=router)._content_samples("aws", [asset]) == {}
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from dspm_engine.core import providers
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.providers import ProviderRegistry
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.core.storage_aws import AwsStorageScanner
+
+
+class OracleStorageScanner:
+    def __init__(self, live=False):
+        self.live = live
+
+    @classmethod
+    def from_environment(cls):
+        return cls(live=True)
+
+    def iter_assets(self):
+        yield StorageAsset(
+            name="oci-exports",
+            provider="oci",  # type: ignore[arg-type]
+            public=True,
+            encryption=None,
+            versioning=False,
+            policy="allow-all",
+            region="ap-sydney-1",
+            sample_content="TFN: 123 456 782" if self.live else "TFN: 876 543 210",
+        )
+
+
+def test_registry_imports_lazily_and_reads_entry_points_on_demand(monkeypatch):
+    calls = []
+
+    def entry_points(group):
+        calls.append(group)
+        return [SimpleNamespace(name="OCI", value=f"{__name__}:OracleStorageScanner")]
+
+    monkeypatch.setattr("importlib.metadata.entry_points", entry_points)
+    registry = ProviderRegistry({"aws": "dspm_engine.core.storage_aws:AwsStorageScanner"})
+
+    assert "AWS" in registry and calls == []
+    assert registry.load("aws") is AwsStorageScanner
+    assert registry.load("oci") is OracleStorageScanner
+    assert registry.names() == ["aws", "oci"]
+    assert calls == [providers.ENTRY_POINT_GROUP]
+    with pytest.raises(ValueError):
+        registry.load("ibm")
+    assert ProviderRegistry({}, group=None).names() == []
+
+
+def test_scanner_discovers_registered_providers(monkeypatch):
+    registry = ProviderRegistry(group=None)
+    monkeypatch.setattr(providers, "PROVIDERS", registry)
+    monkeypatch.setattr("dspm_engine.core.scanner.PROVIDERS", registry)
+    providers.register_provider("oci", OracleStorageScanner)
+
+    assert providers.provider_names() == ["aws", "azure", "gcp", "oci"]
+    sample = Scanner().scan(["oci", "aws"])
+    live = Scanner(discovery="live").scan(["oci"])
+    assert [asset.provider for asset in sample.assets.buckets][0] == "oci"
+    assert [finding.sample for finding in sample.pii_findings if finding.provider == "oci"]
+    assert {finding.issue for finding in live.misconfigurations} >= {"Public access enabled"}
+    assert live.pii_findings[0].validated
+    with pytest.raises(ValueError, match="ibm"):
+        Scanner().scan(["ibm"])
+
+
+def test_heavy_dependencies_are_imported_on_first_use():
+    code = (
+        "import sys, dspm_engine.cli.dspmctl, dspm_engine.core.scanner\n"
+        "heavy = ('networkx', 'jinja2', 'boto3', 'multiprocessing', 'urllib.request')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+        "from dspm_engine.core.lineage import LineageGraph\n"
+        "LineageGraph()\n"
+        "print('networkx' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    assert output == ["", "True"]
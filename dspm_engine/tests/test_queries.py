@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from dspm_engine.api.queries import (
+    decode_cursor,
+    iter_ndjson,
+    misconfig_filter,
+    paginate,
+    pii_filter,
+)
+from dspm_engine.core.scanner import Scanner
+
+
+def test_cursor_pages_cover_filtered_findings_exactly_once():
+    result = Scanner().scan(["aws", "azure", "gcp"])
+    predicate = pii_filter(provider="AWS")
+    expected = [f for f in result.pii_findings if f.provider == "aws"]
+
+    collected, start = [], 0
+    while True:
+        page = paginate(result.pii_findings, predicate, "snap", start, limit=1)
+        collected.extend(page.items)
+        if page.next_cursor is None:
+            break
+        snapshot_id, start = decode_cursor(page.next_cursor)
+        assert snapshot_id == "snap"
+    assert collected == expected
+
+
+def test_filters_and_ndjson_serialization():
+    result = Scanner().scan(["gcp"])
+    critical = [f for f in result.misconfigurations if misconfig_filter(severity="critical")(f)]
+    assert {f.resource for f in critical} == {"marketing-landing"}
+    backups = [f for f in result.pii_findings if pii_filter(resource="backups")(f)]
+    lines = b"".join(iter_ndjson(iter(f.__dict__ for f in backups))).splitlines()
+    assert [json.loads(line)["location"] for line in lines] == ["gcp://backups/sample.txt"]
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
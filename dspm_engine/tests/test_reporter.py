@@ -0,0 +1,107 @@
+import gzip
+import io
+import json
+from dataclasses import asdict
+
+import pytest
+from jinja2 import Environment
+
+from dspm_engine.benchmarks.report_memory import synthetic_result
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.report.reporter import Reporter, clear_environments
+
+
+def test_streamed_json_matches_a_single_dumps_call():
+    result = Scanner().scan(["aws", "azure", "gcp"])
+    expected = json.dumps(
+        {
+            "assets": result.assets.to_dict()["buckets"],
+            "pii_findings": [asdict(finding) for finding in result.pii_findings],
+            "column_findings": [],
+            "pii_aggregates": [],
+            "misconfigurations": [asdict(finding) for finding in result.misconfigurations],
+            "lineage": result.lineage.to_json(),
+            "risk": asdict(result.risk),
+            "errors": result.errors,
+            "shards": [],
+        },
+        indent=2,
+    )
+    assert Reporter().render(result, "json") == expected
+
+
+def test_stream_writes_chunks_to_files_and_gzip(tmp_path):
+    result = synthetic_result(2000, assets=50)
+    reporter = Reporter()
+    for fmt in ("markdown", "json"):
+        pieces = list(reporter.iter_render(result, fmt))
+        assert len(pieces) > 100
+        expected = "".join(pieces).encode("utf-8")
+
+        path = tmp_path / f"report.{fmt}"
+        assert reporter.stream(result, fmt, path) == len(expected)
+        assert path.read_bytes() == expected
+
+        buffer = io.BytesIO()
+        reporter.stream(result, fmt, buffer, compress=True)
+        assert not buffer.closed
+        assert gzip.decompress(buffer.getvalue()) == expected
+    assert json.loads(expected)["pii_findings"][0]["type"] == "TFN"
+
+
+@pytest.fixture
+def template_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DSPM_TEMPLATE_CACHE", str(tmp_path / "bytecode"))
+    clear_environments()
+    yield tmp_path / "bytecode"
+    clear_environments()
+
+
+def test_reporters_share_a_precompiled_environment(template_cache, monkeypatch):
+    first = Reporter()
+    assert Reporter().env is first.env
+    assert list(template_cache.iterdir())
+    template = first.env.get_template("report.md.j2")
+    assert first.env.get_template("report.md.j2") is template
+
+    def compile_disabled(*args, **kwargs):
+        raise AssertionError("template was recompiled")
+
+    clear_environments()
+    monkeypatch.setattr(Environment, "compile", compile_disabled)
+    fresh = Reporter()
+    assert fresh.env is not first.env
+    assert fresh.render(synthetic_result(10, assets=5), "markdown").startswith("# Data")
+
+
+def test_tenant_overrides_shadow_bundled_templates(template_cache, tmp_path):
+    tenant = tmp_path / "acme"
+    tenant.mkdir()
+    (tenant / "report.md.j2").write_text("ACME risk {{ result.risk.score }}\n")
+    result = synthetic_result(10, assets=5)
+
+    custom = Reporter(tenant)
+    assert custom.render(result, "markdown") == f"ACME risk {result.risk.score}"
+    assert Reporter(tenant).env is custom.env
+    assert Reporter().env is not custom.env
+    assert custom.env.bytecode_cache is Reporter().env.bytecode_cache
+    assert Reporter().render(result, "markdown").startswith("# Data Security Posture Report")
+
+
+def test_markdown_shows_unknown_posture():
+    from dspm_engine.core.models import StorageAsset
+
+    scanner = Scanner()
+    scanner._scan_provider = lambda provider: [
+        StorageAsset(
+            name="locked",
+            provider="aws",
+            public=None,
+            encryption="AES256",
+            versioning=None,
+            posture_unknown=("public", "region", "versioning"),
+        )
+    ]
+    report = Reporter().render(scanner.scan(["aws"]), "markdown")
+    assert "Public: unknown | Encryption: AES256 | Versioning: unknown | Region: unknown" in report
+    assert "> - aws/locked: PostureUnknown: could not read public, region, versioning" in report
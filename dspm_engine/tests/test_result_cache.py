@@ -0,0 +1,51 @@
+from dataclasses import replace
+
+from dspm_engine.core.aggregation import mask_sample
+from dspm_engine.core.pii_detector import PiiDetector, PiiRule
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.scanner import Scanner
+
+
+def test_rescan_reuses_cached_findings(tmp_path):
+    cache_path = tmp_path / "cache.sqlite"
+    first = Scanner(result_cache=ResultCache(cache_path)).scan(["aws", "gcp"])
+    assert first.cache_stats.hits == 0
+    assert first.cache_stats.misses == len(first.assets.buckets)
+
+    second = Scanner(result_cache=ResultCache(cache_path)).scan(["aws", "gcp"])
+    assert second.cache_stats.hits == len(second.assets.buckets)
+    assert second.cache_stats.misses == 0
+    assert second.pii_findings == first.pii_findings
+    assert second.misconfigurations == first.misconfigurations
+
+
+def test_cache_file_holds_no_raw_matches(tmp_path):
+    cache_path = tmp_path / "cache.sqlite"
+    cache = ResultCache(cache_path)
+    Scanner(result_cache=cache).scan(["aws", "azure", "gcp"])
+    cache.close()
+
+    raw = Scanner().scan(["aws", "azure", "gcp"]).pii_findings
+    assert raw
+    stored = cache_path.read_bytes()
+    for finding in raw:
+        assert finding.sample.encode() not in stored
+
+
+def test_cached_scans_mask_fresh_and_reused_samples_alike():
+    raw = Scanner().scan(["aws"]).pii_findings
+    masked = [replace(finding, sample=mask_sample(finding.sample)) for finding in raw]
+    cache = ResultCache()
+    assert Scanner(result_cache=cache).scan(["aws"]).pii_findings == masked
+    assert Scanner(result_cache=cache).scan(["aws"]).pii_findings == masked
+
+
+def test_rule_changes_invalidate_cached_entries(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite")
+    Scanner(result_cache=cache).scan(["aws"])
+
+    rules = PiiDetector.from_default_rules().rules[:1]
+    rules.append(PiiRule(name="BSB", pattern=r"\b\d{3}-\d{3}\b", description="Bank state branch"))
+    result = Scanner(pii_detector=PiiDetector(rules), result_cache=cache).scan(["aws"])
+    assert result.cache_stats.hits == 0
+    assert "BSB" in {finding.type for finding in result.pii_findings}
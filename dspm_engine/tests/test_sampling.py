@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.sampling import (
+    ObjectRef,
+    ObjectSampler,
+    SamplingPolicy,
+    select_objects,
+)
+from dspm_engine.core.scanner import Scanner
+
+
+class MemoryStore:
+    """Object store over an in-memory mapping that records every ranged read."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.reads = []
+
+    def list_objects(self, asset):
+        for index, (key, body) in enumerate(self.objects.items()):
+            yield ObjectRef(key=key, size=len(body), last_modified=float(index))
+
+    def read_range(self, asset, key, start, length):
+        self.reads.append((key, start, length))
+        return self.objects[key][start : start + length]
+
+
+def _refs(keys, size=100):
+    return [ObjectRef(key=key, size=size, last_modified=float(i)) for i, key in enumerate(keys)]
+
+
+def test_strategies_bound_the_sample():
+    refs = _refs([f"logs/{i}.txt" for i in range(50)] + [f"db/{i}.csv" for i in range(5)])
+    rng = random.Random(1)
+
+    chosen = select_objects(refs, SamplingPolicy(strategy="random", max_objects=10), rng)
+    assert len(chosen) == 10 and len({ref.key for ref in chosen}) == 10
+
+    newest = select_objects(refs, SamplingPolicy(strategy="newest", max_objects=3), rng)
+    assert [ref.key for ref in newest] == ["db/4.csv", "db/3.csv", "db/2.csv"]
+
+    stratified = select_objects(refs, SamplingPolicy(strategy="stratified", max_objects=4), rng)
+    assert {ref.key.split("/")[0] for ref in stratified} == {"logs", "db"}
+    by_extension = select_objects(
+        refs, SamplingPolicy(strategy="stratified", max_objects=2, stratify_by="extension"), rng
+    )
+    assert {ref.key.rsplit(".")[-1] for ref in by_extension} == {"txt", "csv"}
+
+    budget = SamplingPolicy(strategy="budget", max_objects=50, max_bytes=250)
+    assert [ref.key for ref in select_objects(refs, budget, rng)] == ["logs/0.txt", "logs/1.txt"]
+
+
+def test_sampler_reads_only_head_and_tail_ranges():
+    body = b"Medicare: 1234 56789 1" + b"x" * 10_000 + b"TFN: 123 456 789"
+    store = MemoryStore({"big.txt": body, "small.txt": b"tiny", "empty.txt": b""})
+    policy = SamplingPolicy(strategy="newest", head_bytes=32, tail_bytes=16)
+    sampler = ObjectSampler(store, policy, max_workers=2)
+    asset = StorageAsset(name="bucket", provider="aws")
+
+    plan = sampler.plan("aws", asset)
+    samples = sampler.read("aws", plan)
+
+    assert sorted(store.reads) == [
+        ("big.txt", 0, 32),
+        ("big.txt", len(body) - 16, 16),
+        ("small.txt", 0, 4),
+    ]
+    assert plan.stats.listed == 3
+    assert plan.stats.sampled == 2
+    assert plan.stats.bytes_read == 52
+    big = next(sample for sample in samples if sample.location == "aws://bucket/big.txt")
+    assert big.segments == [body[:32], body[-16:]]
+    assert big.segment_offsets() == [0, len(body) - 16]
+
+
+def test_sampler_stops_reading_when_latency_budget_is_spent():
+    store = MemoryStore({f"{i}.txt": b"data" for i in range(5)})
+    sampler = ObjectSampler(store, SamplingPolicy(max_seconds=0.0))
+    plan = sampler.plan("aws", StorageAsset(name="bucket", provider="aws"))
+    assert sampler.read("aws", plan) == []
+    assert store.reads == []
+    assert plan.stats.truncated == "latency"
+
+
+def test_invalid_policy_is_rejected():
+    with pytest.raises(ValueError):
+        SamplingPolicy(strategy="everything")
+    with pytest.raises(ValueError):
+        SamplingPolicy(head_bytes=0, tail_bytes=0)
+
+
+def test_sampled_scan_matches_sample_content_scan():
+    baseline = Scanner().scan(["aws", "azure", "gcp"])
+    sampled = Scanner(sampling=SamplingPolicy()).scan(["aws", "azure", "gcp"])
+    key = lambda finding: (finding.type, finding.sample, finding.location)  # noqa: E731
+    assert sorted(map(key, sampled.pii_findings)) == sorted(map(key, baseline.pii_findings))
+
+
+def test_s3_object_store_reads_byte_ranges(monkeypatch):
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    from dspm_engine.core.storage_aws import AwsStorageScanner
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="data")
+        client.put_object(Bucket="data", Key="a/records.txt", Body=b"0123456789" * 10)
+        client.put_object(Bucket="data", Key="b/notes.txt", Body=b"hello")
+        store = AwsStorageScanner.connect(region="us-east-1").object_store()
+        asset = StorageAsset(name="data", provider="aws")
+        refs = {ref.key: ref for ref in store.list_objects(asset)}
+        head = store.read_range(asset, "a/records.txt", 0, 4)
+        tail = store.read_range(asset, "a/records.txt", 96, 4)
+
+    assert set(refs) == {"a/records.txt", "b/notes.txt"}
+    assert refs["a/records.txt"].size == 100
+    assert (head, tail) == (b"0123", b"6789")
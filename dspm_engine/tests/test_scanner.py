@@ -1,6 +1,7 @@
 import pytest
 
-from dspm_engine.core.scanner import SUPPORTED_PROVIDERS, Scanner
+from dspm_engine.core.providers import provider_names
+from dspm_engine.core.scanner import Scanner
 
 
 def test_scanner_rejects_unknown_provider():
@@ -11,7 +12,43 @@ def test_scanner_rejects_unknown_provider():
 
 def test_scanner_runs_all_providers():
     scanner = Scanner()
-    result = scanner.scan(SUPPORTED_PROVIDERS)
+    result = scanner.scan(provider_names())
     assert result.assets.buckets, "Assets should be discovered"
     assert result.lineage.to_json()["nodes"], "Lineage should contain nodes"
     assert result.risk.score >= 0
+
+
+def test_concurrent_scan_merges_in_requested_order():
+    serial = Scanner().scan(["gcp", "aws", "azure"])
+    concurrent = Scanner(max_workers=3).scan(["gcp", "aws", "azure"])
+    assert [a.name for a in concurrent.assets.buckets] == [a.name for a in serial.assets.buckets]
+    assert concurrent.pii_findings == serial.pii_findings
+    assert concurrent.misconfigurations == serial.misconfigurations
+    assert concurrent.assets.buckets[0].provider == "gcp"
+
+
+def test_provider_failure_does_not_abort_other_providers(monkeypatch):
+    scanner = Scanner(max_workers=2)
+    original = scanner._scan_provider
+
+    def flaky(provider):
+        if provider == "azure":
+            raise RuntimeError("throttled")
+        return original(provider)
+
+    monkeypatch.setattr(scanner, "_scan_provider", flaky)
+    result = scanner.scan(["aws", "azure", "gcp"])
+    assert result.errors == {"azure": "RuntimeError: throttled"}
+    assert {asset.provider for asset in result.assets.buckets} == {"aws", "gcp"}
+
+
+def test_scanner_selects_process_pii_backend():
+    from dspm_engine.core.pii_parallel import ProcessPoolPiiDetector
+
+    scanner = Scanner(pii_backend="process", pii_workers=2)
+    try:
+        assert isinstance(scanner.pii_detector, ProcessPoolPiiDetector)
+        result = scanner.scan(["aws"])
+    finally:
+        scanner.close()
+    assert result.pii_findings == Scanner().scan(["aws"]).pii_findings
@@ -0,0 +1,173 @@
+import threading
+import time
+
+import pytest
+
+from dspm_engine.core import providers
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.providers import ProviderRegistry
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.core.shards import Shard, ShardGroup, expand_shards, load_shards
+
+
+class RegionalStorageScanner:
+    shard_scope = "region"
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def __init__(self, region=None):
+        self.region = region
+
+    @classmethod
+    def from_environment(cls, account=None, region=None):
+        if account == "broken":
+            raise RuntimeError("no credentials")
+        return cls(region)
+
+    def iter_assets(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            for index in range(1000 if self.region == "slow" else 2):
+                time.sleep(0.02)
+                yield StorageAsset(
+                    name=f"{self.region}-{index}",
+                    provider="acme",  # type: ignore[arg-type]
+                    public=index == 0,
+                    region=self.region,
+                    sample_content="TFN: 123 456 782",
+                )
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@pytest.fixture
+def acme(monkeypatch):
+    registry = ProviderRegistry(group=None)
+    registry.register("acme", RegionalStorageScanner)
+    monkeypatch.setattr(providers, "PROVIDERS", registry)
+    monkeypatch.setattr("dspm_engine.core.scanner.PROVIDERS", registry)
+    monkeypatch.setattr("dspm_engine.core.shards.PROVIDERS", registry)
+    RegionalStorageScanner.peak = 0
+    return registry
+
+
+def test_config_expands_into_account_and_scope_shards(tmp_path, acme):
+    groups = expand_shards(
+        {
+            "defaults": {"max_concurrency": 2, "timeout": 60},
+            "providers": {
+                "aws": {"accounts": ["prod", "dev"], "regions": ["us-east-1", "eu-west-1"]},
+                "azure": {"enabled": False, "subscriptions": ["sub"]},
+                "gcp": {"projects": ["a", "b"], "timeout": 5},
+                "acme": {},
+            },
+        }
+    )
+    assert [(g.provider, g.max_concurrency, g.timeout) for g in groups] == [
+        ("aws", 2, 60.0),
+        ("gcp", 2, 5.0),
+        ("acme", 2, 60.0),
+    ]
+    assert [shard.key for shard in groups[0].shards] == [
+        "aws/prod/us-east-1",
+        "aws/prod/eu-west-1",
+        "aws/dev/us-east-1",
+        "aws/dev/eu-west-1",
+    ]
+    assert groups[0].shards[0].options() == {"account": "prod", "region": "us-east-1"}
+    assert groups[1].shards[1].options() == {"project": "b"}
+    assert groups[2].shards == (Shard("acme", scope_kind="region"),)
+
+    for bad in (
+        {"providers": {"ibm": {}}},
+        {"providers": {"aws": {"regions": "us-east-1"}}},
+        {"providers": {"aws": {"max_concurrency": 0}}},
+        {"providers": {"aws": {"projects": ["a"]}}},
+        {"providers": {"azure": {"subscriptions": ["a"]}}},
+        {"providers": {"acme": {"scopes": ["a"]}}},
+    ):
+        with pytest.raises(ValueError):
+            expand_shards(bad)
+
+    (azure,) = expand_shards({"providers": {"azure": {"accounts": ["east", "west"]}}})
+    assert [shard.key for shard in azure.shards] == ["azure/east/*", "azure/west/*"]
+
+    path = tmp_path / "providers.yaml"
+    path.write_text("providers:\n  gcp:\n    projects: [one, two]\n", encoding="utf-8")
+    assert [shard.scope for shard in load_shards(path)[0].shards] == ["one", "two"]
+    assert [group.provider for group in load_shards()] == ["aws", "azure", "gcp"]
+
+
+def test_sharded_scan_merges_shards_and_deduplicates_sample_assets():
+    plan = expand_shards({"providers": {"aws": {"regions": ["ap-southeast-2", "us-west-2"]}}})
+    plan += expand_shards({"providers": {"gcp": {"projects": ["one", "two"]}}})
+    result = Scanner().scan_shards(plan)
+    baseline = Scanner().scan(["aws", "gcp"])
+
+    assert [(s.shard, s.status, s.assets) for s in result.shards] == [
+        ("aws/*/ap-southeast-2", "completed", 2),
+        ("aws/*/us-west-2", "completed", 0),
+        ("gcp/*/one", "completed", 2),
+        ("gcp/*/two", "completed", 2),
+    ]
+    assert [a.name for a in result.assets.buckets] == [a.name for a in baseline.assets.buckets]
+    assert result.pii_findings == baseline.pii_findings
+    assert result.misconfigurations == baseline.misconfigurations
+    assert result.risk == baseline.risk and result.errors == {}
+
+
+def test_slow_and_failing_shards_do_not_hold_up_the_rest(acme):
+    group = ShardGroup(
+        "acme",
+        tuple(
+            Shard("acme", account, region, "region")
+            for account, region in [
+                (None, "slow"),
+                (None, "r1"),
+                (None, "r2"),
+                (None, "r3"),
+                ("broken", "r4"),
+            ]
+        ),
+        max_concurrency=2,
+        timeout=0.5,
+    )
+    started = time.monotonic()
+    result = Scanner(discovery="live").scan_shards([group])
+
+    assert time.monotonic() - started < 5
+    statuses = {status.shard: status for status in result.shards}
+    assert statuses["acme/*/slow"].status == "timeout"
+    assert statuses["acme/*/slow"].seconds == pytest.approx(0.5, abs=0.3)
+    assert statuses["acme/broken/r4"].status == "failed"
+    assert [statuses[f"acme/*/r{i}"].status for i in (1, 2, 3)] == ["completed"] * 3
+    assert set(result.errors) == {"acme/*/slow", "acme/broken/r4"}
+    assert "no credentials" in result.errors["acme/broken/r4"]
+    assert [asset.name for asset in result.assets.buckets] == [
+        "r1-0", "r1-1", "r2-0", "r2-1", "r3-0", "r3-1"
+    ]
+    assert len(result.pii_findings) == 6
+    assert RegionalStorageScanner.peak == 2
+
+
+def test_same_named_assets_in_different_accounts_are_kept_and_cached_apart(acme):
+    group = ShardGroup(
+        "acme", (Shard("acme", "east", "r1", "region"), Shard("acme", "west", "r1", "region"))
+    )
+    cache = ResultCache()
+    scanner = Scanner(discovery="live", result_cache=cache)
+
+    first = scanner.scan_shards([group])
+    assert [asset.name for asset in first.assets.buckets] == ["r1-0", "r1-1"] * 2
+    assert len(first.pii_findings) == 4
+    assert len(first.misconfigurations) == 2 * len(
+        Scanner().misconfig_detector.evaluate_assets("acme", first.assets.buckets[:2])
+    )
+    second = scanner.scan_shards([group])
+    assert (second.cache_stats.hits, second.cache_stats.misses) == (4, 0)
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from dspm_engine.api.snapshots import SnapshotStore
+from dspm_engine.core.scanner import Scanner
+
+
+class SlowScanner(Scanner):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def scan(self, providers):
+        self.calls += 1
+        time.sleep(0.2)
+        return super().scan(providers)
+
+
+def test_concurrent_scans_are_coalesced_into_one_snapshot():
+    store = SnapshotStore()
+    scanner = SlowScanner()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.scan(scanner, ["aws"])))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert scanner.calls == 1
+    assert {snapshot.id for snapshot in results} == {results[0].id}
+    assert store.latest() is results[0]
+
+
+def test_latest_honours_max_age_and_history_is_bounded():
+    store = SnapshotStore(max_snapshots=2)
+    scanner = Scanner()
+    first = store.scan(scanner, ["aws"])
+    store.scan(scanner, ["gcp"])
+    third = store.scan(scanner, ["azure"])
+    assert store.get(first.id) is None
+    assert [snapshot.providers for snapshot in store.history()] == [("gcp",), ("azure",)]
+    assert store.latest() is third
+    assert store.latest(max_age=-1) is None
+
+
+def test_provider_lists_are_normalized_and_latest_filters_by_provider_set():
+    store = SnapshotStore()
+    scanner = Scanner()
+    both = store.scan(scanner, ["GCP", "aws", "gcp"])
+    assert both.providers == ("aws", "gcp")
+    aws = store.scan(scanner, ["aws"])
+    assert store.latest() is aws
+    assert store.latest(providers=["gcp", "AWS"]) is both
+    assert store.latest(providers=["azure"]) is None
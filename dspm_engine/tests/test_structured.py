@@ -0,0 +1,154 @@
+import io
+import json
+
+import pytest
+
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector
+from dspm_engine.core.result_cache import ResultCache
+from dspm_engine.core.sampling import ObjectRef, ObjectSampler, SamplingPolicy
+from dspm_engine.core.scanner import Scanner
+from dspm_engine.core.structured import TabularClassifier, sample_columns, tabular_format
+
+
+class MemoryStore:
+    """Object store over an in-memory mapping that records every ranged read."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.reads = []
+
+    def list_objects(self, asset):
+        for key, body in self.objects.items():
+            yield ObjectRef(key=key, size=len(body))
+
+    def read_range(self, asset, key, start, length):
+        self.reads.append((key, start, length))
+        return self.objects[key][start : start + length]
+
+
+def _csv(rows):
+    lines = ["id,name,tfn"] + [f"{i},Customer {i},123 456 {i:03d}" for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _samples(objects, **policy):
+    store = MemoryStore(objects)
+    sampler = ObjectSampler(store, SamplingPolicy(strategy="newest", **policy), max_workers=1)
+    asset = StorageAsset(name="exports", provider="aws")
+    return store, sampler.read("aws", sampler.plan("aws", asset))
+
+
+def test_columns_are_classified_once_with_value_hit_ratios():
+    detector = PiiDetector.from_default_rules()
+    columns = {"tfn": ["123 456 789", "n/a", "987 654 321", "111 222 333"], "name": ["Alice"]}
+    findings = detector.classify_columns("aws", "aws://b/x.csv", columns)
+    assert [(f.type, f.column, f.hits, f.sampled, f.hit_ratio) for f in findings] == [
+        ("TFN", "tfn", 3, 4, 0.75)
+    ]
+    assert detector.classify_columns("aws", "aws://b/x.csv", columns, min_hit_ratio=0.8) == []
+
+
+def test_sample_columns_stops_once_every_column_is_full():
+    rows = iter([{"a": str(i), "b": "" if i % 2 else "x"} for i in range(1000)])
+    sample = sample_columns(rows, max_values=5)
+    assert sample.columns == {"a": ["0", "1", "2", "3", "4"], "b": ["x"] * 5}
+    assert sample.rows == 9
+    assert next(rows) == {"a": "9", "b": ""}
+
+
+def test_csv_and_jsonl_heads_are_parsed_without_the_partial_last_line():
+    jsonl = "\n".join(
+        json.dumps({"id": i, "customer": {"medicare": f"2123 45670 {i % 10}"}}) for i in range(50)
+    ).encode("utf-8")
+    _, samples = _samples({"a.csv": _csv(500), "b.jsonl": jsonl}, head_bytes=400, tail_bytes=64)
+    classifier = TabularClassifier(max_values=10)
+    detector = PiiDetector.from_default_rules()
+    findings = {
+        (f.location.rsplit("/", 1)[-1], f.column, f.type): (f.hits, f.sampled)
+        for sample in samples
+        for f in classifier.scan_sample(detector, "aws", sample)
+    }
+    assert findings == {
+        ("a.csv", "tfn", "TFN"): (10, 10),
+        ("b.jsonl", "customer.medicare", "Medicare"): (7, 7),
+    }
+
+
+def test_parquet_is_read_through_ranged_reads():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "id": list(range(20_000)),
+            "abn": [f"51 824 753 {i % 1000:03d}" for i in range(20_000)],
+            "note": [f"row {i}" for i in range(20_000)],
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=1000)
+    body = buffer.getvalue()
+    store, samples = _samples({"t.parquet": body}, head_bytes=64, tail_bytes=64)
+
+    classifier = TabularClassifier(max_values=50)
+    reads_before = len(store.reads)
+    findings = classifier.scan_sample(PiiDetector.from_default_rules(), "aws", samples[0])
+
+    assert ("abn", "ABN", 50, 50) in [(f.column, f.type, f.hits, f.sampled) for f in findings]
+    assert {f.column for f in findings} == {"abn"}
+    fetched = sum(length for _, _, length in store.reads[reads_before:])
+    assert 0 < fetched < len(body)
+
+
+def test_parquet_ranged_reads_share_the_asset_byte_budget():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "id": list(range(20_000)),
+            "abn": [f"51 824 753 {i % 1000:03d}" for i in range(20_000)],
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=1000)
+    objects = {f"t{index}.parquet": buffer.getvalue() for index in range(4)}
+    max_bytes = 200_000
+    sampler = ObjectSampler(
+        MemoryStore(objects),
+        SamplingPolicy(strategy="newest", head_bytes=64, tail_bytes=64, max_bytes=max_bytes),
+        max_workers=1,
+    )
+    plan = sampler.plan("aws", StorageAsset(name="exports", provider="aws"))
+    samples = sampler.read("aws", plan)
+    classifier = TabularClassifier(max_values=50)
+    detector = PiiDetector.from_default_rules()
+    findings = [classifier.scan_sample(detector, "aws", sample) for sample in samples]
+
+    assert len(samples) == 4 and findings[0]
+    ranged = sum(length for _, _, length in sampler.store.reads)
+    assert ranged == plan.stats.bytes_read
+    assert ranged <= max_bytes
+    assert plan.stats.truncated == "bytes"
+
+
+def test_scanner_reports_column_findings_and_caches_them(monkeypatch):
+    objects = {"export.csv": _csv(20), "notes.txt": b"TFN: 123 456 789"}
+    assert tabular_format("export.csv") == "csv" and tabular_format("notes.txt") is None
+    cache = ResultCache()
+    scanner = Scanner(
+        sampling=SamplingPolicy(),
+        tabular=TabularClassifier(),
+        result_cache=cache,
+    )
+    monkeypatch.setattr(
+        scanner, "_sampler", lambda provider: ObjectSampler(MemoryStore(objects), scanner.sampling)
+    )
+
+    first = scanner.scan(["aws"])
+    second = scanner.scan(["aws"])
+
+    assert {f.location.rsplit("/", 1)[-1] for f in first.pii_findings} == {"notes.txt"}
+    assert {(f.column, f.type, f.hits) for f in first.column_findings} == {("tfn", "TFN", 20)}
+    assert second.cache_stats.hits == len(second.assets.buckets)
+    assert second.column_findings == first.column_findings
+    assert first.risk.data_score > Scanner(sampling=SamplingPolicy()).scan(["aws"]).risk.data_score
@@ -0,0 +1,70 @@
+import pytest
+
+from dspm_engine.core import validators
+from dspm_engine.core.models import StorageAsset
+from dspm_engine.core.pii_detector import PiiDetector, PiiRule
+from dspm_engine.core.validators import abn, get_validator, luhn, medicare, register_validator, tfn
+
+TEXT = (
+    "TFN 123 456 782 and 123 456 789; ABN 51 824 753 556 and 12 345 678 901; "
+    "Medicare 2123 45670 1 and 1234 56789 1; cards 4111 1111 1111 1111, 4111 1111 1111 1112"
+)
+
+
+@pytest.fixture
+def even_validator():
+    """Register an ``even`` validator for one test and remove it afterwards."""
+
+    register_validator("even", lambda digits: int(digits) % 2 == 0)
+    yield "even"
+    validators.VALIDATORS.pop("even", None)
+    validators._compiled_validator.cache_clear()
+
+
+def test_checksums_accept_valid_and_reject_invalid_numbers():
+    assert luhn("4111111111111111") and not luhn("4111111111111112") and not luhn("4111")
+    assert tfn("123456782") and tfn("876543210") and not tfn("123456789")
+    assert abn("51824753556") and not abn("12345678901")
+    assert medicare("2123456701") and medicare("21234567011")
+    assert not medicare("1234567891") and not medicare("2123456711")
+    assert get_validator("tfn")("123-456-782")
+    with pytest.raises(ValueError):
+        get_validator("missing")
+
+
+def test_mark_mode_flags_findings_and_drop_mode_filters_them():
+    asset = StorageAsset(name="b", provider="aws", sample_content=TEXT)
+    marked = PiiDetector.from_default_rules().scan_content_samples("aws", [asset])
+    dropped = PiiDetector.from_default_rules(validation="drop").scan_content_samples(
+        "aws", [asset]
+    )
+
+    assert {(f.type, f.sample) for f in marked if f.validated} == {
+        ("TFN", "123 456 782"),
+        ("ABN", "51 824 753 556"),
+        ("Medicare", "2123 45670 1"),
+        ("Credit Card", "4111 1111 1111 1111"),
+    }
+    assert len(marked) > len(dropped)
+    assert all(f.validated for f in dropped)
+    validated = {(f.type, f.sample) for f in marked if f.validated}
+    assert {(f.type, f.sample) for f in dropped} == validated
+
+
+def test_custom_validators_and_column_counts(even_validator):
+    detector = PiiDetector(
+        [PiiRule(name="Number", pattern=r"\b\d{4}\b", description="id", validator=even_validator)]
+    )
+    findings = detector.classify_columns("aws", "aws://b/t.csv", {"id": ["1000", "1001", "1002"]})
+    assert [(f.hits, f.validated, f.sampled) for f in findings] == [(3, 2, 3)]
+    detector.validation = "drop"
+    findings = detector.classify_columns("aws", "aws://b/t.csv", {"id": ["1000", "1001", "1002"]})
+    assert [(f.hits, f.validated) for f in findings] == [(2, 2)]
+    with pytest.raises(ValueError):
+        PiiDetector([], validation="strict")
+
+
+def test_custom_validators_do_not_outlive_their_test():
+    assert "even" not in validators.VALIDATORS
+    with pytest.raises(ValueError):
+        get_validator("even")